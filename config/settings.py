@@ -3,6 +3,8 @@ Schedule-AI Configuration Settings
 """
 from pathlib import Path
 
+import yaml
+
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
 
@@ -14,16 +16,13 @@ OUTPUT_FINAL_DIR = OUTPUT_DIR / "final"
 OUTPUT_PROGRAM_DIR = OUTPUT_DIR / "program_specific"
 OUTPUT_INTERMEDIATE_DIR = OUTPUT_DIR / "intermediate"
 
-# Input data paths
-INPUT_PATHS = {
-    "informatika": INPUT_DIR / "informatika" / "JADWAL SEMESTER.xlsx",
-    "informatika_updated": INPUT_DIR / "informatika" / "informatika.xlsx",
-    "pengairan": INPUT_DIR / "pengairan" / "Struktur Mata Kuliah Final ok.xlsx",
-    "elektro": INPUT_DIR / "elektro" / "Pengampuh MK T. Elektro.xlsx",
-    "pwk": INPUT_DIR / "pwk" / "jadwal pwk ganjil 2025 2026.xlsx",
-    "arsitektur": INPUT_DIR / "arsitektur" / "JADWAL GANJIL 25-26_ARSITEKTUR.xlsx",
-    "mkdu": INPUT_DIR / "mkdu" / "MKDU 20251.xlsx",
-}
+# Input data paths (registry sumber: config/sources.yaml)
+SOURCES_FILE = PROJECT_ROOT / "config" / "sources.yaml"
+with open(SOURCES_FILE, encoding="utf-8") as _f:
+    INPUT_PATHS = {
+        name: INPUT_DIR / spec.get("dir", name) / spec["file"]
+        for name, spec in (yaml.safe_load(_f).get("sources") or {}).items()
+    }
 
 # Scheduling parameters
 MAX_ITERATIONS = 120
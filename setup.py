@@ -37,7 +37,7 @@ setup(
     },
     entry_points={
         "console_scripts": [
-            "chronosync=core.jadwal:main",
+            "chronosync=core.jadwal:cli",
             "chronosync-finetune=scripts.interactive.finetune_interactive:main",
         ],
     },
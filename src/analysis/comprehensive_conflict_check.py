@@ -1,47 +1,37 @@
 import pandas as pd
+import sys
 from collections import defaultdict
+sys.path.append('.')
+from jadwal import detect_conflicts
 
 file = 'jadwal_gabungan_SATU_TABEL_FINAL_PWK_ARS.xlsx'
-df = pd.read_excel(file, sheet_name='Jadwal Induk (Gabungan)')
+df = pd.read_excel(file, sheet_name='Jadwal Induk (Gabungan)').fillna('')
 
 print('🔍 COMPREHENSIVE CONFLICT ANALYSIS')
 print('=' * 60)
 print(f'Total courses to analyze: {len(df)}')
 
+# Satu pass deteksi untuk ruang, dosen (Dosen 1 + Dosen 2) dan mahasiswa
+room_groups, instr_groups, student_groups = detect_conflicts(df, include_d2=True)
+
 # ============================================
 # 1. ROOM CONFLICT CHECK (DETAILED)
 # ============================================
 print('\n🏠 ROOM CONFLICT CHECK (DETAILED):')
 print('-' * 40)
 
-room_schedule = defaultdict(list)
-room_conflicts = []
-
-for idx, row in df.iterrows():
-    day = row['Hari']
-    sesi = row['Sesi']
-    ruang = row['Ruang']
-    mode = str(row['Mode (Zoom/Luring)']).lower()
-
-    # Skip if Zoom or empty room
-    if 'zoom' in mode or not ruang or str(ruang).strip() == '':
-        continue
-
-    key = (day, int(sesi), ruang)
-    room_schedule[key].append({
+room_conflicts = [
+    ((day, int(sesi), ruang), [{
         'idx': idx,
-        'prodi': row['Prodi'],
-        'mk': row['Mata Kuliah'],
-        'kelas': row['Kelas'],
-        'jam': row['Jam'],
-        'dosen1': row['Dosen 1'],
-        'dosen2': row['Dosen 2']
-    })
-
-# Find conflicts
-for key, courses in room_schedule.items():
-    if len(courses) > 1:
-        room_conflicts.append((key, courses))
+        'prodi': df.at[idx, 'Prodi'],
+        'mk': df.at[idx, 'Mata Kuliah'],
+        'kelas': df.at[idx, 'Kelas'],
+        'jam': df.at[idx, 'Jam'],
+        'dosen1': df.at[idx, 'Dosen 1'],
+        'dosen2': df.at[idx, 'Dosen 2']
+    } for idx in idxs])
+    for (day, sesi, ruang), idxs in room_groups
+]
 
 if room_conflicts:
     print(f'❌ ROOM CONFLICTS FOUND: {len(room_conflicts)}')
@@ -58,36 +48,24 @@ else:
 print('\n👨‍🏫 INSTRUCTOR CONFLICT CHECK (DETAILED):')
 print('-' * 40)
 
-instructor_schedule = defaultdict(list)
-instructor_conflicts = []
-
-for idx, row in df.iterrows():
-    day = row['Hari']
-    sesi = row['Sesi']
-
-    if not day or not sesi:
-        continue
-
-    key = (day, int(sesi))
-
-    # Check both Dosen 1 and Dosen 2
+def dosen_col(row, dosen):
     for col_name in ['Dosen 1', 'Dosen 2']:
-        dosen = str(row[col_name]).strip() if pd.notna(row[col_name]) else ''
-        if dosen and dosen != '' and dosen != 'nan':
-            instructor_schedule[(key, dosen)].append({
-                'idx': idx,
-                'prodi': row['Prodi'],
-                'mk': row['Mata Kuliah'],
-                'kelas': row['Kelas'],
-                'jam': row['Jam'],
-                'ruang': row['Ruang'],
-                'dosen_col': col_name
-            })
-
-# Find instructor conflicts
-for (key, dosen), courses in instructor_schedule.items():
-    if len(courses) > 1:
-        instructor_conflicts.append(((key, dosen), courses))
+        if str(row[col_name]).strip() == dosen:
+            return col_name
+    return 'Dosen'
+
+instructor_conflicts = [
+    ((key, dosen), [{
+        'idx': idx,
+        'prodi': df.at[idx, 'Prodi'],
+        'mk': df.at[idx, 'Mata Kuliah'],
+        'kelas': df.at[idx, 'Kelas'],
+        'jam': df.at[idx, 'Jam'],
+        'ruang': df.at[idx, 'Ruang'],
+        'dosen_col': dosen_col(df.loc[idx], dosen)
+    } for idx in idxs])
+    for (dosen, key), idxs in instr_groups
+]
 
 if instructor_conflicts:
     print(f'❌ INSTRUCTOR CONFLICTS FOUND: {len(instructor_conflicts)}')
@@ -98,6 +76,21 @@ if instructor_conflicts:
 else:
     print('✅ NO INSTRUCTOR CONFLICTS FOUND')
 
+# ============================================
+# 2b. STUDENT GROUP CONFLICT CHECK
+# ============================================
+print('\n🎓 STUDENT GROUP CONFLICT CHECK:')
+print('-' * 40)
+
+if student_groups:
+    print(f'❌ STUDENT CONFLICTS FOUND: {len(student_groups)}')
+    for i, (((prodi, smt, kelas), (day, sesi)), idxs) in enumerate(student_groups, 1):
+        print(f'\n{i}. CONFLICT: {day} Sesi {sesi} - {prodi} {smt}{kelas}')
+        for j, idx in enumerate(idxs, 1):
+            print(f'   {j}. {str(df.at[idx, "Mata Kuliah"])[:40]:40} | R:{str(df.at[idx, "Ruang"]):10}')
+else:
+    print('✅ NO STUDENT CONFLICTS FOUND')
+
 # ============================================
 # 3. TIME SLOT UTILIZATION ANALYSIS
 # ============================================
@@ -167,13 +160,14 @@ print('=' * 40)
 print(f'Total courses analyzed    : {len(df)}')
 print(f'Room conflicts           : {len(room_conflicts)}')
 print(f'Instructor conflicts     : {len(instructor_conflicts)}')
+print(f'Student conflicts        : {len(student_groups)}')
 print(f'Unscheduled courses      : {len(missing_schedule)}')
 print(f'Unique rooms used        : {len(room_usage)}')
 print(f'Active time slots        : {len([k for k, v in time_utilization.items() if v > 0])}')
 
-if len(room_conflicts) == 0 and len(instructor_conflicts) == 0 and len(missing_schedule) == 0:
+if len(room_conflicts) == 0 and len(instructor_conflicts) == 0 and len(student_groups) == 0 and len(missing_schedule) == 0:
     print('\n🎉 ✅ SCHEDULE IS CONFLICT-FREE!')
-    print('   No room conflicts, no instructor conflicts, all courses scheduled.')
+    print('   No room, instructor or student conflicts, all courses scheduled.')
 else:
     print('\n⚠️  ❌ CONFLICTS DETECTED!')
     print('   Please review the conflicts above and fix them.')
@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+"""
+Tahap perbaikan simulated annealing untuk tujuan lunak (lihat FUTURE.md).
+
+Setelah resolusi, jadwal yang sudah bebas bentrok diperbaiki dengan langkah
+acak yang tetap memenuhi batasan keras (dosen, mahasiswa, ruang, hari yang
+diizinkan; PWK/pinned tidak pernah dipindah):
+- move: pindahkan satu MK ke slot lain (ruang lama kalau masih kosong)
+- swap: tukar ruang dua MK luring di slot yang sama
+
+Biaya dihitung inkremental (delta O(1) per langkah) dari struktur ringkas:
+- celah mahasiswa: bitmask sesi per (kelompok, hari) -> tabel biaya per bitmask
+- beban harian kelompok di atas `max_courses_per_day`
+- beban harian dosen di atas `max_instructor_courses_per_day`
+- perpindahan ruang dosen: jumlah ruang berbeda per dosen
+- sesi sore (sesi terakhir)
+Bobot default = preset "balanced" di FUTURE.md (+ bobot beban lebih).
+"""
+
+import math
+import random
+import time
+
+DEFAULT_WEIGHTS = {
+    "student_gap_weight": 10,
+    "room_change_penalty": 10,
+    "late_session_penalty": 5,
+    "max_courses_per_day": 5,
+    "overload_penalty": 10,               # per MK kelompok di atas max_courses_per_day
+    "instructor_load_penalty": 10,        # per MK dosen di atas max_instructor_courses_per_day
+    "max_instructor_courses_per_day": 3,
+}
+
+
+def _gap(mask):
+    """Jumlah sesi kosong di antara sesi terisi (bitmask sesi satu hari)."""
+    if not mask:
+        return 0
+    low = (mask & -mask).bit_length() - 1
+    return mask.bit_length() - low - bin(mask).count("1")
+
+
+class _State:
+    """Struktur biaya inkremental untuk satu CourseTable."""
+
+    def __init__(self, table, occ, weights):
+        self.table = table
+        w = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.w_gap = w["student_gap_weight"]
+        self.w_room = w["room_change_penalty"]
+        self.w_late = w["late_session_penalty"]
+        self.max_day = w["max_courses_per_day"]
+        self.w_over = w["overload_penalty"]
+        self.w_iload = w["instructor_load_penalty"]
+        self.max_iday = w["max_instructor_courses_per_day"]
+
+        days = []
+        for day, _ in occ.slots:
+            if day not in days:
+                days.append(day)
+        day_idx = {d: k for k, d in enumerate(days)}
+        sess = [s for _, s in occ.slots]
+        self.day_of = [day_idx[d] for d, _ in occ.slots]
+        self.bit_of = [1 << (s - min(sess)) for s in sess]
+        last = max(sess)
+        self.late = [self.w_late if s == last else 0 for s in sess]
+        # Biaya (kelompok, hari) untuk bitmask sesi m dengan n MK
+        self.gap_cost = [self.w_gap * _gap(m) ** 2 for m in range(1 << (last - min(sess) + 1))]
+
+        self.gmask = {}   # (gid, day) -> bitmask sesi
+        self.gcount = {}  # (gid, sid) -> jumlah MK kelompok di slot
+        self.gday = {}    # (gid, day) -> jumlah MK kelompok di hari itu
+        self.iday = {}    # (iid, day) -> jumlah MK dosen di hari itu
+        self.iroom = {}   # (iid, rid) -> jumlah MK dosen di ruang itu
+        self.idistinct = {}  # iid -> jumlah ruang berbeda
+        for i in range(len(table)):
+            if table.slot[i] >= 0:
+                self._add(i, table.slot[i], table.room[i])
+
+    # ---------- struktur ----------
+    def _add(self, i, sid, rid):
+        t = self.table
+        gid = t.group[i]
+        if gid is not None:
+            key = (gid, sid)
+            n = self.gcount.get(key, 0)
+            self.gcount[key] = n + 1
+            dkey = (gid, self.day_of[sid])
+            self.gday[dkey] = self.gday.get(dkey, 0) + 1
+            if n == 0:
+                self.gmask[dkey] = self.gmask.get(dkey, 0) | self.bit_of[sid]
+        day = self.day_of[sid]
+        for iid in t.instr[i]:
+            self.iday[(iid, day)] = self.iday.get((iid, day), 0) + 1
+        if rid is not None:
+            for iid in t.instr[i]:
+                key = (iid, rid)
+                n = self.iroom.get(key, 0)
+                self.iroom[key] = n + 1
+                if n == 0:
+                    self.idistinct[iid] = self.idistinct.get(iid, 0) + 1
+
+    def _remove(self, i, sid, rid):
+        t = self.table
+        gid = t.group[i]
+        if gid is not None:
+            key = (gid, sid)
+            n = self.gcount[key] - 1
+            self.gcount[key] = n
+            dkey = (gid, self.day_of[sid])
+            self.gday[dkey] -= 1
+            if n == 0:
+                self.gmask[dkey] &= ~self.bit_of[sid]
+        day = self.day_of[sid]
+        for iid in t.instr[i]:
+            self.iday[(iid, day)] -= 1
+        if rid is not None:
+            for iid in t.instr[i]:
+                key = (iid, rid)
+                n = self.iroom[key] - 1
+                self.iroom[key] = n
+                if n == 0:
+                    self.idistinct[iid] -= 1
+
+    # ---------- biaya ----------
+    def _group_day_cost(self, mask, n):
+        over = n - self.max_day
+        return self.gap_cost[mask] + (self.w_over * over if over > 0 else 0)
+
+    def _instr_day_cost(self, n):
+        over = n - self.max_iday
+        return self.w_iload * over if over > 0 else 0
+
+    def total(self):
+        cost = sum(self._group_day_cost(m, self.gday[k]) for k, m in self.gmask.items())
+        cost += sum(self._instr_day_cost(n) for n in self.iday.values())
+        cost += sum(self.w_room * (n - 1) for n in self.idistinct.values() if n > 0)
+        cost += sum(self.late[sid] for sid in self.table.slot if sid >= 0)
+        return cost
+
+    def delta_move(self, i, s1, r1, s2, r2):
+        """Perubahan biaya kalau baris i pindah dari (s1, r1) ke (s2, r2)."""
+        t = self.table
+        delta = self.late[s2] - self.late[s1]
+        gid = t.group[i]
+        if gid is not None:
+            d1, d2 = self.day_of[s1], self.day_of[s2]
+            m1 = self.gmask.get((gid, d1), 0)
+            n1 = self.gday.get((gid, d1), 0)
+            m1_new = m1 & ~self.bit_of[s1] if self.gcount.get((gid, s1), 0) == 1 else m1
+            if d1 == d2:
+                m2_new = m1_new | self.bit_of[s2]
+                delta += self._group_day_cost(m2_new, n1) - self._group_day_cost(m1, n1)
+            else:
+                m2 = self.gmask.get((gid, d2), 0)
+                n2 = self.gday.get((gid, d2), 0)
+                delta += (self._group_day_cost(m1_new, n1 - 1) - self._group_day_cost(m1, n1)
+                          + self._group_day_cost(m2 | self.bit_of[s2], n2 + 1) - self._group_day_cost(m2, n2))
+        d1, d2 = self.day_of[s1], self.day_of[s2]
+        if d1 != d2:
+            for iid in t.instr[i]:
+                n1, n2 = self.iday[(iid, d1)], self.iday.get((iid, d2), 0)
+                delta += (self._instr_day_cost(n1 - 1) - self._instr_day_cost(n1)
+                          + self._instr_day_cost(n2 + 1) - self._instr_day_cost(n2))
+        if r1 != r2:
+            delta += self._room_delta(t.instr[i], r1, r2)
+        return delta
+
+    def _room_delta(self, instr, r1, r2):
+        delta = 0
+        for iid in instr:
+            if r1 is not None and self.iroom.get((iid, r1), 0) == 1:
+                delta -= self.w_room  # ruang lama tidak dipakai lagi
+            if r2 is not None and self.iroom.get((iid, r2), 0) == 0:
+                delta += self.w_room  # ruang baru
+        return delta
+
+
+def anneal(table, occ, iterations=200_000, time_limit=None, seed=0, weights=None,
+           t_start=10.0, t_end=0.05, swap_rate=0.2):
+    """
+    Perbaiki jadwal `table` / `occ` dengan simulated annealing (in-place).
+    Berhenti setelah `iterations` langkah atau `time_limit` detik.
+    Returns:
+        {"iterations", "accepted", "cost_before", "cost_after", "seconds"}
+    """
+    rng = random.Random(seed)
+    state = _State(table, occ, weights)
+    movable = [i for i in range(len(table)) if not table.pinned[i] and table.slot[i] >= 0]
+    if not movable or iterations <= 0:
+        cost = state.total()
+        return dict(iterations=0, accepted=0, cost_before=cost, cost_after=cost, seconds=0.0)
+    allowed = {i: [sid for sid in range(len(occ.slots)) if (table.allowed[i] >> sid) & 1] for i in movable}
+    # MK luring yang bisa ditukar ruang, per slot (list + posisi untuk hapus O(1))
+    by_slot = [[] for _ in occ.slots]
+    pos = {}
+    for i in movable:
+        if table.room[i] is not None:
+            pos[i] = len(by_slot[table.slot[i]])
+            by_slot[table.slot[i]].append(i)
+
+    def unlink(i, sid):
+        lst = by_slot[sid]
+        k = pos.pop(i)
+        last = lst.pop()
+        if last != i:
+            lst[k] = last
+            pos[last] = k
+
+    def link(i, sid):
+        pos[i] = len(by_slot[sid])
+        by_slot[sid].append(i)
+
+    def relocate(i, sid, rid):
+        old_sid, old_rid = table.slot[i], table.room[i]
+        state._remove(i, old_sid, old_rid)
+        occ.remove(i)
+        table.slot[i], table.room[i] = sid, rid
+        occ.restore(i, table.entry(i))
+        state._add(i, sid, rid)
+        if old_rid is not None and old_sid != sid:
+            unlink(i, old_sid)
+            link(i, sid)
+
+    def swap_rooms(i, j):
+        sid, ri, rj = table.slot[i], table.room[i], table.room[j]
+        state._remove(i, sid, ri)
+        state._remove(j, sid, rj)
+        occ.remove(i)
+        occ.remove(j)
+        table.room[i], table.room[j] = rj, ri
+        occ.restore(i, table.entry(i))
+        occ.restore(j, table.entry(j))
+        state._add(i, sid, rj)
+        state._add(j, sid, ri)
+
+    cost_before = cost = state.total()
+    slot_slot, slot_room = table.slot, table.room
+    room_mask, assignable = occ.room_mask, occ.assignable_rooms
+    rand, randrange, exp = rng.random, rng.randrange, math.exp
+    ratio = t_end / t_start
+    start = time.perf_counter()
+    accepted = 0
+    it = 0
+    temp = t_start
+    while it < iterations:
+        if it & 1023 == 0:
+            if time_limit is not None and time.perf_counter() - start >= time_limit:
+                break
+            temp = t_start * ratio ** (it / iterations)
+        it += 1
+        i = movable[randrange(len(movable))]
+        s1, r1 = slot_slot[i], slot_room[i]
+
+        if r1 is not None and rand() < swap_rate:
+            # swap: tukar ruang dengan MK luring lain di slot yang sama
+            peers = by_slot[s1]
+            j = peers[randrange(len(peers))]
+            if j == i:
+                continue
+            r2 = slot_room[j]
+            delta = state._room_delta(table.instr[i], r1, r2) + state._room_delta(table.instr[j], r2, r1)
+            # Kalau i & j berbagi dosen, kedua ruang tetap dipakai dosen itu
+            shared = set(table.instr[i]) & set(table.instr[j])
+            if shared:
+                delta = (state._room_delta([x for x in table.instr[i] if x not in shared], r1, r2)
+                         + state._room_delta([x for x in table.instr[j] if x not in shared], r2, r1))
+            if delta <= 0 or rand() < exp(-delta / temp):
+                swap_rooms(i, j)
+                cost += delta
+                accepted += 1
+            continue
+
+        # move: slot lain yang bebas untuk dosen & kelompok
+        cand = allowed[i]
+        s2 = cand[randrange(len(cand))]
+        if s2 == s1 or (occ.busy_mask_ids(table.instr[i], table.group[i]) >> s2) & 1:
+            continue
+        if r1 is None:
+            r2 = None
+        elif not (room_mask[s2] >> r1) & 1:
+            r2 = r1
+        else:
+            free = ~room_mask[s2] & assignable
+            if not free:
+                continue
+            r2 = (free & -free).bit_length() - 1
+        delta = state.delta_move(i, s1, r1, s2, r2)
+        if delta <= 0 or rand() < exp(-delta / temp):
+            relocate(i, s2, r2)
+            cost += delta
+            accepted += 1
+
+    return dict(iterations=it, accepted=accepted, cost_before=cost_before, cost_after=cost,
+                seconds=time.perf_counter() - start)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Katalog MK kanonik (hasil loader ternormalisasi) dalam format kolumnar.
+
+Hasil loader bisa diekspor sekali (`jadwal.py convert`) ke CSV atau Parquet
+lalu dibaca ulang tanpa parsing Excel; pipeline registrar juga bisa langsung
+menyerahkan CSV berformat ini. Semua kolom disimpan sebagai teks (kecuali NR
+bool dan Sesi int) supaya kolom bertipe campuran (Semester int/"", SKS
+angka/teks) bisa ditulis ke Parquet; tipe dipulihkan saat dibaca:
+- daftar MK (tanpa kolom Sesi): Semester -> int atau "", SKS -> int/float
+  kalau berupa angka, NR -> bool. Teks yang kebetulan berupa angka di kedua
+  kolom itu (mis. SKS "2" dari Arsitektur) ditulis dengan apostrof di depan
+  ('2), seperti konvensi Excel, supaya tetap teks saat dibaca.
+- jadwal tetap (ada kolom Sesi, mis. PWK): Sesi -> int, sisanya teks
+Parquet butuh pyarrow atau fastparquet; CSV selalu tersedia.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+NUMERIC_COLS = ("Semester", "SKS")  # dipulihkan jadi angka saat dibaca
+
+
+def catalog_format(path):
+    """"csv" / "parquet" untuk file katalog, None untuk format lain (xlsx)."""
+    return FORMATS.get(Path(path).suffix.lower())
+
+
+def _number(v):
+    for conv in (int, float):
+        try:
+            return conv(v)
+        except ValueError:
+            pass
+    return v
+
+
+def _text(v):
+    """Tandai teks yang akan terbaca sebagai angka (atau sudah diawali apostrof)."""
+    if isinstance(v, str) and (v.startswith("'") or _number(v) is not v):
+        return "'" + v
+    return v
+
+
+def _restore(df):
+    if "Sesi" in df.columns:
+        df["Sesi"] = pd.to_numeric(df["Sesi"], errors="coerce").astype("Int64")
+        if not df["Sesi"].isna().any():
+            df["Sesi"] = df["Sesi"].astype(int)
+        return df
+    if "Semester" in df.columns:
+        df["Semester"] = [v[1:] if v.startswith("'") else int(v) if v.isdigit() else v for v in df["Semester"]]
+    if "SKS" in df.columns:
+        df["SKS"] = [v[1:] if v.startswith("'") else _number(v) if v else v for v in df["SKS"]]
+    if "NR" in df.columns:
+        df["NR"] = df["NR"].map(lambda v: str(v).strip().lower() in ("true", "1", "ya", "yes"))
+    return df
+
+
+def read_catalog(path):
+    """Baca katalog CSV/Parquet ke DataFrame bertipe sama dengan hasil loader."""
+    fmt = catalog_format(path)
+    if fmt == "csv":
+        try:
+            df = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+        except pd.errors.EmptyDataError:  # loader tanpa hasil
+            return pd.DataFrame()
+    elif fmt == "parquet":
+        df = pd.read_parquet(path)
+        for c in df.columns:
+            if c not in ("NR", "Sesi"):
+                df[c] = df[c].astype(object).where(df[c].notna(), "").astype(str)
+    else:
+        raise ValueError(f"bukan file katalog (csv/parquet): {path}")
+    return _restore(df)
+
+
+def write_catalog(df, path):
+    """Tulis hasil loader `df` ke `path` (.csv / .parquet). Returns: path"""
+    path = Path(path)
+    fmt = catalog_format(path)
+    if fmt is None:
+        raise ValueError(f"format katalog tidak dikenal: {path.suffix} (pakai .csv atau .parquet)")
+    out = df.copy()
+    if "Sesi" not in out.columns:
+        for c in NUMERIC_COLS:
+            if c in out.columns:
+                out[c] = out[c].map(_text)
+    for c in out.columns:
+        if c not in ("NR", "Sesi"):
+            out[c] = out[c].astype(object).where(out[c].notna(), "").astype(str)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "csv":
+        out.to_csv(path, index=False, encoding="utf-8")
+    else:
+        out.to_parquet(path, index=False)
+    return path
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Mesin penjadwalan berbasis pewarnaan graf konflik.
+
+Simpul = baris CourseTable, sisi = dua MK dengan dosen (D1) atau kelompok
+mahasiswa (prodi, semester, kelas) yang sama, warna = slot (hari, sesi).
+Pewarnaan DSatur dibatasi `domain` (bitmask hari) tiap MK dan kapasitas
+ruang per warna; ruang baru dibagi per slot setelah semua MK berwarna.
+Baris yang sudah punya slot (PWK) jadi simpul pra-warna yang tetap.
+"""
+
+import heapq
+
+from courses import assign_rooms, popcount
+
+
+class ConflictGraph:
+    """Graf konflik jarang: `adj[i]` = himpunan baris yang tidak boleh satu slot dengan i."""
+
+    def __init__(self, table):
+        self.adj = [set() for _ in range(len(table))]
+        buckets = {}
+        for i in range(len(table)):
+            for iid in table.instr[i]:
+                buckets.setdefault(("instr", iid), []).append(i)
+            if table.group[i] is not None:
+                buckets.setdefault(("group", table.group[i]), []).append(i)
+        for rows in buckets.values():
+            for i in rows:
+                self.adj[i].update(rows)
+        for i, nbrs in enumerate(self.adj):
+            nbrs.discard(i)
+
+    def __len__(self):
+        return len(self.adj)
+
+    def edge_count(self):
+        return sum(len(nbrs) for nbrs in self.adj) // 2
+
+
+def color_courses(table, occ, graph=None):
+    """
+    Tempatkan semua baris yang belum punya slot dengan pewarnaan DSatur:
+    simpul dengan warna feasible tersisa paling sedikit diwarnai duluan
+    (seri: derajat tak-berwarna terbesar, lalu urutan tabel), warna feasible
+    terendah (urutan hari/sesi) dipakai. MK luring hanya boleh ke warna yang
+    masih punya ruang kosong; ruang dibagi per slot di akhir.
+    Returns:
+        list baris yang tidak mendapat slot
+    """
+    graph = ConflictGraph(table) if graph is None else graph
+    adj = graph.adj
+    todo = [i for i in range(len(table)) if not table.pinned[i] and table.slot[i] < 0]
+    pending = set(todo)
+
+    # Warna terlarang per simpul dari tetangga pra-warna (PWK / sudah ditempatkan)
+    forbidden = [0] * len(table)
+    for i in range(len(table)):
+        if table.slot[i] >= 0:
+            bit = 1 << table.slot[i]
+            for j in adj[i]:
+                forbidden[j] |= bit
+    # Sisa ruang per slot setelah baris tetap
+    cap = [popcount(~m & occ.assignable_rooms) for m in occ.room_mask]
+    full = sum(1 << sid for sid, c in enumerate(cap) if c == 0)
+
+    def available(i):
+        mask = table.domain[i] & ~forbidden[i]
+        return mask if table.zoom[i] else mask & ~full
+
+    # Derajat di subgraf yang belum berwarna (pemecah seri)
+    degree = [0] * len(table)
+    for i in todo:
+        degree[i] = sum(1 for j in adj[i] if j in pending)
+
+    key = {}
+    heap = []
+
+    def push(i):
+        key[i] = (popcount(available(i)), -degree[i], i)
+        heapq.heappush(heap, key[i])
+
+    for i in todo:
+        push(i)
+
+    colored, unplaced = [], []
+    while heap:
+        k = heapq.heappop(heap)
+        i = k[2]
+        if key.get(i) != k:
+            continue  # entri basi
+        del key[i]
+        mask = available(i)
+        if not mask:
+            unplaced.append(i)
+            continue
+        sid = (mask & -mask).bit_length() - 1
+        table.slot[i] = sid
+        colored.append(i)
+
+        bit = 1 << sid
+        affected = []
+        for j in adj[i]:
+            if j in key:
+                degree[j] -= 1
+                if not forbidden[j] & bit:
+                    forbidden[j] |= bit
+                    affected.append(j)
+        if not table.zoom[i]:
+            cap[sid] -= 1
+            if cap[sid] == 0:
+                full |= bit
+                affected.extend(j for j in key if not table.zoom[j] and table.domain[j] & bit)
+        for j in set(affected):
+            push(j)
+
+    # Fase ruang: kapasitas per warna sudah dijaga, jadi semua luring kebagian ruang
+    unplaced.extend(assign_rooms(table, occ, colored))
+    return sorted(unplaced)
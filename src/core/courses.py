@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+"""
+Model mata kuliah terkompilasi (struct-of-arrays) + penempatan & resolusi.
+
+Semua atribut yang dibutuhkan saat penempatan dihitung sekali saat kompilasi
+(lihat `jadwal.compile_courses`) dan disimpan sebagai int/bool per baris,
+sehingga loop penempatan dan resolusi tidak menyentuh pandas maupun string.
+Baris ke-i tabel = kunci baris ke-i di OccupancyIndex.
+"""
+
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+def iter_bits(mask):
+    """Posisi bit yang menyala, dari yang terendah."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class CourseTable:
+    """
+    Kolom per mata kuliah:
+    - prodi:    id prodi (SymbolTable)
+    - semester: semester int (0 = tidak diketahui)
+    - group:    id kelompok mahasiswa (prodi, semester, kelas) atau None
+    - instr:    tuple id dosen (D1, fallback Dosen)
+    - allowed:  bitmask slot yang boleh dipakai saat resolusi (allowed_days)
+    - domain:   bitmask slot untuk penempatan awal
+    - zoom:     True kalau tidak butuh ruang
+    - pinned:   True kalau tidak boleh dipindah (PWK)
+    - slot, room: penempatan saat ini (-1 / None = belum ditempatkan)
+    """
+
+    def __init__(self):
+        self.prodi = []
+        self.semester = []
+        self.group = []
+        self.instr = []
+        self.allowed = []
+        self.domain = []
+        self.zoom = []
+        self.pinned = []
+        self.slot = []
+        self.room = []
+
+    def __len__(self):
+        return len(self.slot)
+
+    def append(self, prodi, semester, group, instr, allowed, domain, zoom, pinned, slot=-1, room=None):
+        self.prodi.append(prodi)
+        self.semester.append(semester)
+        self.group.append(group)
+        self.instr.append(instr)
+        self.allowed.append(allowed)
+        self.domain.append(domain)
+        self.zoom.append(zoom)
+        self.pinned.append(pinned)
+        self.slot.append(slot)
+        self.room.append(room)
+
+    def entry(self, i):
+        """Entri OccupancyIndex untuk baris i (None kalau belum ditempatkan)."""
+        if self.slot[i] < 0:
+            return None
+        return self.slot[i], self.instr[i], self.group[i], self.room[i]
+
+    def occupy_all(self, occ, rows=None):
+        """Daftarkan penempatan baris (semua, atau `rows`) ke OccupancyIndex."""
+        for i in range(len(self)) if rows is None else rows:
+            occ.restore(i, self.entry(i))
+
+
+def first_fit(table, occ, i, candidates, rng=None):
+    """
+    Slot & ruang pertama yang bebas untuk baris i di antara `candidates`.
+    Dengan `rng`, slot dipilih acak di antara slot bebas pada hari bebas pertama.
+    """
+    busy = occ.busy_mask_ids(table.instr[i], table.group[i])
+    day = None
+    ties = []
+    for sid in iter_bits(candidates & ~busy):
+        if day is not None and occ.slots[sid][0] != day:
+            break
+        if table.zoom[i]:
+            found = sid, None
+        else:
+            rid = occ.first_free_room_id(sid)
+            if rid is None:
+                continue
+            found = sid, rid
+        if rng is None:
+            return found
+        day = occ.slots[sid][0]
+        ties.append(found)
+    return rng.choice(ties) if ties else None
+
+
+def place_courses(table, occ, order=None, rng=None):
+    """
+    Penempatan awal first-fit di atas `domain` tiap baris.
+    `rng` (random.Random): pecah seri slot secara acak (lihat `first_fit`).
+    Returns:
+        list baris yang tidak mendapat slot
+    """
+    unplaced = []
+    for i in range(len(table)) if order is None else order:
+        if table.pinned[i] or table.slot[i] >= 0:
+            continue
+        found = first_fit(table, occ, i, table.domain[i], rng)
+        if found is None:
+            unplaced.append(i)
+            continue
+        table.slot[i], table.room[i] = found
+        occ.restore(i, table.entry(i))
+    return unplaced
+
+
+def _slot_rooms(free, zoom_flags):
+    """Ruang untuk baris-baris satu slot: ruang kosong (`free`) dibagi berurutan; None untuk zoom/habis."""
+    free = iter_bits(free)
+    return [None if zoom else next(free, None) for zoom in zoom_flags]
+
+
+def assign_rooms(table, occ, rows, workers=None):
+    """
+    Beri ruang untuk `rows` yang sudah punya slot lalu catat di `occ`.
+    Per slot, ruang kosong (di luar ruang yang sudah terpakai, mis. PWK) dibagi
+    sesuai urutan prioritas ruang & urutan baris. Slot saling independen,
+    jadi bisa dikerjakan paralel (`workers` > 1).
+    Returns:
+        list baris luring yang tidak kebagian ruang (slot di-reset ke -1)
+    """
+    by_slot = {}
+    for i in rows:
+        occ.remove(i)
+        by_slot.setdefault(table.slot[i], []).append(i)
+    jobs = [(~occ.room_mask[sid] & occ.assignable_rooms, [table.zoom[i] for i in idxs])
+            for sid, idxs in by_slot.items()]
+    if workers and workers > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(workers) as ex:
+            results = list(ex.map(lambda job: _slot_rooms(*job), jobs))
+    else:
+        results = [_slot_rooms(*job) for job in jobs]
+
+    unplaced = []
+    for idxs, rooms in zip(by_slot.values(), results):
+        for i, rid in zip(idxs, rooms):
+            table.room[i] = rid
+            if rid is None and not table.zoom[i]:
+                table.slot[i] = -1
+                unplaced.append(i)
+                continue
+            occ.restore(i, table.entry(i))
+    return unplaced
+
+
+def place_slots(table, occ, order=None):
+    """
+    Fase 1 penempatan dua fase: pilih slot saja (first-fit di `domain`) dengan
+    cek dosen & mahasiswa, plus batas jumlah MK luring per slot = ruang kosong.
+    Dosen & kelompok langsung tercatat di `occ`; ruang belum.
+    Returns:
+        (baris yang mendapat slot, baris yang tidak)
+    """
+    cap = [popcount(~m & occ.assignable_rooms) for m in occ.room_mask]
+    full = sum(1 << sid for sid, c in enumerate(cap) if c == 0)
+    placed, unplaced = [], []
+    for i in range(len(table)) if order is None else order:
+        if table.pinned[i] or table.slot[i] >= 0:
+            continue
+        mask = table.domain[i] & ~occ.busy_mask_ids(table.instr[i], table.group[i])
+        if not table.zoom[i]:
+            mask &= ~full
+        if not mask:
+            unplaced.append(i)
+            continue
+        sid = (mask & -mask).bit_length() - 1
+        table.slot[i] = sid
+        occ.restore(i, table.entry(i))  # room masih None
+        placed.append(i)
+        if not table.zoom[i]:
+            cap[sid] -= 1
+            if cap[sid] == 0:
+                full |= 1 << sid
+    return placed, unplaced
+
+
+def place_two_phase(table, occ, order=None, workers=None):
+    """
+    Penempatan dua fase: slot dulu (`place_slots`), lalu ruang per slot
+    (`assign_rooms`, bisa paralel). Karena jumlah MK luring per slot dibatasi
+    kapasitas ruang, fase ruang selalu berhasil dan tidak ada bentrok ruang.
+    Returns:
+        list baris yang tidak mendapat slot
+    """
+    placed, unplaced = place_slots(table, occ, order)
+    unplaced.extend(assign_rooms(table, occ, placed, workers))
+    return sorted(unplaced)
+
+
+def room_full_slots(occ):
+    """Bitmask slot yang semua ruang assignable-nya sudah terpakai."""
+    full = occ.assignable_rooms
+    return sum(1 << sid for sid, m in enumerate(occ.room_mask) if m & full == full)
+
+
+def feasible_slots(table, occ, i, full=None):
+    """Bitmask slot di `domain` baris i yang masih bisa dipakai (dosen, mahasiswa & ruang bebas)."""
+    mask = table.domain[i] & ~occ.busy_mask_ids(table.instr[i], table.group[i])
+    if not table.zoom[i]:
+        mask &= ~(room_full_slots(occ) if full is None else full)
+    return mask
+
+
+def place_courses_dsatur(table, occ):
+    """
+    Penempatan awal most-constrained-first (gaya DSatur): baris dengan slot
+    feasible tersisa paling sedikit ditempatkan duluan; seri dipecah dengan
+    jumlah tetangga (dosen/kelompok yang sama) terbanyak, lalu urutan tabel.
+    Kunci diperbarui setiap ada penempatan yang mengurangi slot tetangga
+    (antrian prioritas dengan entri basi yang dilewati).
+    Returns:
+        list baris yang tidak mendapat slot
+    """
+    todo = [i for i in range(len(table)) if not table.pinned[i] and table.slot[i] < 0]
+    by_instr, by_group = {}, {}
+    for i in todo:
+        for iid in table.instr[i]:
+            by_instr.setdefault(iid, []).append(i)
+        if table.group[i] is not None:
+            by_group.setdefault(table.group[i], []).append(i)
+    degree = {i: sum(len(by_instr[iid]) for iid in table.instr[i])
+                 + (len(by_group[table.group[i]]) if table.group[i] is not None else 0)
+              for i in todo}
+
+    full = room_full_slots(occ)
+    key = {}
+    heap = []
+
+    def push(i):
+        key[i] = (popcount(feasible_slots(table, occ, i, full)), -degree[i], i)
+        heapq.heappush(heap, key[i])
+
+    for i in todo:
+        push(i)
+
+    unplaced = []
+    while heap:
+        k = heapq.heappop(heap)
+        i = k[2]
+        if key.get(i) != k:
+            continue  # entri basi, sudah ditempatkan / di-rekey
+        del key[i]
+        found = first_fit(table, occ, i, table.domain[i])
+        if found is None:
+            unplaced.append(i)
+            continue
+        sid, rid = found
+        table.slot[i], table.room[i] = found
+        occ.restore(i, table.entry(i))
+
+        # Re-key baris yang kehilangan slot `sid`
+        affected = set()
+        for iid in table.instr[i]:
+            affected.update(by_instr[iid])
+        if table.group[i] is not None:
+            affected.update(by_group[table.group[i]])
+        if rid is not None and not (full >> sid) & 1 and occ.first_free_room_id(sid) is None:
+            full |= 1 << sid
+            affected.update(j for j in key if not table.zoom[j] and (table.domain[j] >> sid) & 1)
+        for j in affected:
+            if j in key:
+                push(j)
+    return sorted(unplaced)
+
+
+def move_course(table, occ, i):
+    """Pindahkan baris i ke slot bebas pertama di `allowed` (tidak memindahkan pinned)."""
+    if table.pinned[i]:
+        return False
+    old = occ.remove(i)
+    found = first_fit(table, occ, i, table.allowed[i])
+    if found is None:
+        occ.restore(i, old)
+        return False
+    table.slot[i], table.room[i] = found
+    occ.restore(i, table.entry(i))
+    return True
+
+
+def reroom_course(table, occ, i):
+    """Ganti ruang baris i di slot yang sama kalau masih ada ruang kosong."""
+    if table.pinned[i] or table.zoom[i] or table.slot[i] < 0:
+        return False
+    rid = occ.first_free_room_id(table.slot[i])
+    if rid is None:
+        return False
+    occ.remove(i)
+    table.room[i] = rid
+    occ.restore(i, table.entry(i))
+    return True
+
+
+CONFLICT_KINDS = ("room", "instructor", "student")
+
+
+def remaining_conflicts(occ):
+    """Jumlah grup bentrok per jenis di seluruh slot."""
+    return {kind: sum(len(occ.slot_conflicts(sid, kind)) for sid in range(len(occ.slots)))
+            for kind in CONFLICT_KINDS}
+
+
+def soft_score(table, occ):
+    """
+    Skor lunak (lebih kecil lebih baik):
+    (jumlah MK di luar hari `allowed`-nya, ketimpangan beban harian)
+    Ketimpangan = jumlah (beban hari terpadat - tersepi) per kelompok MK
+    dengan `allowed` yang sama (reguler dibanding Senin-Jumat, NR Sabtu-Minggu).
+    """
+    outside = 0
+    load = {}  # allowed -> {hari: jumlah MK}
+    for sid, ok in zip(table.slot, table.allowed):
+        if sid < 0:
+            continue
+        if not (ok >> sid) & 1:
+            outside += 1
+            continue
+        per_day = load.setdefault(ok, {})
+        day = occ.slots[sid][0]
+        per_day[day] = per_day.get(day, 0) + 1
+    spread = 0
+    for ok, per_day in load.items():
+        loads = [per_day.get(day, 0) for day in {occ.slots[sid][0] for sid in iter_bits(ok)}]
+        spread += max(loads) - min(loads)
+    return outside, spread
+
+
+def _clashes(table, i, j, kind):
+    """True kalau baris i dan j masih bentrok `kind` (slot sama + ruang/dosen/kelompok sama)."""
+    if table.slot[i] != table.slot[j] or table.slot[i] < 0:
+        return False
+    if kind == "room":
+        return table.room[i] is not None and table.room[i] == table.room[j]
+    if kind == "instructor":
+        return bool(set(table.instr[i]) & set(table.instr[j]))
+    return table.group[i] is not None and table.group[i] == table.group[j]
+
+
+def _slot_clash(table, occ, i):
+    """True kalau baris i bentrok dosen/kelompok dengan baris lain di slotnya."""
+    return any(_clashes(table, i, j, kind) for j in occ.slot_rows[table.slot[i]] if j != i
+               for kind in ("instructor", "student"))
+
+
+def resolve_courses(table, occ, max_iters=120, on_move=None, on_iteration=None):
+    """
+    Resolusi bentrok berbasis worklist slot kotor (lihat `jadwal.resolve_all`).
+    `on_move(iteration, i, kind)` / `on_iteration(iteration, n_dirty)` untuk logging.
+    Returns:
+        {"moves", "iterations", "remaining": {"room", "instructor", "student"}}
+    """
+    dirty = [sid for sid in range(len(occ.slots)) if occ.has_conflict(sid)]
+    moves = 0
+    iteration = 0
+
+    while dirty and iteration < max_iters:
+        if on_iteration:
+            on_iteration(iteration, len(dirty))
+        touched = set()
+        for sid in dirty:
+            # Urutan: ruang, lalu dosen, lalu mahasiswa (utamakan jaga pinned)
+            for kind in CONFLICT_KINDS:
+                for idxs in occ.slot_conflicts(sid, kind):
+                    idxs = sorted(i for i in idxs if table.slot[i] == sid)
+                    if len(idxs) < 2:
+                        continue  # sudah terurai oleh pemindahan sebelumnya
+                    # Prioritas: pinned > baris pertama
+                    keep = next((i for i in idxs if table.pinned[i]), idxs[0])
+                    others = [i for i in idxs if i != keep]
+                    for i in others + [keep]:
+                        # Yang dipertahankan hanya dipindah kalau bentrok masih tersisa
+                        if i == keep and not any(_clashes(table, keep, j, kind) for j in others):
+                            break
+                        # Bentrok ruang saja: cukup ganti ruang kalau slotnya masih ada ruang kosong
+                        if (kind == "room" and not _slot_clash(table, occ, i) and reroom_course(table, occ, i)) \
+                                or move_course(table, occ, i):
+                            moves += 1
+                            touched.update((sid, table.slot[i]))
+                            if on_move:
+                                on_move(iteration, i, kind)
+        iteration += 1
+        if not touched:
+            break
+        # Slot macet dicoba lagi hanya kalau ada pemindahan yang membebaskan tempat
+        stuck = {sid for sid in dirty if occ.has_conflict(sid)}
+        dirty = sorted(sid for sid in touched | stuck if occ.has_conflict(sid))
+
+    return dict(moves=moves, iterations=iteration, remaining=remaining_conflicts(occ))
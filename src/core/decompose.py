@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Dekomposisi MK ke komponen independen + penyelesaian paralel per komponen.
+
+Dua MK saling memengaruhi (selain lewat ruang) hanya kalau berbagi dosen
+atau kelompok mahasiswa DAN hari kandidatnya (`domain | allowed`) beririsan;
+MK NR/MKDU (akhir pekan) dan MK reguler (Senin-Jumat) dengan dosen yang sama
+tidak pernah bisa bentrok. Union-find di atas relasi itu memecah MK ke
+komponen yang bisa diselesaikan terpisah (penempatan + resolusi), masing-
+masing di proses worker. Komponen hanya bersaing soal ruang: supaya tidak
+semua komponen menumpuk di slot paling awal, ruang kosong tiap slot dibagi
+dulu ke komponen (`room_shares`, sebanding permintaan MK luring-nya di slot
+itu) dan tiap komponen hanya memakai bagiannya. Setelah digabung ruang
+dibagi ulang per slot; MK yang tidak kebagian ruang ditempatkan ulang
+first-fit lalu diresolusi di tabel penuh.
+
+Tiap komponen diselesaikan dari keadaan awal yang sama (baris tetap/PWK saja),
+jadi hasilnya tidak bergantung pada jumlah worker.
+"""
+
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from courses import assign_rooms, iter_bits, place_courses, resolve_courses
+
+_base = None  # (table, occ) ter-pickle, per proses worker
+
+
+def _init_worker(state):
+    global _base
+    _base = state
+
+
+class UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # akar = baris terkecil supaya label komponen stabil
+            if rb < ra:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+
+def components(table, rows=None):
+    """
+    Pecah `rows` (default semua baris non-pinned tanpa slot) ke komponen
+    independen: union baris yang berbagi dosen / kelompok mahasiswa dengan
+    hari kandidat beririsan.
+    Returns:
+        list komponen (list baris terurut), urut dari baris terkecil
+    """
+    if rows is None:
+        rows = [i for i in range(len(table)) if not table.pinned[i] and table.slot[i] < 0]
+    uf = UnionFind(len(table))
+    buckets = {}
+    for i in rows:
+        for iid in table.instr[i]:
+            buckets.setdefault(("instr", iid), []).append(i)
+        if table.group[i] is not None:
+            buckets.setdefault(("group", table.group[i]), []).append(i)
+    for members in buckets.values():
+        # Satu wakil per bitmask hari; wakil dengan bitmask beririsan digabung
+        reps = {}
+        for i in members:
+            mask = table.domain[i] | table.allowed[i]
+            rep = reps.setdefault(mask, i)
+            uf.union(rep, i)
+        masks = list(reps.items())
+        for a, (mask_a, rep_a) in enumerate(masks):
+            for mask_b, rep_b in masks[a + 1:]:
+                if mask_a & mask_b:
+                    uf.union(rep_a, rep_b)
+    comps = {}
+    for i in rows:
+        comps.setdefault(uf.find(i), []).append(i)
+    return [sorted(c) for _, c in sorted(comps.items())]
+
+
+def room_shares(table, occ, comps):
+    """
+    Bagi ruang kosong tiap slot ke komponen, sebanding jumlah MK luring
+    komponen yang slot itu ada di `domain`-nya (smooth weighted round-robin;
+    kredit dibawa antar slot, jadi komponen kecil tetap kebagian ruang di
+    sebagian slot). Bagian antar komponen tidak beririsan.
+    Returns:
+        list per komponen: list bitmask ruang per slot
+    """
+    shares = [[0] * len(occ.slots) for _ in comps]
+    credit = [0] * len(comps)
+    for sid in range(len(occ.slots)):
+        bit = 1 << sid
+        demand = [sum(1 for i in comp if not table.zoom[i] and table.domain[i] & bit) for comp in comps]
+        total = sum(demand)
+        if not total:
+            continue
+        for rid in iter_bits(~occ.room_mask[sid] & occ.assignable_rooms):
+            for k, d in enumerate(demand):
+                credit[k] += d
+            k = max((k for k, d in enumerate(demand) if d), key=lambda k: (credit[k], -k))
+            credit[k] -= total
+            shares[k][sid] |= 1 << rid
+    return shares
+
+
+def solve_batch(batch, place=place_courses, max_iters=120, state=None, shares=None):
+    """
+    Selesaikan tiap komponen di `batch` (list komponen) dari state ter-pickle
+    (default: state worker), satu per satu dari keadaan awal yang sama.
+    `shares`: bagian ruang per komponen (lihat `room_shares`); ruang di luar
+    bagian dianggap terpakai selama komponen itu ditempatkan.
+    Returns:
+        list {baris: (slot, ruang)} per komponen
+    """
+    table, occ = pickle.loads(_base if state is None else state)
+    pinned = list(table.pinned)
+    base_rooms = list(occ.room_mask)
+    out = []
+    for k, comp in enumerate(batch):
+        # Baris di luar komponen dianggap pinned (dilewati penempatan & resolusi)
+        members = set(comp)
+        table.pinned = [p or i not in members for i, p in enumerate(pinned)]
+        if shares is not None:
+            occ.room_mask = [m | (occ.assignable_rooms & ~share) for m, share in zip(base_rooms, shares[k])]
+        place(table, occ)
+        resolve_courses(table, occ, max_iters)
+        out.append({i: (table.slot[i], table.room[i]) for i in comp})
+        for i in comp:
+            if table.slot[i] >= 0:
+                occ.remove(i)
+                table.slot[i], table.room[i] = -1, None
+        occ.room_mask = list(base_rooms)
+    table.pinned = pinned
+    return out
+
+
+def _batches(comps, n):
+    """Bagi indeks komponen ke `n` batch dengan jumlah baris seimbang (terbesar duluan)."""
+    batches = [[] for _ in range(n)]
+    sizes = [0] * n
+    for c in sorted(range(len(comps)), key=lambda c: len(comps[c]), reverse=True):
+        k = sizes.index(min(sizes))
+        batches[k].append(c)
+        sizes[k] += len(comps[c])
+    return [b for b in batches if b]
+
+
+def solve_components(table, occ, place=place_courses, workers=None, max_iters=120):
+    """
+    Tempatkan semua baris tanpa slot per komponen independen (paralel di
+    `workers` proses), gabungkan, lalu rekonsiliasi ruang di tabel penuh.
+    `place`: mesin penempatan fn(table, occ) (lihat jadwal.PLACEMENT_MODES).
+    Returns:
+        {"components", "largest", "courses", "overflow", "fallback", "unplaced", "stats"}
+        overflow = MK yang kehilangan ruang saat rekonsiliasi, fallback = semua MK
+        yang ditempatkan ulang serial di tabel penuh (overflow + yang tidak muat
+        di komponennya); keduanya dari `courses` MK
+    """
+    comps = components(table)
+    shares = room_shares(table, occ, comps)
+    state = pickle.dumps((table, occ))
+    if workers == 1 or len(comps) <= 1:
+        results = solve_batch(comps, place, max_iters, state, shares)
+    else:
+        batches = _batches(comps, workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(state,)) as ex:
+            parts = list(ex.map(solve_batch, [[comps[c] for c in b] for b in batches], [place] * len(batches),
+                                [max_iters] * len(batches), [None] * len(batches),
+                                [[shares[c] for c in b] for b in batches]))
+        results = [r for part in parts for r in part]
+
+    # Gabung slot dulu (dosen & kelompok tidak mungkin bentrok antar komponen)
+    placed = []
+    for result in results:
+        for i, (sid, _) in result.items():
+            if sid >= 0:
+                table.slot[i], table.room[i] = sid, None
+                occ.restore(i, table.entry(i))
+                placed.append(i)
+    # Rekonsiliasi ruang per slot (urutan baris, bukan urutan batch); yang tidak
+    # kebagian ditempatkan ulang
+    overflow = assign_rooms(table, occ, sorted(placed))
+    todo = sorted(i for comp in comps for i in comp if table.slot[i] < 0)
+    unplaced = place_courses(table, occ, todo)
+    stats = resolve_courses(table, occ, max_iters)
+    return dict(components=len(comps), largest=max(map(len, comps), default=0),
+                courses=sum(map(len, comps)), overflow=len(overflow), fallback=len(todo),
+                unplaced=unplaced, stats=stats)
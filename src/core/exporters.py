@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Ekspor jadwal induk tanpa lewat Excel.
+
+- Snapshot kanonik (`write_snapshot` / `read_snapshot`): JSON (selalu
+  tersedia) atau Parquet (butuh pyarrow/fastparquet, tata letak sama dengan
+  katalog jadwal di catalog.py: teks, Sesi int). Tool hilir (skrip analisis,
+  portal) membaca ini alih-alih `pd.read_excel` sheet induk.
+- Feed iCalendar (`write_ics_feeds`): satu .ics per dosen, ruang dan kelompok
+  mahasiswa (prodi, semester, kelas). Tiap MK jadi VEVENT mingguan (RRULE
+  COUNT = jumlah minggu) mulai minggu pertama semester. VEVENT tiap baris
+  dirender sekali lalu dialirkan ke semua feed yang memuatnya; file ditulis
+  baris per baris (generator `ics_lines`), plus index.json (file -> nama).
+"""
+
+import hashlib
+import json
+import re
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from catalog import read_catalog, write_catalog
+from sheet_stream import export_value
+
+SNAPSHOT_FORMATS = {".json": "json", ".parquet": "parquet", ".pq": "parquet"}
+SNAPSHOT_VERSION = 1
+
+# Kalender semester (ubah per semester atau lewat --semester-start / --weeks)
+SEMESTER_START = date(2025, 9, 1)
+SEMESTER_WEEKS = 16
+ICS_TZID = "Asia/Makassar"
+ICS_UTC_OFFSET = "+0800"  # WITA, tanpa DST
+ICS_PRODID = "-//ChronoSync//Jadwal Kuliah//ID"
+DAY_INDEX = {d: i for i, d in enumerate(["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"])}
+FEED_KINDS = ("dosen", "ruang", "kelompok")
+
+
+def _s(v):
+    v = export_value(v)
+    if isinstance(v, float) and v.is_integer():  # 1.0 dari Excel -> "1"
+        v = int(v)
+    return "" if v is None else str(v).strip()
+
+
+# =========================
+# SNAPSHOT
+# =========================
+def snapshot_path(output_path, fmt="json"):
+    """Lokasi snapshot default untuk file jadwal `output_path`."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.snapshot.{fmt}")
+
+
+def _snapshot_format(path):
+    fmt = SNAPSHOT_FORMATS.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"format snapshot tidak dikenal: {Path(path).suffix} (pakai .json atau .parquet)")
+    return fmt
+
+
+def write_snapshot(master, path):
+    """
+    Tulis jadwal induk (kolom internal: Hari, Sesi, Jam, ..., Kode_MK, D1, D2)
+    ke `path`. JSON: {"version", "columns", "records"}, nilai asli (NaN -> null).
+    Returns: path
+    """
+    path = Path(path)
+    if _snapshot_format(path) == "parquet":
+        if "Sesi" in master.columns:  # "" untuk MK UNPLACED -> null
+            master = master.assign(Sesi=pd.to_numeric(master["Sesi"], errors="coerce").astype("Int64"))
+        return write_catalog(master, path)
+    cols = [str(c) for c in master.columns]
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "columns": cols,
+        "records": [dict(zip(cols, map(export_value, row)))
+                    for row in zip(*(master[c].tolist() for c in master.columns))],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, default=str), encoding="utf-8")
+    return path
+
+
+def read_snapshot(path):
+    """Baca snapshot (JSON / Parquet) ke DataFrame jadwal induk."""
+    if _snapshot_format(path) == "parquet":
+        return read_catalog(path)
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    return pd.DataFrame(data["records"], columns=data["columns"])
+
+
+# =========================
+# iCalendar
+# =========================
+def ics_escape(text):
+    """Escape nilai TEXT (RFC 5545 3.3.11)."""
+    return (str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def ics_fold(line):
+    """Lipat baris > 75 oktet (RFC 5545 3.1), tidak memotong karakter UTF-8."""
+    if len(line.encode("utf-8")) <= 75:
+        return line
+    parts, cur, size = [], "", 0
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > (75 if not parts else 74):  # baris lanjutan diawali spasi
+            parts.append(cur)
+            cur, size = "", 0
+        cur += ch
+        size += n
+    parts.append(cur)
+    return "\r\n ".join(parts)
+
+
+def _times(jam):
+    """"07:30–09:00" -> ((7, 30), (9, 0)); None kalau tidak terbaca."""
+    m = re.match(r"\s*(\d{1,2})[:.](\d{2})\s*[–-]\s*(\d{1,2})[:.](\d{2})", _s(jam))
+    if not m:
+        return None
+    h1, m1, h2, m2 = map(int, m.groups())
+    return (h1, m1), (h2, m2)
+
+
+def first_day(start, hari):
+    """Tanggal pertama >= `start` yang jatuh pada `hari` (Senin..Minggu)."""
+    return start + timedelta(days=(DAY_INDEX[hari] - start.weekday()) % 7)
+
+
+def _instructors(row):
+    """Dosen baris: D1 (fallback Dosen) lalu D2, tanpa duplikat."""
+    return [d for d in dict.fromkeys((_s(row.get("D1")) or _s(row.get("Dosen")), _s(row.get("D2")))) if d]
+
+
+def _uid(row):
+    # Stabil per kelas MK (bukan per slot): pindah slot = update event yang sama.
+    # Dosen ikut kunci karena kelas paralel PWK tidak punya Kelas.
+    key = "|".join([_s(row.get(c)) for c in ("Kode_MK", "Prodi", "Semester", "Kelas", "NR")] + _instructors(row))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def vevent(row, start=SEMESTER_START, weeks=SEMESTER_WEEKS, stamp=None, uid=None):
+    """
+    Baris-baris VEVENT untuk satu baris jadwal (dict kolom internal); None
+    kalau belum punya slot (UNPLACED) atau jam tidak terbaca.
+    """
+    hari, times = _s(row.get("Hari")), _times(row.get("Jam"))
+    if hari not in DAY_INDEX or times is None:
+        return None
+    day = first_day(start, hari)
+    (h1, m1), (h2, m2) = times
+    stamp = stamp or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    ruang = _s(row.get("Ruang")) or "Zoom"
+    dosen = _instructors(row)
+    kelas = " ".join(x for x in (_s(row.get("Prodi")), f"Smt {_s(row.get('Semester'))}", _s(row.get("Kelas"))) if x)
+    desc = [f"{_s(row.get('Kode_MK'))} ({_s(row.get('SKS'))} SKS)", kelas, "Dosen: " + "; ".join(dosen),
+            f"Sesi {_s(row.get('Sesi'))} - {_s(row.get('Mode')) or ruang}"]
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid or _uid(row)}@chronosync",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;TZID={ICS_TZID}:{day:%Y%m%d}T{h1:02d}{m1:02d}00",
+        f"DTEND;TZID={ICS_TZID}:{day:%Y%m%d}T{h2:02d}{m2:02d}00",
+        f"RRULE:FREQ=WEEKLY;COUNT={int(weeks)}",
+        f"SUMMARY:{ics_escape(_s(row.get('Mata_Kuliah')) + ' - ' + kelas)}",
+        f"LOCATION:{ics_escape(ruang)}",
+        f"DESCRIPTION:{ics_escape(chr(10).join(desc))}",
+        "END:VEVENT",
+    ]
+    return [ics_fold(line) for line in lines]
+
+
+def ics_lines(name, events):
+    """Generator baris satu kalender: header, VTIMEZONE, `events` (list baris VEVENT), footer."""
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield f"PRODID:{ICS_PRODID}"
+    yield "CALSCALE:GREGORIAN"
+    yield ics_fold(f"X-WR-CALNAME:{ics_escape(name)}")
+    yield f"X-WR-TIMEZONE:{ICS_TZID}"
+    yield "BEGIN:VTIMEZONE"
+    yield f"TZID:{ICS_TZID}"
+    yield "BEGIN:STANDARD"
+    yield "DTSTART:19700101T000000"
+    yield f"TZOFFSETFROM:{ICS_UTC_OFFSET}"
+    yield f"TZOFFSETTO:{ICS_UTC_OFFSET}"
+    yield "END:STANDARD"
+    yield "END:VTIMEZONE"
+    for ev in events:
+        yield from ev
+    yield "END:VCALENDAR"
+
+
+def feed_keys(row):
+    """(jenis, nama feed) yang memuat baris ini: dosen (D1/Dosen, D2), ruang (bukan Zoom), kelompok."""
+    keys = [("dosen", d) for d in _instructors(row)]
+    ruang = _s(row.get("Ruang"))
+    if ruang and "zoom" not in (_s(row.get("Mode")) + ruang).lower():
+        keys.append(("ruang", ruang))
+    group = (_s(row.get("Prodi")), _s(row.get("Semester")), _s(row.get("Kelas")))
+    if all(group):
+        keys.append(("kelompok", " ".join(group)))
+    return keys
+
+
+def slugify(name, maxlen=80):
+    slug = re.sub(r"[^0-9a-z]+", "-", name.lower()).strip("-")[:maxlen].strip("-")
+    return slug or "x"
+
+
+def write_ics_feeds(master, out_dir, start=SEMESTER_START, weeks=SEMESTER_WEEKS, kinds=FEED_KINDS):
+    """
+    Tulis `out_dir`/<jenis>/<slug>.ics untuk tiap dosen / ruang / kelompok
+    mahasiswa di jadwal induk `master` (kolom internal) + `out_dir`/index.json.
+    Baris tanpa slot dilewati.
+    Returns: {jenis: jumlah file}
+    """
+    out_dir = Path(out_dir)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    cols = list(master.columns)
+    feeds = {}  # (jenis, nama) -> [VEVENT]
+    seen_uid = {}
+    for values in zip(*(master[c].tolist() for c in cols)):
+        row = dict(zip(cols, values))
+        uid = _uid(row)
+        seen_uid[uid] = seen_uid.get(uid, 0) + 1
+        if seen_uid[uid] > 1:
+            # Hanya baris yang identik di semua kolom kunci (MK, kelas & dosen sama,
+            # beberapa pertemuan seminggu): event-nya saling tertukar tanpa beda isi
+            uid = f"{uid}-{seen_uid[uid]}"
+        ev = vevent(row, start, weeks, stamp, uid)
+        if ev is None:
+            continue
+        for key in feed_keys(row):
+            if key[0] in kinds:
+                feeds.setdefault(key, []).append(ev)
+
+    index, counts, used = {}, dict.fromkeys(kinds, 0), set()
+    for (kind, name), events in feeds.items():
+        slug = base = slugify(name)
+        n = 1
+        while (kind, slug) in used:
+            n += 1
+            slug = f"{base}-{n}"
+        used.add((kind, slug))
+        path = out_dir / kind / f"{slug}.ics"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for line in ics_lines(name, events):
+                f.write(line + "\r\n")
+        index[f"{kind}/{slug}.ics"] = {"kind": kind, "name": name, "events": len(events)}
+        counts[kind] += 1
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "index.json").write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+    return counts
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Analisis kelayakan cepat sebelum penempatan (batas bawah, tanpa search).
+
+Dari CourseTable terkompilasi dihitung permintaan vs kapasitas untuk:
+- dosen:    MK per dosen vs slot bebas di hari kandidatnya
+- kelompok: MK per kelompok mahasiswa (prodi, semester, kelas) vs slot bebas
+- ruang:    MK luring per kelas hari (reguler / akhir pekan / Sabtu MKDU) vs
+            jumlah ruang kosong di slot hari tersebut
+Baris pinned (PWK) yang sudah punya slot mengurangi kapasitas. Tiap cek
+memakai kondisi Hall: untuk setiap gabungan bitmask hari U, MK yang hanya
+boleh di dalam U tidak boleh lebih banyak dari kapasitas U. Pelanggaran
+berarti jadwal pasti punya MK UNPLACED, apa pun algoritmanya.
+"""
+
+from courses import iter_bits, popcount
+
+MAX_MASKS = 8  # batas bitmask berbeda per sumber daya untuk enumerasi gabungan
+
+
+class InfeasibleSchedule(RuntimeError):
+    """Permintaan melebihi kapasitas; `report` = hasil `analyze`."""
+
+    def __init__(self, report):
+        super().__init__(format_report(report))
+        self.report = report
+
+
+def _unions(masks):
+    """Semua gabungan tak kosong dari bitmask `masks` (himpunan)."""
+    out = set()
+    for m in masks:
+        out |= {u | m for u in out}
+        out.add(m)
+    return out
+
+
+def _hall(rows, masks, capacity):
+    """
+    Pelanggaran Hall terburuk untuk `rows` (bitmask kandidat `masks[i]`).
+    `capacity(U)` = kapasitas gabungan slot U.
+    Returns:
+        (permintaan, kapasitas, U, baris) atau None kalau memenuhi
+    """
+    distinct = {masks[i] for i in rows}
+    if len(distinct) > MAX_MASKS:
+        # Terlalu banyak kombinasi: cukup cek per bitmask + gabungan semuanya
+        full = 0
+        for m in distinct:
+            full |= m
+        unions = distinct | {full}
+    else:
+        unions = _unions(distinct)
+    worst = None
+    for u in unions:
+        inside = [i for i in rows if not masks[i] & ~u]
+        cap = capacity(u)
+        if len(inside) > cap and (worst is None or len(inside) - cap > worst[0] - worst[1]):
+            worst = (len(inside), cap, u, inside)
+    return worst
+
+
+def day_names(occ, mask):
+    """Nama hari (urutan slot) yang punya slot di `mask`."""
+    days = []
+    for sid in iter_bits(mask):
+        day = occ.slots[sid][0]
+        if day not in days:
+            days.append(day)
+    return days
+
+
+def analyze(table, occ, masks=None):
+    """
+    Cek kelayakan `table` (baris non-pinned = permintaan, pinned bertempat =
+    kapasitas terpakai). `masks`: bitmask slot kandidat per baris (default `domain`).
+    Returns:
+        list bottleneck, paling parah dulu:
+        {"kind": "instructor"|"group"|"rooms"|"domain", "name", "demand",
+         "capacity", "days": [hari], "rows": [baris]}
+    """
+    masks = table.domain if masks is None else masks
+    fixed_instr, fixed_group = {}, {}
+    free_rooms = [popcount(occ.assignable_rooms)] * len(occ.slots)
+    demand_instr, demand_group, demand_rooms = {}, {}, {}
+    report = []
+    for i in range(len(table)):
+        if table.pinned[i]:
+            sid = table.slot[i]
+            if sid < 0:
+                continue
+            bit = 1 << sid
+            for iid in table.instr[i]:
+                fixed_instr[iid] = fixed_instr.get(iid, 0) | bit
+            if table.group[i] is not None:
+                fixed_group[table.group[i]] = fixed_group.get(table.group[i], 0) | bit
+            if table.room[i] is not None and (occ.assignable_rooms >> table.room[i]) & 1:
+                free_rooms[sid] -= 1
+            continue
+        if not masks[i]:
+            report.append(dict(kind="domain", name=f"baris {i}", demand=1, capacity=0, days=[], rows=[i]))
+            continue
+        for iid in table.instr[i]:
+            demand_instr.setdefault(iid, []).append(i)
+        if table.group[i] is not None:
+            demand_group.setdefault(table.group[i], []).append(i)
+        if not table.zoom[i]:
+            demand_rooms.setdefault(masks[i], []).append(i)
+    # Ruang yang dipakai bersama oleh beberapa baris pinned bisa membuat negatif
+    free_rooms = [max(n, 0) for n in free_rooms]
+
+    def check(kind, name, rows, capacity):
+        worst = _hall(rows, masks, capacity)
+        if worst is not None:
+            demand, cap, u, inside = worst
+            report.append(dict(kind=kind, name=name, demand=demand, capacity=cap,
+                               days=day_names(occ, u), rows=inside))
+
+    for iid, rows in demand_instr.items():
+        busy = fixed_instr.get(iid, 0)
+        if len(rows) > 1 or busy:
+            check("instructor", occ.instructors[iid], rows, lambda u, busy=busy: popcount(u & ~busy))
+    for gid, rows in demand_group.items():
+        busy = fixed_group.get(gid, 0)
+        if len(rows) > 1 or busy:
+            check("group", " ".join(occ.groups[gid]), rows, lambda u, busy=busy: popcount(u & ~busy))
+    if demand_rooms:
+        rows = [i for group in demand_rooms.values() for i in group]
+        check("rooms", "ruang", rows, lambda u: sum(free_rooms[sid] for sid in iter_bits(u)))
+
+    report.sort(key=lambda b: (b["capacity"] - b["demand"], b["kind"], b["name"]))
+    return report
+
+
+def lower_bound(report):
+    """
+    Batas bawah jumlah MK UNPLACED: jumlah defisit bottleneck yang barisnya
+    saling lepas (bottleneck yang berbagi baris hanya dihitung sekali).
+    """
+    used, total = set(), 0
+    for b in report:
+        if used.isdisjoint(b["rows"]):
+            used.update(b["rows"])
+            total += b["demand"] - b["capacity"]
+    return total
+
+
+def format_report(report, limit=10):
+    """Ringkasan bottleneck yang bisa dicetak."""
+    if not report:
+        return "Kelayakan: OK (permintaan <= kapasitas untuk dosen, kelompok & ruang)"
+    labels = {"instructor": "Dosen", "group": "Kelompok", "rooms": "Ruang", "domain": "Hari"}
+    lines = [f"Kelayakan: {len(report)} bottleneck, minimal {lower_bound(report)} MK pasti UNPLACED"]
+    for b in report[:limit]:
+        days = ", ".join(b["days"]) or "-"
+        lines.append(f"  - {labels[b['kind']]} {b['name']}: {b['demand']} MK vs kapasitas {b['capacity']} ({days})")
+    if len(report) > limit:
+        lines.append(f"  ... {len(report) - limit} lainnya")
+    return "\n".join(lines)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Cache hasil loader Excel (DataFrame ternormalisasi) di data/output/intermediate.
+
+Kunci entri = hash isi file sumber (sha256) + nama & versi loader, jadi
+entri otomatis basi kalau file sumber berubah atau loader dinaikkan
+versinya; entri lama loader yang sama dihapus saat entri baru ditulis.
+Hash file di-memo per (path, ukuran, mtime) supaya file besar tidak dibaca
+ulang dalam satu proses.
+
+Format: Parquet kalau pyarrow terpasang dan frame-nya bisa ditulis apa adanya;
+selain itu pickle pandas (kolom object campuran seperti SKS int/"" tidak
+bisa disimpan di Parquet tanpa mengubah tipe).
+
+Matikan dengan CHRONOSYNC_CACHE=0 atau `input_cache.enabled = False`.
+"""
+
+import functools
+import hashlib
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+CACHE_DIR = Path("data") / "output" / "intermediate" / "cache"
+CACHE_VERSION = 1  # naikkan kalau format entri berubah
+enabled = os.environ.get("CHRONOSYNC_CACHE", "1") != "0"
+
+_hashes = {}  # (path, size, mtime_ns) -> sha256
+
+
+def file_hash(path):
+    """sha256 isi file (di-memo per ukuran & mtime)."""
+    path = Path(path)
+    st = path.stat()
+    key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    digest = _hashes.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = _hashes[key] = h.hexdigest()
+    return digest
+
+
+def cache_key(name, paths, version=1, extra=None):
+    """Kunci entri untuk loader `name` dengan file sumber `paths` (+ konfigurasi `extra`)."""
+    h = hashlib.sha256(f"{name}:{version}:{CACHE_VERSION}".encode())
+    if extra is not None:
+        h.update(repr(extra).encode())
+    for path in paths:
+        h.update(file_hash(path).encode())
+    return h.hexdigest()[:20]
+
+
+def _entries(name):
+    if not CACHE_DIR.is_dir():
+        return []
+    return [p for p in CACHE_DIR.iterdir() if p.name.startswith(f"{name}-")]
+
+
+def _lookup(name, key):
+    """Path entri `name` dengan kunci `key`, atau None."""
+    return next((p for p in _entries(name) if p.stem == f"{name}-{key}"), None)
+
+
+def _read(path):
+    return pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_pickle(path)
+
+
+def _write(df, stem):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    if HAS_PARQUET:
+        path = CACHE_DIR / f"{stem}.parquet"
+        try:
+            df.to_parquet(path)
+            return path
+        except Exception:
+            path.unlink(missing_ok=True)  # tipe campuran: pakai pickle
+    path = CACHE_DIR / f"{stem}.pkl"
+    df.to_pickle(path)
+    return path
+
+
+def cached(sources, version=1, extra=None):
+    """
+    Decorator loader tanpa argumen yang mengembalikan DataFrame.
+    `sources`: fungsi tanpa argumen -> list path file sumber (dibaca saat
+    dipanggil, jadi BASE_DIR / path yang diganti skrip tetap terpakai).
+    `version`: naikkan kalau logika normalisasi loader berubah.
+    `extra`: fungsi tanpa argumen -> konfigurasi yang memengaruhi hasil (repr-nya
+    ikut kunci), mis. daftar kata kunci filter MK.
+    """
+    def wrap(fn):
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def load():
+            if not enabled:
+                return fn()
+            try:
+                key = cache_key(name, sources(), version, extra and extra())
+            except OSError:
+                return fn()  # file sumber tidak ada: biar loader yang melapor
+            path = _lookup(name, key)
+            if path is not None:
+                try:
+                    return _read(path)
+                except Exception:
+                    pass  # entri rusak: parse ulang
+            df = fn()
+            try:
+                for old in _entries(name):
+                    old.unlink(missing_ok=True)
+                _write(df, f"{name}-{key}")
+            except OSError as e:
+                print(f"WARNING: cache {name} tidak bisa ditulis: {e}")
+            return df
+
+        def is_cached():
+            """True kalau pemanggilan berikutnya cukup membaca cache (tanpa parse Excel)."""
+            if not enabled:
+                return False
+            try:
+                return _lookup(name, cache_key(name, sources(), version, extra and extra())) is not None
+            except OSError:
+                return False
+
+        load.uncached = fn
+        load.is_cached = is_cached
+        return load
+    return wrap
+
+
+def clear(name=None):
+    """Hapus entri cache (semua, atau satu loader)."""
+    if not CACHE_DIR.is_dir():
+        return 0
+    paths = [p for p in CACHE_DIR.iterdir() if name is None or p.name.startswith(f"{name}-")]
+    for p in paths:
+        p.unlink(missing_ok=True)
+    return len(paths)
@@ -12,10 +12,31 @@ Aturan:
 
 import pandas as pd
 import numpy as np
+import os
 import re
-from collections import defaultdict
+import pickle
+import datetime
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from occupancy import OccupancyIndex
+from symbols import SymbolTable, symbols_path
+from courses import CourseTable, place_courses, place_courses_dsatur, place_two_phase, resolve_courses
+from coloring import color_courses
+from multistart import multistart
+from anneal import anneal
+from repair import tabu_repair
+from matching import match_courses
+from decompose import solve_components
+from feasibility import InfeasibleSchedule, analyze, format_report
+import input_cache
+from input_cache import cached
+from keywords import EXCLUDED, MKDU, PRACTICUM, KeywordClassifier
+from sheet_stream import at, frame_rows, iter_rows, write_workbook
+from sources import get_parser, load_registry, parser, schedule_sources
+from catalog import catalog_format, read_catalog, write_catalog
+from exporters import snapshot_path, write_ics_feeds, write_snapshot
+
 # =========================
 # KONFIGURASI (ubah kalau perlu)
 # =========================
@@ -26,36 +47,79 @@ MKDU_KEYWORDS = [
     'bahasa arab', 'aik', 'aqidah islam', 'komprehensif aik'
 ]
 
+PRACTICUM_KEYWORDS = ['praktikum', 'praktek', 'lab ', 'laboratorium']
+
+# MK yang tidak dijadwalkan (KKP, seminar usul) - dipakai loader Arsitektur
+EXCLUDED_KEYWORDS = ['kkp', 'seminar usul']
+
+_classifier = (None, None)
+
+def keyword_config():
+    """Himpunan kata kunci aktif (urut prioritas kategori)."""
+    return ((MKDU, tuple(MKDU_KEYWORDS)), (PRACTICUM, tuple(PRACTICUM_KEYWORDS)),
+            (EXCLUDED, tuple(EXCLUDED_KEYWORDS)))
+
+def course_classifier():
+    """KeywordClassifier untuk MKDU/praktikum/excluded; dikompilasi ulang kalau daftar kata kunci diubah."""
+    global _classifier
+    config = keyword_config()
+    if _classifier[0] != config:
+        _classifier = (config, KeywordClassifier(config))
+    return _classifier[1]
+
 def is_mkdu_course(mata_kuliah):
     """Check if a course is MKDU based on keywords"""
     if not mata_kuliah:
         return False
-    mk_lower = str(mata_kuliah).lower()
-    return any(keyword in mk_lower for keyword in MKDU_KEYWORDS)
+    return course_classifier().matches(mata_kuliah, {MKDU})
+
+# Sumber input (file, sheet, alias kolom, flag NR/pinned) ada di
+# config/sources.yaml; file dibaca relatif ke BASE_DIR.
 BASE_DIR = Path(".")  # current directory
-FILE_INF = BASE_DIR / "JADWAL SEMESTER.xlsx"
-FILE_PENG = BASE_DIR / "Struktur Mata Kuliah Final ok.xlsx"  # Reg & NR
-FILE_EL   = BASE_DIR / "Pengampuh MK T. Elektro.xlsx"        # Reg & NR
-FILE_PWK  = BASE_DIR / "jadwal pwk ganjil 2025 2026.xlsx"    # jadwal asli
-FILE_ARS  = BASE_DIR / "JADWAL GANJIL 25-26_ARSITEKTUR.xlsx"
-FILE_MKDU = BASE_DIR / "MKDU 20251.xlsx"
-
-SHEET_INF = "Sheet1"
-SHEET_PENG_REG = "Jadwal Reguler"
-SHEET_PENG_NR  = "Jadwal Non Reg"
-SHEET_EL_REG   = "Pengampuh MK 2025(1) REG "
-SHEET_EL_NR    = "Pengampuh MK 2025(1) NR "
-SHEET_PWK      = "Sheet1"
-SHEET_ARS      = "Pengampuh GANJIL"
-SHEET_MKDU     = "Sheet1"
+SOURCES = load_registry()
+
+# Folder katalog kanonik hasil `jadwal.py convert` (<nama>.parquet / .csv);
+# kalau diisi, katalog di sana dipakai alih-alih file Excel sumbernya
+CATALOG_DIR = os.environ.get("CHRONOSYNC_CATALOG") or None
+
+def source_file(name):
+    """Path file sumber `name` (registry) relatif ke BASE_DIR."""
+    return BASE_DIR / SOURCES[name]["file"]
+
+def catalog_file(name):
+    """Katalog kanonik sumber `name` di CATALOG_DIR (Parquet dulu, lalu CSV), atau None."""
+    if CATALOG_DIR is None:
+        return None
+    for ext in (".parquet", ".csv"):
+        path = Path(CATALOG_DIR) / f"{name}{ext}"
+        if path.exists():
+            return path
+    return None
+
+def source_paths(name):
+    """Semua file yang dibaca loader `name` (untuk kunci cache input)."""
+    cat = catalog_file(name)
+    if cat is not None:
+        return [cat]
+    extra = [BASE_DIR / sh["file"] for sh in SOURCES[name]["sheets"] if sh.get("file")]
+    return [source_file(name)] + extra
+
+def _sheet(name, nr=False):
+    return next(sh["name"] for sh in SOURCES[name]["sheets"] if sh["nr"] == nr)
+
+# Konstanta lama (dipakai skrip rescue) - turunan registry, ubah di YAML
+FILE_INF, FILE_PENG, FILE_EL, FILE_PWK, FILE_ARS, FILE_MKDU = (
+    source_file(n) for n in ("informatika", "pengairan", "elektro", "pwk", "arsitektur", "mkdu"))
+SHEET_INF = _sheet("informatika")
+SHEET_PENG_REG, SHEET_PENG_NR = _sheet("pengairan"), _sheet("pengairan", nr=True)
+SHEET_EL_REG, SHEET_EL_NR = _sheet("elektro"), _sheet("elektro", nr=True)
+SHEET_PWK = _sheet("pwk")
+SHEET_ARS = _sheet("arsitektur")
+SHEET_MKDU = _sheet("mkdu")
 
 # Kolom-kolom kemungkinan (Arsitektur kadang beda nama header)
-ARS_COL_KODE   = ("Kode MK", "KODE MK", "kode mk")
-ARS_COL_MK     = ("Mata Kuliah", "MATA KULIAH", "NAMA MATA KULIAH")
-ARS_COL_KELAS  = ("Kls", "Kelas", "KELAS")
-ARS_COL_SEM    = ("SMT", "Semester", "SEMESTER")
-ARS_COL_SKS    = ("SKS",)
-ARS_COL_DOSEN  = ("Nama Dosen", "Dosen", "DOSEN")
+ARS_COL_KODE, ARS_COL_MK, ARS_COL_KELAS, ARS_COL_SEM, ARS_COL_SKS, ARS_COL_DOSEN = (
+    tuple(SOURCES["arsitektur"]["columns"][k]) for k in ("kode", "mk", "kelas", "sem", "sks", "dosen"))
 
 # =========================
 # UTIL & STRUKTUR WAKTU
@@ -85,6 +149,60 @@ def combine_dosen(*vals):
     d1 = out[0]; d2 = out[1] if len(out)>1 else ""
     return "; ".join(out), d1, d2
 
+# ---- versi per kolom (loader): hasil sama dengan versi per sel di atas ----
+def _col(df, c):
+    return df[c] if c in df.columns else pd.Series("", index=df.index)
+
+def _first_col(df, *names):
+    c = next((n for n in names if n in df.columns), None)
+    return df[c] if c is not None else pd.Series("", index=df.index, dtype=object)
+
+def _norm_col(sr):
+    return sr.astype(object).where(sr.notna(), "").astype(str).str.strip()
+
+def extract_semester_col(sr):
+    """`extract_semester` untuk satu kolom: Series object berisi int atau ""."""
+    s = _norm_col(sr).str.upper()
+    roman = s.str.extract(r'^(VIII|VII|VI|IV|V|III|II|I)', expand=False)
+    num = s.str.extract(r'^(\d+)', expand=False)
+    out = pd.Series("", index=s.index, dtype=object)
+    has_num, has_roman = num.notna(), roman.notna()
+    out[has_num] = [int(n) for n in num[has_num]]
+    out[has_roman] = [ROMAN_MAP[r] for r in roman[has_roman]]
+    return out
+
+def combine_dosen_cols(cols):
+    """
+    `combine_dosen` untuk kolom-kolom sejajar `cols` (list Series).
+    Returns:
+        (dosen, d1, d2) - array object: gabungan unik "; ", dosen pertama, kedua
+    """
+    n = len(cols[0]) if cols else 0
+    vals = [_norm_col(c).to_numpy(dtype=object) for c in cols]
+    empty = np.full(n, "", dtype=object)
+    # Buang nilai yang sudah muncul di kolom sebelumnya (urutan pertama dipertahankan)
+    for j in range(len(vals)):
+        for i in range(j):
+            vals[j] = np.where(vals[j] == vals[i], "", vals[j])
+    joined, d1, d2 = empty.copy(), empty.copy(), empty.copy()
+    for v in vals:
+        has = v != ""
+        joined = np.where(has & (joined != ""), joined + "; " + v, np.where(has, v, joined))
+        d2 = np.where(has & (d1 != "") & (d2 == ""), v, d2)
+        d1 = np.where(has & (d1 == ""), v, d1)
+    return joined, d1, d2
+
+def _sks_col(sr):
+    """Nilai SKS apa adanya, NaN -> ""."""
+    return sr.astype(object).where(sr.notna(), "")
+
+def _course_rows(n, **cols):
+    """DataFrame MK dari kolom-kolom (skalar diulang n kali); kosong kalau n == 0."""
+    if not n:
+        return pd.DataFrame()
+    return pd.DataFrame({k: (list(v) if isinstance(v, (list, np.ndarray, pd.Series)) else [v] * n)
+                         for k, v in cols.items()})
+
 # Sesi
 SESS_MON_THU = [(1,"07:30–09:00"),(2,"09:00–10:30"),(3,"10:30–12:00"),(4,"13:00–14:30"),(5,"15:00–16:30")]
 SESS_FRI     = [(1,"07:30–09:00"),(2,"09:00–10:30"),(3,"10:30–11:30"),(4,"13:00–14:30"),(5,"15:00–16:30")]
@@ -95,17 +213,20 @@ DAYS_WE      = ["Sabtu","Minggu"]
 ALL_ROOMS    = [f"3.{i}" for i in range(1,15)]
 LAB_ROOMS    = []  # No lab rooms needed since practicum courses are removed
 
+ALL_DAYS     = DAYS_MON_THU + DAY_FRI + DAYS_WE
+
 def is_praktikum(mata_kuliah):
     """Check if a course is a practicum/lab course"""
-    mk_lower = str(mata_kuliah).lower()
-    practicum_keywords = ['praktikum', 'praktek', 'lab ', 'laboratorium']
-    return any(keyword in mk_lower for keyword in practicum_keywords)
+    return course_classifier().matches(mata_kuliah, {PRACTICUM})
 
 def sessions_for_day(day):
     if day == "Jumat": return SESS_FRI
     if day in ("Sabtu","Minggu"): return SESS_WE
     return SESS_MON_THU
 
+ALL_SLOTS = [(day, sess) for day in ALL_DAYS for sess, _ in sessions_for_day(day)]
+SLOT_JAM  = [jam for day in ALL_DAYS for _, jam in sessions_for_day(day)]  # sejajar ALL_SLOTS
+
 def format_class_name(kelas, semester):
     """Convert class format from IA to 1A, etc."""
     if not kelas:
@@ -156,104 +277,107 @@ def format_semester_display(semester):
 # =========================
 # LOAD & NORMALISASI DATA PRODI
 # =========================
-def load_informatika():
-    df = pd.read_excel(FILE_INF, sheet_name=SHEET_INF)
-    kode_col, mk_col, kelas_col, sks_col = "Kode MK", "Mata Kuliah", "SMT", "SKS"
-    dosen_cols = [c for c in df.columns if "dosen" in c.lower()]
-    out = []
-    for _, r in df.iterrows():
-        kode = norm(r.get(kode_col,""))
-        mk   = norm(r.get(mk_col,""))
-        if not (kode and mk): continue
-        if mk=="4" and kode=="3": continue  # artefak header
-        # Skip KOMPREHENSIF AIK, practicum, and MKDU courses for Informatika
-        if "KOMPREHENSIF AIK" in mk.upper():
-            continue
-        if is_praktikum(mk):
-            continue
-
-        # Skip MKDU courses (will be handled in separate MKDU sheet)
-        if is_mkdu_course(mk):
-            continue
-
-        kelas = norm(r.get(kelas_col,""))
-        sem = extract_semester(kelas)
-        sks = r.get(sks_col,"")
-        dosen, d1, d2 = combine_dosen(*[r.get(c,"") for c in dosen_cols])
-        out.append(dict(Prodi="Informatika", Semester=sem, Kelas=kelas, Kode_MK=kode,
-                        Mata_Kuliah=mk, SKS=sks if pd.notna(sks) else "", Dosen=dosen, D1=d1, D2=d2, NR=False))
-    return pd.DataFrame(out)
-
-def load_pengairan():
-    out = []
-    for sh, is_nr in [(SHEET_PENG_REG, False), (SHEET_PENG_NR, True)]:
-        df = pd.read_excel(FILE_PENG, sheet_name=sh)
-        poss_dosen = [c for c in df.columns if "dosen" in c.lower() or "unnamed" in c.lower()]
-        for _, r in df.iterrows():
-            kode = norm(r.get("Kode MK",""))
-            mk   = norm(r.get("Mata Kuliah",""))
-            if not (kode and mk) or mk=="4": continue
-            # Skip MKDU courses (they should only be in MKDU prodi)
-            if is_mkdu_course(mk): continue
-            kelas = norm(r.get("SMT",""))
-            sem = extract_semester(kelas)
-            sks = r.get("SKS","")
-            dosen, d1, d2 = combine_dosen(*[r.get(c,"") for c in poss_dosen])
-            kelas2 = (kelas + (" NR" if is_nr else "")).strip() or ("NR" if is_nr else "")
-            out.append(dict(Prodi="Pengairan", Semester=sem, Kelas=kelas2, Kode_MK=kode,
-                            Mata_Kuliah=mk, SKS=sks if pd.notna(sks) else "", Dosen=dosen, D1=d1, D2=d2, NR=is_nr))
-    return pd.DataFrame(out)
-
-def parse_el(df):
-    # cari baris header yang memuat 'Kelas'
-    header = None
-    for i, row in df.iterrows():
-        if any(norm(v).lower()=="kelas" for v in row.values if pd.notna(v)): header = i; break
-    if header is None: return pd.DataFrame()
+# Loader per sumber dibuat dari registry (config/sources.yaml) + parser
+# terdaftar di bawah; hasilnya di-cache per hash file sumber (input_cache.py).
+# Naikkan `version` di @parser kalau logika normalisasinya diubah.
+def _header_at(df, word):
+    """Frame dengan baris header = baris pertama yang punya sel `word`; None kalau tidak ada."""
+    cells = df.stack()
+    hits = cells[_norm_col(cells).str.lower() == word.lower()]
+    if hits.empty: return None
+    header = hits.index[0][0]
     df2 = df.iloc[header:]
     df2.columns = df2.iloc[0]
-    df2 = df2[1:]
-    out = []
-    for _, r in df2.iterrows():
-        kode = norm(r.get("Kode MK",""))
-        mk   = norm(r.get("Mata Kuliah",""))
-        kelas= norm(r.get("Kelas",""))
-        if not (kode and mk and kelas): continue
-        # Skip MKDU courses (they should only be in MKDU prodi)
-        if is_mkdu_course(mk): continue
-        sem = extract_semester(kelas)
-        sks = r.get("SKS","")
-        dos  = norm(r.get("Nama Dosen",""))
-        out.append((kode,mk,kelas,sem,sks if pd.notna(sks) else "",dos))
-    cols = ["Kode_MK","Mata_Kuliah","Kelas","Semester","SKS","Dosen"]
-    return pd.DataFrame(out, columns=cols)
-
-def load_elektro():
-    reg = parse_el(pd.read_excel(FILE_EL, sheet_name=SHEET_EL_REG))
-    nr  = parse_el(pd.read_excel(FILE_EL, sheet_name=SHEET_EL_NR))
-    reg["Prodi"]="Elektro"; reg["NR"]=False; reg["D1"]=reg["Dosen"]; reg["D2"]=""
-    nr["Prodi"]="Elektro";  nr["NR"]=True;  nr["Kelas"]=nr["Kelas"]+" NR"; nr["D1"]=nr["Dosen"]; nr["D2"]=""
-    return pd.concat([reg, nr], ignore_index=True)
+    return df2[1:]
+
+def _read_flat(path):
+    """Satu tabel CSV/Parquet mentah (kolom teks, sel kosong -> NaN seperti Excel)."""
+    if catalog_format(path) == "csv":
+        return pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    return pd.read_parquet(path)
+
+def _sheet_frames(spec, path):
+    """[(DataFrame, nr)] per entri sheet; CSV/Parquet: satu file per sheet (`file` di entri sheet)."""
+    if catalog_format(path) is None:
+        with pd.ExcelFile(path) as xls:  # workbook dibuka sekali untuk semua sheet
+            return [(pd.read_excel(xls, sheet_name=sh["name"]), sh["nr"]) for sh in spec["sheets"]]
+    return [(_read_flat(BASE_DIR / sh["file"] if sh.get("file") else path), sh["nr"]) for sh in spec["sheets"]]
+
+@parser("table", version=3)
+def parse_table(spec, path):
+    """
+    Sumber berformat tabel (satu MK per baris) sesuai entri registry `spec`:
+    alias kolom, sheet (+ flag NR), baris header, kolom wajib & filter.
+    `path`: .xlsx, atau tabel mentah .csv / .parquet dengan kolom yang sama.
+    """
+    cols, exclude = spec["columns"], spec["exclude"]
+    find = (spec.get("header") or {}).get("find")
+    sheets = _sheet_frames(spec, path)
+    parts = []
+    for df, is_nr in sheets:
+        if find:
+            df = _header_at(df, find)
+            if df is None: continue
+        field = {k: _norm_col(_first_col(df, *cols.get(k, []))) for k in ("kode", "mk", "kelas")}
+        kode, mk, kelas = field["kode"], field["mk"], field["kelas"]
+        keep = (kode != "") & (mk != "")
+        for k in spec.get("require") or []:
+            keep &= field[k] != ""
+        for row in exclude.get("rows") or []:  # artefak header, mis. {mk: "4"}
+            hit = pd.Series(True, index=df.index)
+            for k, v in row.items():
+                hit &= field[k] == str(v)
+            keep &= ~hit
+        for title in exclude.get("titles") or []:
+            keep &= ~mk.str.upper().str.contains(title.upper(), regex=False)
+        if exclude.get("categories"):  # mis. MKDU hanya di prodi MKDU
+            keep &= ~course_classifier().mask(mk, set(exclude["categories"]))
+
+        if "dosen_match" in cols:
+            words = [w.lower() for w in cols["dosen_match"]]
+            dosen_cols = [df[c] for c in df.columns if any(w in str(c).lower() for w in words)]
+        else:
+            dosen_cols = [_first_col(df, *cols.get("dosen", []))]
+        dosen_cols = dosen_cols or [pd.Series("", index=df.index, dtype=object)]
+        dosen, d1, d2 = combine_dosen_cols([c[keep] for c in dosen_cols])
+        kelas = kelas[keep]
+        parts.append(_course_rows(int(keep.sum()), Prodi=spec["prodi"], Semester=extract_semester_col(kelas),
+                                  Kelas=(kelas + " NR").str.strip() if is_nr else kelas,
+                                  Kode_MK=kode[keep], Mata_Kuliah=mk[keep],
+                                  SKS=_sks_col(_first_col(df, *cols.get("sks", []))[keep]),
+                                  Dosen=dosen, D1=d1, D2=d2, NR=is_nr))
+    parts = [p for p in parts if not p.empty]
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+@parser("catalog")
+def parse_catalog(spec, path):
+    """Katalog kanonik CSV/Parquet (format hasil `jadwal.py convert`), mis. dari registrar."""
+    return read_catalog(path)
 
 def resolve_first_present(row, keys):
     for k in keys:
         if k in row and norm(row[k]): return norm(row[k])
     return ""
 
-def load_arsitektur_source():
-    # Read raw data without header to handle multiple semester sections
-    df_raw = pd.read_excel(FILE_ARS, sheet_name=SHEET_ARS, header=None)
-
-    out = []
+def _sval(v):
+    """str nilai sel stream (None -> "")."""
+    return "" if v is None else str(v).strip()
+
+def arsitektur_records(rows, prodi="Arsitektur", exclude=(MKDU, EXCLUDED),
+                       parallel_semesters=(1, 3, 5, 7), classes=("A", "B")):
+    """
+    State machine sheet pengampu Arsitektur (bagian per semester):
+    baris "Semester ..." -> ganti semester aktif, baris header (Kode MK) ->
+    dilewati, baris berisi No/Kode/MK -> MK semester aktif.
+    `rows`: iterable tuple nilai sel (lihat sheet_stream.iter_rows).
+    Yields: dict MK (semester di `parallel_semesters` -> satu per kelas
+    `classes` dengan dosen yang sama; semester lain hanya kelas pertama)
+    """
     current_semester = 1
+    for row in rows:
+        row_str = ' '.join(str(v) for v in row if v is not None).lower()
 
-    # Find all semester sections and their courses
-    i = 0
-    while i < len(df_raw):
-        row = df_raw.iloc[i]
-        row_str = ' '.join([str(val) for val in row if pd.notna(val)]).lower()
-
-        # Check if this row indicates a semester
+        # Baris judul semester
         if 'semester' in row_str:
             if 'semester vii' in row_str:
                 current_semester = 7
@@ -263,103 +387,41 @@ def load_arsitektur_source():
                 current_semester = 3
             elif 'semester i' in row_str:
                 current_semester = 1
+            continue
 
-            # Skip to next row to look for header
-            i += 1
+        # Baris header (NO, Kode MK, NAMA MATA KULIAH, ...)
+        if any('kode mk' in str(v).lower() for v in row if v is not None):
             continue
 
-        # Check if this is a header row (NO, Kode MK, NAMA MATA KULIAH, etc.)
-        if any('kode mk' in str(val).lower() for val in row if pd.notna(val)):
-            # This is a header row, skip it
-            i += 1
+        if at(row, 1) is None or at(row, 2) is None or at(row, 3) is None:
+            continue
+        no, kode, mk = _sval(row[1]), _sval(row[2]), _sval(row[3])
+        # Validate this is a course row (has number, valid code, meaningful name)
+        if not (no.isdigit() and len(kode) > 5 and len(mk) > 3):
+            continue
+        # Skip MKDU courses (they should only be in MKDU prodi), KKP and seminar usul
+        if course_classifier().matches(mk, exclude):
             continue
 
-        # Check if this is a course data row
-        if (pd.notna(row.iloc[1]) and pd.notna(row.iloc[2]) and pd.notna(row.iloc[3])):
-            no = str(row.iloc[1]).strip()
-            kode = str(row.iloc[2]).strip()
-            mk = str(row.iloc[3]).strip()
-            sks = str(row.iloc[4]).strip() if pd.notna(row.iloc[4]) else ""
-            dosen1 = str(row.iloc[5]).strip() if pd.notna(row.iloc[5]) and str(row.iloc[5]).strip() != 'nan' else ""
-            dosen2 = str(row.iloc[6]).strip() if pd.notna(row.iloc[6]) and str(row.iloc[6]).strip() != 'nan' else ""
-
-            # Validate this is a course row (has number, valid code, meaningful name)
-            if (no.isdigit() and len(kode) > 5 and len(mk) > 3):
-                # Skip MKDU courses (they should only be in MKDU prodi)
-                if is_mkdu_course(mk):
-                    i += 1
-                    continue
-
-                # Skip KKP and seminar usul
-                mk_lower = mk.lower()
-                if 'kkp' in mk_lower or 'seminar usul' in mk_lower:
-                    i += 1
-                    continue
-
-                # Combine both dosen if available
-                dosen_combined = dosen1
-                if dosen2:
-                    dosen_combined = f"{dosen1}, {dosen2}" if dosen1 else dosen2
-
-                # Arsitektur: 2 kelas (A dan B) untuk semester 1,3,5,7 dengan dosen yang sama
-                if current_semester in [1, 3, 5, 7]:
-                    # Buat untuk kelas A
-                    out.append(dict(
-                        Prodi="Arsitektur",
-                        Semester=current_semester,
-                        Kelas="A",
-                        Kode_MK=kode,
-                        Mata_Kuliah=mk,
-                        SKS=sks,
-                        Dosen=dosen_combined,
-                        D1=dosen1,
-                        D2=dosen2,
-                        NR=False
-                    ))
-                    # Buat untuk kelas B dengan dosen yang sama
-                    out.append(dict(
-                        Prodi="Arsitektur",
-                        Semester=current_semester,
-                        Kelas="B",
-                        Kode_MK=kode,
-                        Mata_Kuliah=mk,
-                        SKS=sks,
-                        Dosen=dosen_combined,
-                        D1=dosen1,
-                        D2=dosen2,
-                        NR=False
-                    ))
-                else:
-                    # Semester lain tetap satu kelas
-                    out.append(dict(
-                        Prodi="Arsitektur",
-                        Semester=current_semester,
-                        Kelas="A",
-                        Kode_MK=kode,
-                        Mata_Kuliah=mk,
-                        SKS=sks,
-                        Dosen=dosen_combined,
-                        D1=dosen1,
-                        D2=dosen2,
-                        NR=False
-                    ))
-
-        i += 1
-
-    return pd.DataFrame(out)
-
-def load_mkdu():
-    df = pd.read_excel(FILE_MKDU, sheet_name=SHEET_MKDU)
-    out=[]
-    for _, r in df.iterrows():
-        kode = norm(r.get("Kode Mata kuliah", r.get("Kode Mata Kuliah","")))
-        mk   = norm(r.get("Nama Mata Kuliah",""))
-        if not (kode and mk): continue
-        kelas= norm(r.get("Kelas","")); sks = r.get("SKS",""); dos = norm(r.get("Dosen",""))
-        sem  = extract_semester(kelas)
-        out.append(dict(Prodi="MKDU", Semester=sem, Kelas=kelas, Kode_MK=kode,
-                        Mata_Kuliah=mk, SKS=sks if pd.notna(sks) else "", Dosen=dos, D1=dos, D2="", NR=False))
-    return pd.DataFrame(out)
+        sks, dosen1, dosen2 = _sval(at(row, 4)), _sval(at(row, 5)), _sval(at(row, 6))
+        # Combine both dosen if available
+        dosen_combined = dosen1
+        if dosen2:
+            dosen_combined = f"{dosen1}, {dosen2}" if dosen1 else dosen2
+
+        # Arsitektur: 2 kelas (A dan B) untuk semester 1,3,5,7; semester lain satu kelas
+        for kelas in (classes if current_semester in parallel_semesters else classes[:1]):
+            yield dict(Prodi=prodi, Semester=current_semester, Kelas=kelas, Kode_MK=kode,
+                       Mata_Kuliah=mk, SKS=sks, Dosen=dosen_combined, D1=dosen1, D2=dosen2, NR=False)
+
+@parser("arsitektur_sections", version=3)
+def parse_arsitektur(spec, path):
+    # Satu pass streaming (openpyxl read_only), tanpa DataFrame mentah
+    par = spec.get("parallel") or {}
+    rows = iter_rows(path, spec["sheets"][0]["name"])
+    return pd.DataFrame(list(arsitektur_records(
+        rows, spec["prodi"], tuple(spec["exclude"].get("categories", ())),
+        tuple(par.get("semesters", ())), tuple(par.get("classes", ("A",))))))
 
 # =========================
 # PARSE PWK (pakai jadwal asli)
@@ -382,73 +444,153 @@ def jam_to_sesi(day, jam):
         mapping = {"07:30–09:00":1,"09:00–10:30":2,"10:30–12:00":3,"13:00–14:30":4,"15:00–16:30":5}
     return mapping.get(jam, None)
 
-def parse_pwk_asli():
-    raw = pd.read_excel(FILE_PWK, sheet_name=SHEET_PWK, header=None)
-    entries=[]; current_day=None
+def pwk_records(rows, prodi="PWK"):
+    """
+    State machine jadwal asli PWK: baris berisi satu nama hari -> hari aktif;
+    sebelum hari pertama semua baris dilewati; baris dengan sel jam
+    (TIME_PAT) -> entri terjadwal: Jam, SMT, Kode MK, Mata Kuliah, SKS,
+    Dosen, Dosen2, Ruang di kolom-kolom setelah sel jam.
+    `rows`: iterable tuple nilai sel (lihat sheet_stream.iter_rows).
+    Yields: dict entri; slot (hari, jam, ruang) ganda dilewati dengan WARNING
+    """
+    current_day = None
     seen_slots = set()  # Track (day, time, room) to avoid PWK internal conflicts
-
-    for _, row in raw.iterrows():
-        vals = [norm(v) for v in row.values if norm(v)]
+    for row in rows:
+        row_vals = [norm(v) for v in row]
+        vals = [v for v in row_vals if v]
 
         # Check if this is a day header
-        if len(vals)==1 and vals[0].upper() in DAY_NAMES:
+        if len(vals) == 1 and vals[0].upper() in DAY_NAMES:
             current_day = DAY_MAP[vals[0].upper()]
             continue
-
-        # Skip if no current day set
         if not current_day:
             continue
 
-        # Look for structured data with columns: No, Jam, SMT, Kode MK, Mata Kuliah, SKS, Dosen, Dosen2, Ruang
-        row_vals = [norm(v) for v in row.values]
-
-        # Check if this looks like a data row (has time pattern)
-        jam_col = None
-        for i, val in enumerate(row_vals):
-            if val and TIME_PAT.match(val):
-                jam_col = i
-                break
-
-        if jam_col is not None and len(row_vals) > jam_col + 4:
-            jam = normalize_time(row_vals[jam_col])
-            smt = row_vals[jam_col + 1] if jam_col + 1 < len(row_vals) else ""
-            kode = row_vals[jam_col + 2] if jam_col + 2 < len(row_vals) else ""
-            mk = row_vals[jam_col + 3] if jam_col + 3 < len(row_vals) else ""
-            sks = row_vals[jam_col + 4] if jam_col + 4 < len(row_vals) else ""
-            dosen1 = row_vals[jam_col + 5] if jam_col + 5 < len(row_vals) else ""
-            dosen2 = row_vals[jam_col + 6] if jam_col + 6 < len(row_vals) else ""
-            ruang = row_vals[jam_col + 7] if jam_col + 7 < len(row_vals) else ""
-
-            # Sometimes room is in the last non-empty column
-            if not ruang:
-                for i in range(len(row_vals)-1, jam_col+6, -1):
-                    if row_vals[i] and ROOM_PAT.search(row_vals[i]):
-                        ruang = row_vals[i]
-                        break
-
-            if mk and ruang:
-                sesi = jam_to_sesi(current_day, jam)
-                if sesi:
-                    # Check for PWK internal conflicts
-                    slot_key = (current_day, jam, ruang)
-                    if slot_key in seen_slots:
-                        print(f"WARNING: PWK internal conflict detected at {current_day} {jam} {ruang}")
-                        print(f"  Skipping: {mk} (semester {smt})")
-                        continue
-
-                    seen_slots.add(slot_key)
-
-                    # Combine dosen names
-                    dosen_list = [d for d in [dosen1, dosen2] if d]
-                    dosen_combined = "; ".join(dosen_list)
-
-                    entries.append(dict(
-                        Hari=current_day, Sesi=sesi, Jam=jam, Ruang=ruang,
-                        Prodi="PWK", Semester=smt, Kelas="", Kode_MK=kode,
-                        Mata_Kuliah=mk, SKS=sks, Dosen=dosen_combined, Mode="Luring",
-                        D1=dosen1, D2=dosen2
-                    ))
-    return pd.DataFrame(entries)
+        jam_col = next((i for i, val in enumerate(row_vals) if val and TIME_PAT.match(val)), None)
+        if jam_col is None:
+            continue
+        field = lambda k: row_vals[jam_col + k] if jam_col + k < len(row_vals) else ""
+        jam = normalize_time(row_vals[jam_col])
+        smt, kode, mk, sks, dosen1, dosen2, ruang = (field(k) for k in range(1, 8))
+
+        # Sometimes room is in the last non-empty column
+        if not ruang:
+            ruang = next((v for v in reversed(row_vals[jam_col + 7:]) if v and ROOM_PAT.search(v)), "")
+        if not (mk and ruang):
+            continue
+        sesi = jam_to_sesi(current_day, jam)
+        if not sesi:
+            continue
+
+        slot_key = (current_day, jam, ruang)
+        if slot_key in seen_slots:
+            print(f"WARNING: PWK internal conflict detected at {current_day} {jam} {ruang}")
+            print(f"  Skipping: {mk} (semester {smt})")
+            continue
+        seen_slots.add(slot_key)
+
+        yield dict(
+            Hari=current_day, Sesi=sesi, Jam=jam, Ruang=ruang,
+            Prodi=prodi, Semester=smt, Kelas="", Kode_MK=kode,
+            Mata_Kuliah=mk, SKS=sks, Dosen="; ".join(d for d in [dosen1, dosen2] if d), Mode="Luring",
+            D1=dosen1, D2=dosen2
+        )
+
+@parser("pwk_schedule", version=3)
+def parse_pwk(spec, path):
+    # Satu pass streaming (openpyxl read_only), tanpa DataFrame mentah
+    return pd.DataFrame(list(pwk_records(iter_rows(path, spec["sheets"][0]["name"]), spec["prodi"])))
+
+# =========================
+# ORKESTRASI LOADER
+# =========================
+# Nama sumber = kunci registry config/sources.yaml (= INPUT_PATHS)
+_loaders = {}
+
+def source_loader(name):
+    """
+    Loader ter-cache untuk sumber `name` (dibuat saat pertama diminta; tidak
+    membuka file apa pun sampai dipanggil). Kunci cache ikut entri registry
+    dan daftar kata kunci, jadi mengubah YAML membuat entri lama basi.
+    Katalog kanonik di CATALOG_DIR (kalau ada) menggantikan file sumbernya.
+    """
+    loader = _loaders.get(name)
+    if loader is None:
+        spec = SOURCES[name]
+        fn = get_parser(spec)
+
+        def load():
+            cat = catalog_file(name)
+            return read_catalog(cat) if cat is not None else fn(spec, source_file(name))
+        load.__name__ = load.__qualname__ = f"load_{name}"
+        loader = _loaders[name] = cached(lambda: source_paths(name), version=fn.version,
+                                         extra=lambda: (spec, keyword_config()))(load)
+    return loader
+
+LOADERS = {name: source_loader(name) for name in schedule_sources(SOURCES)}
+
+# Nama lama (dipakai skrip rescue/fixes)
+load_informatika, load_pengairan, load_elektro = LOADERS["informatika"], LOADERS["pengairan"], LOADERS["elektro"]
+parse_pwk_asli, load_arsitektur_source, load_mkdu = LOADERS["pwk"], LOADERS["arsitektur"], LOADERS["mkdu"]
+
+class SourceLoadError(RuntimeError):
+    """Satu atau lebih sumber gagal dimuat; `errors` = {nama: exception}."""
+    def __init__(self, errors):
+        super().__init__("Gagal memuat: " + "; ".join(f"{k} ({type(e).__name__}: {e})" for k, e in errors.items()))
+        self.errors = errors
+
+def _load_source(name):
+    return LOADERS[name]()
+
+def load_sources(names=None, workers=None):
+    """
+    Muat sumber `names` (default semua LOADERS) - workbook sumber lain tidak dibuka. Sumber yang sudah ada di cache
+    input dibaca langsung; sisanya di-parse paralel di `workers` proses (parsing
+    openpyxl terikat CPU/GIL), jadi waktu muat ~ file terlama, bukan jumlahnya.
+    Returns:
+        (frames: {nama: DataFrame}, errors: {nama: exception}) - error dikumpulkan per sumber
+    """
+    names = list(LOADERS) if names is None else list(names)
+    frames, errors = {}, {}
+    todo = []
+    for name in names:
+        fn = LOADERS[name]
+        if getattr(fn, "is_cached", lambda: False)():
+            try:
+                frames[name] = fn()
+                continue
+            except Exception:
+                pass
+        todo.append(name)
+
+    n = min(workers or os.cpu_count() or 1, len(todo))
+    if n > 1:
+        with ProcessPoolExecutor(n) as ex:
+            futures = {name: ex.submit(_load_source, name) for name in todo}
+            for name, fut in futures.items():
+                try:
+                    frames[name] = fut.result()
+                except Exception as e:
+                    errors[name] = e
+    else:
+        for name in todo:
+            try:
+                frames[name] = _load_source(name)
+            except Exception as e:
+                errors[name] = e
+    return {name: frames[name] for name in names if name in frames}, errors
+
+def convert_sources(out_dir=BASE_DIR / "catalog", fmt="csv", names=None, workers=None):
+    """
+    Ekspor hasil loader (katalog MK ternormalisasi) sekali ke
+    `out_dir`/<nama>.<fmt> (csv / parquet); run berikutnya cukup
+    `--catalog out_dir` (atau CHRONOSYNC_CATALOG) tanpa parsing Excel.
+    Returns: {nama: path}
+    """
+    frames, errors = load_sources(names, workers=workers)
+    if errors:
+        raise SourceLoadError(errors)
+    return {name: write_catalog(df, Path(out_dir) / f"{name}.{fmt}") for name, df in frames.items()}
 
 # =========================
 # SCHEDULER & CONFLICT RESOLUTION
@@ -472,258 +614,618 @@ def allowed_days(row):
         return ["Sabtu","Minggu"]
     return ["Senin","Selasa","Rabu","Kamis","Jumat"]
 
-def build_maps(df):
-    instr_busy = defaultdict(set); room_busy = defaultdict(set); student_busy = defaultdict(set)
-    for _, r in df.iterrows():
-        day = norm(r["Hari"]); sesi = r["Sesi"]; mode = norm(r["Mode"])
-        if not day or not sesi: continue
-        key = (day, int(sesi))
+# Mesin penempatan awal: fn(table, occ) -> baris yang tidak mendapat slot
+PLACEMENT_MODES = {
+    "first-fit": place_courses,
+    "dsatur": place_courses_dsatur,
+    "coloring": color_courses,
+    "two-phase": place_two_phase,
+}
+# Mode yang menempatkan di sekitar PWK (PWK dicatat dulu sebagai baris tetap);
+# first-fit/dsatur mempertahankan alur lama: tempatkan dulu, PWK menyusul
+PWK_FIRST = {"coloring", "two-phase"}
 
-        # Track instructor conflicts
-        for n in instr_names(r):
-            if n: instr_busy[key].add(n)
+def new_symbols():
+    """Tabel simbol dengan ALL_ROOMS di-intern duluan (id ruang = urutan prioritas)."""
+    return SymbolTable(ALL_ROOMS)
 
-        # Track room conflicts
-        if not is_zoom(mode):
-            room = norm(r.get("Ruang",""))
-            if room: room_busy[key].add(room)
+def new_occupancy(symbols=None):
+    return OccupancyIndex(ALL_SLOTS, ALL_ROOMS, symbols if symbols is not None else new_symbols())
 
+def build_maps(df):
+    """Bangun OccupancyIndex (dosen, ruang, mahasiswa per slot) dari jadwal."""
+    occ = new_occupancy()
+    sym = occ.symbols
+    entries = []
+    cols = [_col(df, c) for c in ("Hari","Sesi","Mode","Ruang","D1","Dosen","Prodi","Semester","Kelas")]
+    for idx, day, sesi, mode, room, d1, dosen, prodi, sem, kelas in zip(df.index, *cols):
+        day = norm(day)
+        if not day or pd.isna(sesi) or not sesi: continue
+        sid = occ.slot_id.get((day, int(sesi)))
+        if sid is None: continue
+        # Only check D1 for conflicts - D2 is just backup/replacement for D1
+        iid = sym.instr_of(d1, dosen)
         # Track student conflicts - CRITICAL: Students can't be in 2 places at once
-        student_id = (norm(r.get("Prodi","")), str(r.get("Semester","")), norm(r.get("Kelas","")))
-        if all(student_id):  # Only add if all components are valid
-            student_busy[key].add(student_id)
-
-    return instr_busy, room_busy, student_busy
+        gid = sym.group_of(prodi, sem, kelas)  # None kalau ada komponen kosong
+        rid = None if is_zoom(mode) else sym.room_of(room)
+        entries.append((idx, (sid, () if iid is None else (iid,), gid, rid)))
+    occ.sync()
+    for idx, entry in entries:
+        occ.remove(idx)
+        occ.restore(idx, entry)
+    return occ
+
+def occupancy_args(row, slot):
+    """Argumen OccupancyIndex.add untuk `row` yang ditempatkan di `slot`."""
+    student_id = (norm(row["Prodi"]), str(row["Semester"]), norm(row["Kelas"]))
+    if not all(student_id): student_id = None
+    return (slot["Hari"], int(slot["Sesi"])), instr_names(row), student_id, slot["Ruang"]
 
-def place_one(row, instr_busy, room_busy, student_busy=None):
+def place_one(row, occ):
     zoom = (str(row["Semester"]) == "1")
 
     # Create student identifier (prodi, semester, kelas)
     student_id = (norm(row["Prodi"]), str(row["Semester"]), norm(row["Kelas"]))
 
+    # Check instructor & student conflicts - CRITICAL: Students can't be in 2 places at once
+    busy = occ.busy_mask(instr_names(row), student_id)
+
     for day in allowed_days(row):
         for sess, jam in sessions_for_day(day):
             key = (day, sess)
-            names = instr_names(row)
-
-            # Check instructor conflicts
-            if any(n in instr_busy[key] for n in names if n):
-                continue
-
-            # Check student conflicts - CRITICAL: Students can't be in 2 places at once
-            if student_busy is not None and student_id in student_busy[key]:
+            if (busy >> occ.slot_id[key]) & 1:
                 continue
 
             if zoom:
                 return dict(Hari=day, Sesi=sess, Jam=jam, Ruang="")
-            else:
-                # Use all available rooms (no lab rooms needed)
-                for room in ALL_ROOMS:
-                    if room not in room_busy[key]:
-                        return dict(Hari=day, Sesi=sess, Jam=jam, Ruang=room)
+            # Use all available rooms (no lab rooms needed)
+            room = occ.first_free_room(key)
+            if room:
+                return dict(Hari=day, Sesi=sess, Jam=jam, Ruang=room)
     return dict(Hari="", Sesi="", Jam="", Ruang="")
 
-def detect_conflicts(df):
+COURSE_COLS = ["Prodi","Semester","Kelas","Kode_MK","Mata_Kuliah","SKS","Dosen","D1","D2","NR"]
+
+def course_frame(df, prodi_name=None):
+    """Samakan struktur kolom daftar MK (kolom hilang -> "", NR -> bool)."""
+    out = df.reindex(columns=COURSE_COLS, fill_value="")
+    if prodi_name: out["Prodi"] = prodi_name
+    out["NR"] = out["NR"].astype(bool)
+    return out
+
+def placement_days(prodi, nr):
+    """Hari kandidat penempatan awal (reguler boleh sampai akhir pekan)."""
+    if prodi.upper() == "MKDU": return ["Sabtu"]  # MKDU dipaksa Sabtu
+    if nr: return DAYS_WE
+    return ALL_DAYS
+
+def days_mask(days):
+    """Bitmask slot ALL_SLOTS yang jatuh pada `days`."""
+    return sum(1 << sid for sid, (day, _) in enumerate(ALL_SLOTS) if day in days)
+
+def compile_courses(df, occ, table=None):
+    """
+    Kompilasi DataFrame mata kuliah/jadwal ke CourseTable (sekali, di batas load).
+    Baris yang sudah punya Hari/Sesi langsung tercatat di `occ`; PWK di-pin.
+    Kalau `table` diberikan, baris ditambahkan di belakangnya (posisi lanjut).
+    """
+    table = CourseTable() if table is None else table
+    start = len(table)
+    masks = {}
+    cols = [_first_col(df, *names) for names in (
+        ("Prodi",), ("Semester",), ("Kelas",), ("D1", "Dosen 1"), ("Dosen",), ("NR",),
+        ("Mode", "Mode (Zoom/Luring)"), ("Hari",), ("Sesi",), ("Ruang",))]
+    sym = occ.symbols
+    for prodi, sem, kelas, d1, dosen, nr, mode, hari, sesi, ruang in zip(*cols):
+        pid = sym.prodi_of(prodi)
+        prodi = sym.prodi[pid]
+        # Only check D1 for conflicts - D2 is just backup/replacement for D1
+        iid = sym.instr_of(d1, dosen)
+        # Track student conflicts - CRITICAL: Students can't be in 2 places at once
+        gid = sym.group_of(prodi, sem, kelas)
+
+        allowed = tuple(allowed_days({"Prodi": prodi, "Kelas": kelas}))
+        domain = tuple(placement_days(prodi, bool(nr) and not pd.isna(nr)))
+        for days in (allowed, domain):
+            if days not in masks: masks[days] = days_mask(days)
+        zoom = str(sem) == "1" or is_zoom(mode)
+
+        sid, rid = -1, None
+        day = norm(hari)
+        if day and not pd.isna(sesi) and sesi:
+            sid = occ.slot_id.get((day, int(sesi)), -1)
+            if sid >= 0 and not zoom:
+                rid = sym.room_of(ruang)
+        semester = extract_semester(sem)
+        table.append(pid, semester or 0, gid, () if iid is None else (iid,), masks[allowed], masks[domain],
+                     zoom, prodi.lower() == "pwk", sid, rid)
+    occ.sync()
+    table.occupy_all(occ, range(start, len(table)))
+    return table
+
+def schedule_values(table, occ, i):
+    """(Hari, Sesi, Jam, Ruang) baris i tabel; kosong kalau belum ditempatkan."""
+    sid = table.slot[i]
+    if sid < 0:
+        return "", "", "", ""
+    day, sess = occ.slots[sid]
+    room = table.room[i]
+    return day, sess, SLOT_JAM[sid], "" if room is None else occ.rooms[room]
+
+def resolve_table(table, occ, describe, max_iters=120):
+    """`courses.resolve_courses` dengan log progres seperti sebelumnya."""
+    def on_iteration(iteration, n_dirty):
+        # Print debug info for first few iterations
+        if iteration < 3:
+            print(f"Iteration {iteration}: Dirty slots: {n_dirty}")
+
+    def on_move(iteration, i, kind):
+        if iteration < 3:
+            print(f"  Moved row {i} ({describe(i)}) to resolve {kind} conflict")
+
+    stats = resolve_courses(table, occ, max_iters, on_move=on_move, on_iteration=on_iteration)
+    print(f"Converged after {stats['iterations']} iterations ({stats['moves']} moves)")
+    return stats
+
+def _conflict_groups(keys, labels, sort=False):
+    """Kelompokkan baris per kunci (array sejajar) -> [(kunci, [idx...])] untuk kunci dengan >1 baris."""
+    if len(labels) == 0:
+        return []
+    codes, uniques = pd.MultiIndex.from_arrays(keys).factorize(sort=sort)
+    hit = np.bincount(codes)[codes] > 1
+    if not hit.any():
+        return []
+    codes = codes[hit]; labels = np.asarray(labels, dtype=object)[hit]
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]; labels = labels[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(codes)]
+    key = lambda c: tuple(v.item() if isinstance(v, np.generic) else v for v in uniques[c])
+    return [(key(codes[s]), labels[s:e].tolist()) for s, e in zip(starts, ends)]
+
+def detect_conflicts(df, include_d2=False):
+    """
+    Deteksi bentrok ruang, dosen dan mahasiswa dalam satu pass vektor.
+    Returns:
+        room_conf:    [((Hari, Sesi, Ruang), [idx...])]
+        instr_conf:   [((dosen, (Hari, Sesi)), [idx...])]
+        student_conf: [(((Prodi, Semester, Kelas), (Hari, Sesi)), [idx...])]
+    Nama kolom internal (Mode, D1) maupun Excel (Mode (Zoom/Luring), Dosen 1) diterima.
+    `include_d2=True` ikut menghitung Dosen 2 sebagai pengajar di slot tersebut.
+    """
+    hari = df["Hari"] if "Hari" in df.columns else pd.Series("", index=df.index)
+    mode = _first_col(df, "Mode", "Mode (Zoom/Luring)")
+    ruang = _first_col(df, "Ruang")
+
     # ruang
-    luring = df[~df["Mode"].str.lower().str.contains("zoom", na=False)]
-    g = luring[luring["Ruang"]!=""].groupby(["Hari","Sesi","Ruang"]).size()
-    room_conf = [(k, df[(df["Hari"]==k[0]) & (df["Sesi"]==k[1]) & (df["Ruang"]==k[2])].index.tolist())
-                 for k, v in g.items() if v > 1]
-    # dosen
-    slot_map = defaultdict(lambda: defaultdict(list))
-    for i, r in df.iterrows():
-        day = norm(r["Hari"]); sesi = r["Sesi"]
-        if not day or not sesi: continue
-        for n in instr_names(r):
-            if n: slot_map[(day, int(sesi))][n].append(i)
-    instr_conf = [((name, key), idxs) for key, m in slot_map.items() for name, idxs in m.items() if len(idxs) > 1]
-    return room_conf, instr_conf
-
-def try_move(idx, df):
-    """Pindahkan baris ke slot lain (tidak memindahkan PWK)."""
+    luring = ~mode.astype(str).str.lower().str.contains("zoom", na=False) & (ruang != "") & ruang.notna()
+    room_conf = _conflict_groups([hari[luring].values, df["Sesi"][luring].values, ruang[luring].values],
+                                 df.index[luring], sort=True)
+
+    # slot valid (hari & sesi terisi)
+    day = _norm_col(hari)
+    sesi = pd.to_numeric(df["Sesi"], errors="coerce")
+    valid = (day != "") & sesi.notna() & (sesi != 0)
+    day = day[valid].values
+    sesi = sesi[valid].astype(int).values
+    labels = df.index[valid]
+
+    def by_slot(groups, day_k, sesi_k, make_key):
+        # urut per slot (kemunculan pertama), lalu per kunci di dalam slot
+        if not groups:
+            return []
+        slot_rank = {k: i for i, k in enumerate(pd.MultiIndex.from_arrays([day_k, sesi_k]).unique())}
+        groups.sort(key=lambda g: slot_rank[(g[0][0], g[0][1])])
+        return [(make_key(k), idxs) for k, idxs in groups]
+
+    # dosen - hanya D1 (fallback Dosen), D2 opsional
+    d1 = _norm_col(_first_col(df, "D1", "Dosen 1"))
+    name = d1.where(d1 != "", _norm_col(_first_col(df, "Dosen")))[valid].values
+    keys_day, keys_sesi, keys_name, keys_label = [day], [sesi], [name], [labels.values]
+    if include_d2:
+        d2 = _norm_col(_first_col(df, "D2", "Dosen 2"))[valid].values
+        keys_day.append(day); keys_sesi.append(sesi); keys_name.append(d2); keys_label.append(labels.values)
+    day_i, sesi_i, name_i, lab_i = (np.concatenate(k) if len(labels) else np.array([], dtype=object)
+                                    for k in (keys_day, keys_sesi, keys_name, keys_label))
+    has_name = name_i != ""
+    day_i, sesi_i, name_i, lab_i = day_i[has_name], sesi_i[has_name], name_i[has_name], lab_i[has_name]
+    instr_conf = by_slot(_conflict_groups([day_i, sesi_i, name_i], lab_i), day_i, sesi_i,
+                         lambda k: (k[2], (k[0], int(k[1]))))
+
+    # mahasiswa - (prodi, semester, kelas) lengkap
+    prodi = _norm_col(_first_col(df, "Prodi"))[valid].values
+    sem = _first_col(df, "Semester").astype(str)[valid].values
+    kelas = _norm_col(_first_col(df, "Kelas"))[valid].values
+    ok = (prodi != "") & (sem != "") & (kelas != "")
+    student_conf = by_slot(_conflict_groups([day[ok], sesi[ok], prodi[ok], sem[ok], kelas[ok]], labels[ok]),
+                           day[ok], sesi[ok], lambda k: ((k[2], k[3], k[4]), (k[0], int(k[1]))))
+
+    return room_conf, instr_conf, student_conf
+
+def count_conflicts(df):
+    """Jumlah grup bentrok (ruang, dosen, mahasiswa) dan baris tanpa hari/sesi."""
+    room_conf, instr_conf, student_conf = detect_conflicts(df)
+    empties = int(((df["Hari"]=="") | (df["Sesi"]=="")).sum())
+    return len(room_conf), len(instr_conf), len(student_conf), empties
+
+def try_move(idx, df, occ=None):
+    """Pindahkan baris ke slot lain (tidak memindahkan PWK).
+
+    `occ` adalah OccupancyIndex yang sinkron dengan `df`; kalau diberikan,
+    indeks diperbarui secara inkremental (lepas baris, cari slot, pasang lagi).
+    """
     row = df.loc[idx].to_dict()
     if norm(row["Prodi"]).lower() == "pwk":
         return False  # jangan pindahkan PWK
+    if occ is None:
+        occ = build_maps(df)
     # occupancy tanpa baris ini
-    tmp = df.drop(index=[idx])
-    instr_busy, room_busy, student_busy = build_maps(tmp)
-    slot = place_one(row, instr_busy, room_busy, student_busy)
+    old = occ.remove(idx)
+    slot = place_one(row, occ)
     if slot["Hari"]:
+        slot["Ruang"] = slot["Ruang"] if not is_zoom(row["Mode"]) else ""
         df.at[idx, "Hari"] = slot["Hari"]
         df.at[idx, "Sesi"] = slot["Sesi"]
         df.at[idx, "Jam"]  = slot["Jam"]
-        df.at[idx, "Ruang"]= slot["Ruang"] if not is_zoom(row["Mode"]) else ""
+        df.at[idx, "Ruang"]= slot["Ruang"]
+        occ.add(idx, *occupancy_args(row, slot))
         return True
+    occ.restore(idx, old)
     return False
 
-def resolve_all(df, max_iters=120):
-    for iteration in range(max_iters):
-        changed = False
-        room_conf, instr_conf = detect_conflicts(df)
+def resolve_all(df, max_iters=120, return_stats=False):
+    """
+    Selesaikan bentrok ruang, dosen & mahasiswa (tidak memindahkan PWK).
+    `df` dikompilasi sekali ke CourseTable; resolusi (worklist slot kotor, lihat
+    `courses.resolve_courses`) berjalan di tabel, lalu hanya baris yang pindah
+    ditulis balik ke Hari/Sesi/Jam/Ruang.
+    Returns:
+        df, atau (df, stats) kalau return_stats=True dengan
+        stats = {"moves", "iterations", "remaining": {"room", "instructor", "student"}}
+    """
+    occ = new_occupancy()
+    table = compile_courses(df, occ)
+    before = list(zip(table.slot, table.room))
+    prodi, mk = _first_col(df, "Prodi"), _first_col(df, "Mata_Kuliah", "Mata Kuliah")
+    stats = resolve_table(table, occ, describe=lambda i: f"{prodi.iat[i]} - {mk.iat[i]}", max_iters=max_iters)
+
+    write_back(df, table, occ, before)
+    return (df, stats) if return_stats else df
+
+def write_back(df, table, occ, before):
+    """Tulis Hari/Sesi/Jam/Ruang baris tabel yang berubah sejak `before` ke `df`; return baris tsb."""
+    moved = [i for i, placed in enumerate(zip(table.slot, table.room)) if placed != before[i]]
+    if moved:
+        values = [schedule_values(table, occ, i) for i in moved]
+        cols = [df.columns.get_loc(c) for c in ("Hari", "Sesi", "Jam", "Ruang")]
+        for i, vals in zip(moved, values):
+            for c, v in zip(cols, vals):
+                df.iat[i, c] = v
+    return moved
+
+def mark_placed(df, table, moved):
+    """
+    Sinkronkan Mode baris `moved`: "... (UNPLACED)" yang kini punya slot jadi
+    "Luring" / "Zoom"; yang kehilangan slot jadi "Luring (UNPLACED)" / "Zoom (UNPLACED)".
+    """
+    mode_col = next((c for c in ("Mode", "Mode (Zoom/Luring)") if c in df.columns), None)
+    if mode_col is not None:
+        for i in moved:
+            mode = "Zoom" if table.zoom[i] else "Luring"
+            unplaced = "unplaced" in norm(df[mode_col].iat[i]).lower()
+            if table.slot[i] >= 0 and unplaced:
+                df.iat[i, df.columns.get_loc(mode_col)] = mode
+            elif table.slot[i] < 0 and not unplaced:
+                df.iat[i, df.columns.get_loc(mode_col)] = f"{mode} (UNPLACED)"
+
+def repair_unplaced(df, time_limit=2.0, return_stats=False):
+    """
+    Tempatkan baris tanpa Hari/Sesi (UNPLACED) dengan tabu search
+    eject-and-reinsert (repair.py); baris lain boleh digeser, PWK tidak.
+    Baris yang berhasil ditempatkan dan Mode-nya "UNPLACED" jadi "Luring";
+    baris yang tetap/jadi tanpa slot ditandai "(UNPLACED)" (lihat `mark_placed`).
+    Returns:
+        df, atau (df, stats) kalau return_stats=True (lihat `repair.tabu_repair`)
+    """
+    occ = new_occupancy()
+    table = compile_courses(df, occ)
+    before = list(zip(table.slot, table.room))
+    stats = tabu_repair(table, occ, time_limit=time_limit)
+    print(f"Repair UNPLACED: {stats['before']} -> {stats['after']} MK tanpa slot ({stats['iterations']} langkah)")
+
+    mark_placed(df, table, write_back(df, table, occ, before))
+    return (df, stats) if return_stats else df
+
+def check_feasibility(table, occ, fixed=None):
+    """
+    Analisis kelayakan (feasibility.py) untuk `table` sebelum penempatan.
+    `fixed`: DataFrame baris tetap (mis. PWK) yang belum masuk tabel; dikompilasi
+    ke salinan tabel supaya posisi baris tabel asli tidak berubah.
+    Returns:
+        list bottleneck (lihat `feasibility.analyze`)
+    """
+    if fixed is not None:
+        table, occ = pickle.loads(pickle.dumps((table, occ)))
+        compile_courses(fixed, occ, table)
+    return analyze(table, occ)
+
+def match_unplaced(df, use_allowed=False, return_stats=False):
+    """
+    Tempatkan semua baris tanpa Hari/Sesi sekaligus lewat maximum matching ke
+    pasangan (slot, ruang) yang kosong (matching.py); baris lain tidak digeser.
+    `use_allowed=True` membatasi ke hari resolusi (reguler Senin-Jumat).
+    Returns:
+        df, atau (df, stats) kalau return_stats=True (lihat `matching.match_courses`)
+    """
+    occ = new_occupancy()
+    table = compile_courses(df, occ)
+    before = list(zip(table.slot, table.room))
+    stats = match_courses(table, occ, masks=table.allowed if use_allowed else None)
+    print(f"Matching UNPLACED: {len(stats['placed'])} ditempatkan, "
+          f"{len(stats['unplaceable'])} tidak mungkin, {len(stats['remaining'])} tersisa "
+          f"(minimal {sum(d for _, _, d in stats['hall'])} di antaranya tidak muat, Hall)")
+
+    mark_placed(df, table, write_back(df, table, occ, before))
+    return (df, stats) if return_stats else df
 
-        # Print debug info for first few iterations
-        if iteration < 3:
-            print(f"Iteration {iteration}: Room conflicts: {len(room_conf)}, Instructor conflicts: {len(instr_conf)}")
-
-        # Selesaikan konflik ruang (utamakan jaga PWK)
-        for (key, idxs) in room_conf:
-            # Prioritas: PWK > yang sudah terjadwal baik > lainnya
-            pwk_idx = next((i for i in idxs if df.at[i,"Prodi"].strip().lower()=="pwk"), None)
-            if pwk_idx is not None:
-                keep = pwk_idx
-            else:
-                keep = idxs[0]  # keep the first one if no PWK
-
-            for i in idxs:
-                if i == keep:
-                    continue
-                if try_move(i, df):
-                    changed = True
-                    if iteration < 3:
-                        print(f"  Moved row {i} ({df.at[i,'Prodi']} - {df.at[i,'Mata_Kuliah']}) to resolve room conflict")
-
-        # Recompute conflicts setelah resolusi ruang
-        room_conf, instr_conf = detect_conflicts(df)
-
-        # Selesaikan konflik dosen
-        for ((name, key), idxs) in instr_conf:
-            pwk_idx = next((i for i in idxs if df.at[i,"Prodi"].strip().lower()=="pwk"), None)
-            if pwk_idx is not None:
-                keep = pwk_idx
-            else:
-                keep = idxs[0]
-
-            for i in idxs:
-                if i == keep:
-                    continue
-                if try_move(i, df):
-                    changed = True
-                    if iteration < 3:
-                        print(f"  Moved row {i} ({df.at[i,'Prodi']} - {df.at[i,'Mata_Kuliah']}) to resolve instructor conflict")
-
-        if not changed:
-            print(f"Converged after {iteration + 1} iterations")
-            break
-
-    return df
+# =========================
+# EKSPOR EXCEL (streaming)
+# =========================
+PRODI_SHEET_COLS = ["No.", "HARI", "Jam", "SMT", "Kelas", "Kode MK", "Mata Kuliah", "SKS", "Nama Dosen", "Ruang"]
+PRODI_SHEET_WIDTH = len(PRODI_SHEET_COLS) + 1  # + kolom Dosen 2
+
+def _pad(row, width=PRODI_SHEET_WIDTH):
+    return row + [""] * (width - len(row))
+
+def prodi_sheet_rows(df_prodi, prodi_name):
+    """
+    Baris sheet "Jadwal <PRODI>": blok judul (jurusan / program studi dari
+    registry), header kolom, lalu MK urut hari-sesi-ruang. Generator - dibaca
+    per kolom dari frame, tidak ada tabel perantara.
+    """
+    # Create header section
+    yield _pad(["JADWAL KULIAH "])
+    yield _pad(["SEMESTER GANJIL TAHUN AKADEMIK 2025 - 2026"])
+    yield _pad([""])
+    yield _pad(["FAKULTAS ", ":", "TEKNIK"])
+    # Judul jurusan / program studi dari registry (default: nama prodi)
+    spec = next((sp for sp in SOURCES.values() if sp["prodi"].upper() == prodi_name.upper()), {})
+    yield _pad(["JURUSAN", ":", spec.get("jurusan", prodi_name.upper())])
+    yield _pad(["PROGRAM STUDI", ":", spec.get("program_studi", prodi_name.upper())])
+    yield _pad(["KELAS", ":", "REGULER"])
+    yield _pad([""])
+
+    # Column headers
+    yield _pad(list(PRODI_SHEET_COLS))
+    yield _pad(["", "", "", "", "", "", "", "", "Dosen 1", "Dosen 2"])
+    yield _pad([str(k) for k in range(1, len(PRODI_SHEET_COLS) + 1)])
+
+    # Sort schedule data by day and session
+    order = {d:i for i,d in enumerate(["Senin","Selasa","Rabu","Kamis","Jumat","Sabtu","Minggu",""])}
+    df_sorted = df_prodi.assign(__o=df_prodi["Hari"].map(order).fillna(99),
+                                Sesi_num=pd.to_numeric(df_prodi["Sesi"], errors="coerce").fillna(99).astype(int))
+    df_sorted = df_sorted.sort_values(by=["__o","Sesi_num","Ruang"])
+
+    # Data rows
+    cols = ["Hari", "Jam", "Semester", "Kelas", "Kode_MK", "Mata_Kuliah", "SKS", "D1", "D2", "Ruang"]
+    for i, (hari, jam, sem, kelas, kode, mk, sks, d1, d2, ruang) in enumerate(
+            zip(*(df_sorted[c].tolist() for c in cols)), 1):
+        yield [
+            str(i),                                          # No
+            hari,                                            # HARI
+            jam,                                             # Jam
+            format_semester_display(sem),                    # SMT (Semester in Roman)
+            format_class_name(kelas, sem),                   # Kelas (formatted like 1A, 2B)
+            kode,                                            # Kode MK
+            mk,                                              # Mata Kuliah
+            str(sks) if pd.notna(sks) else "",               # SKS
+            d1 if pd.notna(d1) and d1 != "" else "",         # Nama Dosen (Dosen 1)
+            ruang if pd.notna(ruang) and ruang != "" else "Zoom",  # Ruang
+            d2 if pd.notna(d2) and d2 != "" else "",         # Dosen 2 (additional column)
+        ]
+
+PRODI_ORDER = ["Informatika", "PWK", "Elektro", "Pengairan", "Arsitektur", "MKDU"]
+PRODI_FRAME_COLS = ["Hari", "Sesi", "Jam", "Semester", "Kelas", "Kode_MK", "Mata_Kuliah", "SKS", "D1", "D2", "Ruang"]
+MASTER_SHEET_COLS = {
+    "Kode_MK":"Kode MK",
+    "Mata_Kuliah":"Mata Kuliah",
+    "D1":"Dosen 1",
+    "D2":"Dosen 2",
+    "Mode":"Mode (Zoom/Luring)"
+}
+
+def sheet_prodis(master):
+    """Prodi yang punya sheet: urutan tetap, prodi baru dari registry menyusul, yang kosong dilewati."""
+    prodis = list(PRODI_ORDER)
+    for name in schedule_sources(SOURCES):
+        if SOURCES[name]["prodi"] not in prodis:
+            prodis.append(SOURCES[name]["prodi"])
+    present = set(master["Prodi"].str.upper())
+    return [p for p in prodis if p.upper() in present]
+
+def render_prodi_sheet(df_prodi, prodi_name):
+    """Render murni satu sheet prodi -> (nama sheet, list baris nilai); aman dijalankan di proses lain."""
+    return f"Jadwal {prodi_name.upper()}", list(prodi_sheet_rows(df_prodi, prodi_name))
+
+def _render_job(job):
+    return render_prodi_sheet(*job)
+
+def render_sheets(master, prodis=None, workers=None):
+    """
+    Render sheet per prodi (default `sheet_prodis(master)`), paralel di
+    `workers` proses - tiap sheet independen (sort + format baris), jadi varian
+    workbook per jurusan/fakultas bisa dirender sekaligus. Worker hanya menerima
+    kolom yang dipakai sheet. Returns: [(nama sheet, baris)] urut `prodis`.
+    """
+    prodis = sheet_prodis(master) if prodis is None else prodis
+    key = master["Prodi"].str.upper()
+    cols = [c for c in PRODI_FRAME_COLS if c in master.columns]
+    jobs = [(master.loc[key == p.upper(), cols], p) for p in prodis]
+    n = min(workers or os.cpu_count() or 1, len(jobs))
+    if n > 1:
+        with ProcessPoolExecutor(n) as ex:
+            return list(ex.map(_render_job, jobs))
+    return [_render_job(job) for job in jobs]
+
+def write_schedule_workbook(output_path, master, conflicts, prodis=None, workers=None):
+    """
+    Tulis workbook jadwal: sheet per prodi (dirender `render_sheets`), sheet
+    induk, ringkasan konflik. `conflicts`: (room, dosen, mahasiswa, kosong) dari
+    `count_conflicts`. Perakitan = satu pass streaming ke write_only workbook.
+    Returns: nama sheet prodi yang ditulis
+    """
+    rendered = render_sheets(master, prodis, workers)
+    sheets = list(rendered)
+    # Keep the original combined sheet as well
+    sheets.append(("Jadwal Induk (Gabungan)", frame_rows(master.rename(columns=MASTER_SHEET_COLS))))
+    # Conflict summary
+    sheets.append(("Ringkasan Konflik", frame_rows(pd.DataFrame({
+        "Metric":["Room Conflicts","Instructor Conflicts","Student Conflicts","Rows w/ Empty Day/Session"],
+        "Value":list(conflicts)
+    }))))
+    write_workbook(output_path, sheets)
+    return [name for name, _ in rendered]
+
+def read_master_sheet(path):
+    """Sheet induk workbook jadwal (output main / fine-tune) dengan nama kolom internal."""
+    df = pd.read_excel(path, sheet_name="Jadwal Induk (Gabungan)")
+    return df.rename(columns={v: k for k, v in MASTER_SHEET_COLS.items()})
+
+def export_schedule(master, snapshot=None, ics_dir=None, semester_start=None, weeks=None):
+    """
+    Tahap ekspor non-Excel jadwal induk `master` (kolom internal): snapshot
+    JSON/Parquet ke `snapshot`, feed .ics per dosen/ruang/kelompok ke `ics_dir`.
+    Returns: {jenis feed: jumlah file} (kosong kalau ics_dir None)
+    """
+    if snapshot:
+        write_snapshot(master, snapshot)
+    if not ics_dir:
+        return {}
+    kw = {k: v for k, v in (("start", semester_start), ("weeks", weeks)) if v}
+    return write_ics_feeds(master, ics_dir, **kw)
 
 # =========================
 # PIPELINE UTAMA
 # =========================
-def main(output_path=BASE_DIR / "jadwal_gabungan_SATU_TABEL_FINAL_PWK_ARS.xlsx"):
-    # 1) Muat semua daftar MK
-    inf = load_informatika()
-    peng = load_pengairan()
-    el  = load_elektro()
-    ars_src = load_arsitektur_source()
-    mkdu = load_mkdu()
+def main(output_path=BASE_DIR / "jadwal_gabungan_SATU_TABEL_FINAL_PWK_ARS.xlsx", placement="first-fit",
+         restarts=1, workers=None, seed=0, anneal_iters=0, anneal_time=None, repair_time=2.0,
+         decompose=False, strict=False, only=None, snapshot=None, ics_dir=None, semester_start=None, weeks=None):
+    """
+    only: nama sumber registry (config/sources.yaml) yang dijadwalkan; default
+        semua. Workbook sumber lain tidak dibuka.
+    workers: jumlah proses untuk memuat sumber yang belum di-cache, --restarts,
+        --decompose dan render sheet per prodi (default: jumlah CPU)
+    restarts > 1: multi-start greedy acak (multistart.py) - `restarts` varian
+        first-fit dengan urutan & seri slot diacak dari `seed`, diselesaikan
+        paralel di `workers` proses; varian terbaik dipakai (abaikan `placement`)
+    Sebelum penempatan, permintaan vs kapasitas (dosen, kelompok, ruang per kelas
+        hari) dicek (feasibility.py) dan bottleneck-nya dicetak; strict=True
+        menghentikan run (InfeasibleSchedule) kalau ada MK yang pasti UNPLACED.
+    decompose: pecah MK ke komponen independen (dosen/kelompok sama dengan hari
+        beririsan, decompose.py), tiap komponen ditempatkan dengan `placement`
+        + diresolusi paralel di `workers` proses, lalu ruang direkonsiliasi
+    Setelah resolusi, MK UNPLACED ditempatkan sekaligus lewat maximum matching
+        (matching.py); yang terbukti tidak muat dilaporkan beserta alasannya.
+    repair_time: batas waktu (detik) perbaikan MK UNPLACED dengan tabu search
+        (repair.py) setelah matching; 0 = dilewati
+    anneal_iters / anneal_time: tahap simulated annealing (anneal.py) setelah
+        resolusi untuk tujuan lunak (celah mahasiswa, ruang dosen, sesi sore);
+        0 = dilewati. PWK tidak pernah dipindah.
+    snapshot: path snapshot jadwal induk (.json / .parquet, exporters.py) untuk
+        tool hilir; default <output>.snapshot.json
+    ics_dir: kalau diisi, feed iCalendar per dosen / ruang / kelompok mahasiswa
+        ditulis ke folder ini (semester mulai `semester_start`, `weeks` minggu)
+    placement: urutan penempatan awal, salah satu PLACEMENT_MODES
+        "first-fit" - urutan blok file (Informatika, Pengairan, Elektro, Arsitektur, MKDU)
+        "dsatur"    - most-constrained-first (slot feasible tersisa paling sedikit duluan)
+        "coloring"  - pewarnaan graf konflik (coloring.py), ruang dibagi per slot
+        "two-phase" - slot dulu (batas jumlah ruang per slot), lalu ruang per slot
+    """
+    place = PLACEMENT_MODES[placement]
+    # 1) Muat daftar MK (+ jadwal asli PWK) yang diminta, paralel per workbook
+    sources, errors = load_sources(only, workers=workers)
+    if errors:
+        raise SourceLoadError(errors)
+    lists = [name for name in sources if not SOURCES[name]["pinned"]]
 
     # Hapus artefak MK numerik
-    for df in (inf, peng, el, ars_src, mkdu):
+    for name in lists:
+        df = sources[name]
         if not df.empty:
             mask_bad = df["Mata_Kuliah"].astype(str).str.fullmatch(r"\d+(\.\d+)?", na=False)
             df.drop(df[mask_bad].index, inplace=True)
 
-    # 2) Penempatan awal semua kecuali PWK
-    rows=[]
-    # fungsi bantu untuk place awal (tanpa lihat PWK)
-    instr_busy = defaultdict(set); room_busy = defaultdict(set); student_busy = defaultdict(set)
-
-    def place_block(df_block, prodi_name):
-        nonlocal rows, instr_busy, room_busy, student_busy
-        for _, c in df_block.iterrows():
-            row = {
-                "Prodi": prodi_name if prodi_name else c.get("Prodi",""),
-                "Semester": c.get("Semester",""),
-                "Kelas": c.get("Kelas",""),
-                "Kode_MK": c.get("Kode_MK",""),
-                "Mata_Kuliah": c.get("Mata_Kuliah",""),
-                "SKS": c.get("SKS",""),
-                "Dosen": c.get("Dosen",""),
-                "D1": c.get("D1",""),
-                "D2": c.get("D2",""),
-                "NR": bool(c.get("NR", False))
-            }
-            # aturan khusus
-            weekend_only = (row["Prodi"].upper()=="MKDU") or row["NR"]
-            zoom = str(row["Semester"])=="1"
-
-            # cari slot
-            days = ["Sabtu","Minggu"] if weekend_only else (DAYS_MON_THU + DAY_FRI + DAYS_WE)
-            if row["Prodi"].upper()=="MKDU":
-                days = ["Sabtu"]  # MKDU dipaksa Sabtu
-            placed = False
-
-            # Create student identifier for conflict detection
-            student_id = (norm(row["Prodi"]), str(row["Semester"]), norm(row["Kelas"]))
-
-            for day in days:
-                for sess, jam in sessions_for_day(day):
-                    key = (day, sess)
-                    # Only check D1 for conflicts - D2 is just backup/replacement for D1
-                    names = [row["D1"]] if row["D1"] else ([row["Dosen"]] if row["Dosen"] else [])
-
-                    # Check instructor conflicts
-                    if any(n in instr_busy[key] for n in names if n):
-                        continue
-
-                    # Check student conflicts - CRITICAL: Students can't be in 2 places at once
-                    if student_id in student_busy[key]:
-                        continue
-
-                    if zoom:
-                        slot = dict(Hari=day, Sesi=sess, Jam=jam, Ruang="")
-                        placed = True
-                    else:
-                        # Use all available rooms (no lab rooms needed)
-                        room = next((rm for rm in ALL_ROOMS if rm not in room_busy[key]), "")
-                        if not room: continue
-                        slot = dict(Hari=day, Sesi=sess, Jam=jam, Ruang=room)
-                        room_busy[key].add(room)
-                        placed = True
-
-                    # Add instructor to busy list
-                    for n in names: instr_busy[key].add(n)
-
-                    # Add student to busy list - CRITICAL: Prevent student conflicts
-                    student_busy[key].add(student_id)
-
-                    rows.append({**slot, **row, "Mode": "Zoom" if zoom else "Luring"})
-                    break
-                if placed: break
-            if not placed:
-                # unplaced
-                rows.append(dict(Hari="", Sesi="", Jam="", Ruang="", **row, Mode="Zoom" if zoom else "Luring (UNPLACED)"))
-
-    place_block(inf, "Informatika")
-    place_block(peng, "Pengairan")
-    # Elektro sudah punya "Prodi" di frame-nya
-    place_block(el, None)
-    place_block(ars_src, None)  # Arsitektur auto-schedule
-    place_block(mkdu, "MKDU")
-
-    master = pd.DataFrame(rows)
-
-    # 3) Masukkan PWK dari jadwal asli (HARUS dipakai apa adanya)
-    pwk = parse_pwk_asli()
+    # 2) Kompilasi semua kecuali sumber pinned, urut registry (= urutan blok first-fit)
+    courses = pd.concat([course_frame(sources[name], SOURCES[name]["prodi"]) for name in lists]
+                        or [course_frame(pd.DataFrame())], ignore_index=True)
+    # PWK hanya dari jadwal asli (langkah 3)
+    courses = courses[courses["Prodi"].str.lower() != "pwk"].reset_index(drop=True)
+    # Satu tabel simbol untuk seluruh run (ikut disimpan di samping output)
+    occ = new_occupancy(new_symbols())
+    table = compile_courses(courses, occ)
+
+    # 3) PWK dari jadwal asli (HARUS dipakai apa adanya, pinned) + penempatan awal
+    pinned = [sources[name] for name in sources if SOURCES[name]["pinned"]]
+    pwk_cols = ["Hari","Sesi","Jam","Ruang","Prodi","Semester","Kelas","Kode_MK","Mata_Kuliah","SKS","Dosen","Mode","D1","D2"]
+    pwk = pd.concat(pinned, ignore_index=True) if pinned else pd.DataFrame(columns=pwk_cols)
     # set struktur kolom sama
     for c in ("Semester","Kelas","Kode_MK","SKS","Dosen","D1","D2"):
         if c not in pwk.columns: pwk[c] = ""
-    pwk.rename(columns={"Mode":"Mode"}, inplace=True)
-    pwk = pwk[["Hari","Sesi","Jam","Ruang","Prodi","Semester","Kelas","Kode_MK","Mata_Kuliah","SKS","Dosen","Mode","D1","D2"]]
-
-    # Hapus PWK lama jika ada lalu tempel PWK asli
-    master = master[master["Prodi"].str.lower()!="pwk"].reset_index(drop=True)
+    pwk = pwk[pwk_cols]
+    report = check_feasibility(table, occ, fixed=pwk)
+    print(format_report(report))
+    if strict and report:
+        raise InfeasibleSchedule(report)
+    if restarts > 1:
+        compile_courses(pwk, occ, table)
+        best = multistart(table, occ, restarts, workers, seed)
+        print(f"Multi-start: varian terbaik {best['variant']}/{restarts} (seed {best['seed']}), "
+              f"skor (kosong, bentrok, lunak) = {best['score']}")
+    elif decompose:
+        compile_courses(pwk, occ, table)
+        st = solve_components(table, occ, place, workers)
+        print(f"Dekomposisi: {st['components']} komponen (terbesar {st['largest']} MK), "
+              f"{st['fallback']}/{st['courses']} MK ditempatkan ulang serial "
+              f"({st['overflow']} karena rekonsiliasi ruang)")
+    elif placement in PWK_FIRST:
+        compile_courses(pwk, occ, table)
+        place(table, occ)
+    else:
+        place(table, occ)  # tanpa lihat PWK
+        compile_courses(pwk, occ, table)
+
+    # 4) Selesaikan konflik di tabel (jangan pindahkan PWK)
+    labels = [f"{p} - {mk}" for df in (courses, pwk) for p, mk in zip(df["Prodi"], df["Mata_Kuliah"])]
+    resolve_table(table, occ, describe=labels.__getitem__)
+    if any(s < 0 for s in table.slot):
+        mt = match_courses(table, occ)
+        print(f"Matching UNPLACED: {len(mt['placed'])} ditempatkan, {len(mt['unplaceable'])} tidak mungkin "
+              f"tanpa menggeser MK lain")
+        for i, reason in sorted(mt["unplaceable"].items())[:10]:
+            print(f"  - {labels[i]}: {reason}")
+        for rows_h, slots_h, deficit in mt["hall"]:
+            print(f"  - Hall: {len(rows_h)} MK luring berebut ruang kosong di {len(slots_h)} slot, "
+                  f"minimal {deficit} tidak muat")
+    if repair_time and any(s < 0 for s in table.slot):
+        st = tabu_repair(table, occ, time_limit=repair_time, seed=seed)
+        print(f"Repair UNPLACED: {st['before']} -> {st['after']} MK tanpa slot (total, di luar PWK; "
+              f"{st['iterations']} langkah, {st['seconds']:.2f} detik)")
+    if anneal_iters > 0:
+        st = anneal(table, occ, anneal_iters, anneal_time, seed=seed)
+        print(f"Annealing: {st['iterations']} langkah ({st['accepted']} diterima, {st['seconds']:.2f} detik), "
+              f"biaya lunak {st['cost_before']} -> {st['cost_after']}")
+
+    # 5) Ekspor tabel ke DataFrame + normalisasi aturan: MKDU Sabtu, Smt1 Zoom, Zoom tanpa ruang
+    sched = pd.DataFrame([schedule_values(table, occ, i) for i in range(len(courses))],
+                         columns=["Hari","Sesi","Jam","Ruang"], dtype=object)
+    zoom = courses["Semester"].astype(str) == "1"
+    mode = np.where(zoom, "Zoom", np.where(sched["Hari"] != "", "Luring", "Luring (UNPLACED)"))
+    master = pd.concat([sched, courses.assign(Mode=mode)], axis=1)
     master = pd.concat([master, pwk], ignore_index=True)
-
-    # 4) Normalisasi aturan: MKDU Sabtu, Smt1 Zoom, Zoom tanpa ruang
     master.loc[master["Prodi"].str.upper()=="MKDU","Hari"] = "Sabtu"
     master.loc[master["Semester"].astype(str)=="1","Mode"] = "Zoom"
     master.loc[master["Mode"].str.lower().str.contains("zoom", na=False),"Ruang"] = ""
 
-    # 5) Selesaikan konflik (jangan pindahkan PWK)
-    master = resolve_all(master)
-
     # 6) Urut & simpan
     order = {d:i for i,d in enumerate(["Senin","Selasa","Rabu","Kamis","Jumat","Sabtu","Minggu",""])}
     master["__o"] = master["Hari"].map(order).fillna(99)
@@ -731,133 +1233,133 @@ def main(output_path=BASE_DIR / "jadwal_gabungan_SATU_TABEL_FINAL_PWK_ARS.xlsx")
     master = master.sort_values(by=["__o","Sesi_num","Ruang","Prodi","Semester","Kelas"]).drop(columns=["__o","Sesi_num"])
 
     # Ringkasan konflik
-    def count_conflicts(df):
-        # ruang
-        luring = df[~df["Mode"].str.lower().str.contains("zoom", na=False)]
-        room_conf = luring[luring["Ruang"]!=""].groupby(["Hari","Sesi","Ruang"]).size()
-        room_conflicts = int((room_conf > 1).sum())
-        # dosen
-        slot_map = defaultdict(list)
-        for i, r in df.iterrows():
-            day = norm(r["Hari"]); sesi = r["Sesi"]
-            if not day or not sesi: continue
-            for n in instr_names(r):
-                if n: slot_map[(day,int(sesi),n)].append(i)
-        instr_conflicts = sum(1 for _, idxs in slot_map.items() if len(idxs) > 1)
-        empties = int(((df["Hari"]=="") | (df["Sesi"]=="")).sum())
-        return room_conflicts, instr_conflicts, empties
-
-    rc, ic, em = count_conflicts(master)
-
-    # Create separate sheets for each prodi
-    def create_prodi_sheet(df_prodi, prodi_name, writer):
-        # Create header section
-        header_data = []
-        header_data.append(["JADWAL KULIAH "])
-        header_data.append(["SEMESTER GANJIL TAHUN AKADEMIK 2025 - 2026"])
-        header_data.append([""])
-        header_data.append(["FAKULTAS ", ":", "TEKNIK"])
-
-        if prodi_name.upper() == "INFORMATIKA":
-            header_data.append(["JURUSAN", ":", "INFORMATIKA"])
-            header_data.append(["PROGRAM STUDI", ":", "INFORMATIKA"])
-        elif prodi_name.upper() == "PWK":
-            header_data.append(["JURUSAN", ":", "PENGEMBANGAN WILAYAH DAN KOTA"])
-            header_data.append(["PROGRAM STUDI", ":", "PENGEMBANGAN WILAYAH DAN KOTA"])
-        elif prodi_name.upper() == "ELEKTRO":
-            header_data.append(["JURUSAN", ":", "TEKNIK ELEKTRO"])
-            header_data.append(["PROGRAM STUDI", ":", "TEKNIK ELEKTRO"])
-        elif prodi_name.upper() == "PENGAIRAN":
-            header_data.append(["JURUSAN", ":", "TEKNIK SIPIL"])
-            header_data.append(["PROGRAM STUDI", ":", "TEKNIK PENGAIRAN"])
-        elif prodi_name.upper() == "ARSITEKTUR":
-            header_data.append(["JURUSAN", ":", "ARSITEKTUR"])
-            header_data.append(["PROGRAM STUDI", ":", "ARSITEKTUR"])
-        else:
-            header_data.append(["JURUSAN", ":", prodi_name.upper()])
-            header_data.append(["PROGRAM STUDI", ":", prodi_name.upper()])
-
-        header_data.append(["KELAS", ":", "REGULER"])
-        header_data.append([""])
-
-        # Column headers
-        header_data.append(["No.", "HARI", "Jam", "SMT", "Kelas", "Kode MK", "Mata Kuliah", "SKS", "Nama Dosen", "Ruang"])
-        header_data.append(["", "", "", "", "", "", "", "", "Dosen 1", "Dosen 2"])
-        header_data.append(["1", "2", "3", "4", "5", "6", "7", "8", "9", "10"])
-
-        # Sort schedule data by day and session
-        order = {d:i for i,d in enumerate(["Senin","Selasa","Rabu","Kamis","Jumat","Sabtu","Minggu",""])}
-        df_sorted = df_prodi.copy()
-        df_sorted["__o"] = df_sorted["Hari"].map(order).fillna(99)
-        df_sorted["Sesi_num"] = pd.to_numeric(df_sorted["Sesi"], errors="coerce").fillna(99).astype(int)
-        df_sorted = df_sorted.sort_values(by=["__o","Sesi_num","Ruang"]).drop(columns=["__o","Sesi_num"])
-
-        # Data rows
-        data_rows = []
-        for i, (_, row) in enumerate(df_sorted.iterrows(), 1):
-            ruang = row["Ruang"] if pd.notna(row["Ruang"]) and row["Ruang"] != "" else "Zoom"
-            dosen1 = row["D1"] if pd.notna(row["D1"]) and row["D1"] != "" else ""
-            dosen2 = row["D2"] if pd.notna(row["D2"]) and row["D2"] != "" else ""
-
-            # Format semester and class
-            semester_display = format_semester_display(row["Semester"])
-            class_formatted = format_class_name(row["Kelas"], row["Semester"])
-
-            data_row = [
-                str(i),                           # No
-                row["Hari"],                      # HARI
-                row["Jam"],                       # Jam
-                semester_display,                 # SMT (Semester in Roman)
-                class_formatted,                  # Kelas (formatted like 1A, 2B)
-                row["Kode_MK"],                   # Kode MK
-                row["Mata_Kuliah"],               # Mata Kuliah
-                str(row["SKS"]) if pd.notna(row["SKS"]) else "", # SKS
-                dosen1,                           # Nama Dosen (Dosen 1)
-                ruang,                            # Ruang
-                dosen2                            # Dosen 2 (additional column)
-            ]
-            data_rows.append(data_row)
-
-        # Combine header and data
-        all_data = header_data + data_rows
-
-        # Create DataFrame and write to Excel
-        max_cols = max(len(row) for row in all_data)
-        for row in all_data:
-            while len(row) < max_cols:
-                row.append("")
-
-        df_output = pd.DataFrame(all_data)
-        df_output.to_excel(writer, sheet_name=f"Jadwal {prodi_name.upper()}",
-                          index=False, header=False)
-
-    with pd.ExcelWriter(output_path, engine="openpyxl") as w:
-        # Create sheets for each prodi
-        prodis = ["Informatika", "PWK", "Elektro", "Pengairan", "Arsitektur", "MKDU"]
-
-        for prodi in prodis:
-            df_prodi = master[master["Prodi"].str.upper() == prodi.upper()]
-            if not df_prodi.empty:
-                create_prodi_sheet(df_prodi, prodi, w)
-
-        # Keep the original combined sheet as well
-        master.rename(columns={
-            "Kode_MK":"Kode MK",
-            "Mata_Kuliah":"Mata Kuliah",
-            "D1":"Dosen 1",
-            "D2":"Dosen 2",
-            "Mode":"Mode (Zoom/Luring)"
-        }).to_excel(w, index=False, sheet_name="Jadwal Induk (Gabungan)")
-
-        # Conflict summary
-        pd.DataFrame({
-            "Metric":["Room Conflicts","Instructor Conflicts","Rows w/ Empty Day/Session"],
-            "Value":[rc, ic, em]
-        }).to_excel(w, index=False, sheet_name="Ringkasan Konflik")
+    rc, ic, sc, em = count_conflicts(master)
+
+    # Sheet per prodi (render paralel di `workers` proses), sheet induk & ringkasan
+    prodis = sheet_prodis(master)
+    write_schedule_workbook(output_path, master, (rc, ic, sc, em), prodis, workers)
+
+    # Id dosen/ruang/prodi/kelompok per baris sheet induk untuk tool hilir
+    occ.symbols.save(symbols_path(output_path), occ.symbols.frame_ids(master), sheet="Jadwal Induk (Gabungan)")
+    # Snapshot + feed .ics langsung dari master (tanpa baca ulang Excel)
+    feeds = export_schedule(master, snapshot or snapshot_path(output_path), ics_dir, semester_start, weeks)
 
     print(f"Selesai. Tersimpan di: {output_path}")
-    print(f"Ringkasan: Room={rc}, Dosen={ic}, Kosong={em}")
-    print(f"Sheets dibuat untuk: {', '.join([p for p in prodis if not master[master['Prodi'].str.upper() == p.upper()].empty])}")
+    print(f"Ringkasan: Room={rc}, Dosen={ic}, Mahasiswa={sc}, Kosong={em}")
+    print(f"Sheets dibuat untuk: {', '.join(prodis)}")
+    if feeds:
+        print(f"Feed .ics di {ics_dir}: " + ", ".join(f"{k}={n}" for k, n in feeds.items()))
+
+def _parse_only(ap, value):
+    """Daftar nama dari --sources (dipisah koma), divalidasi terhadap registry."""
+    if not value:
+        return None
+    only = [n.strip() for n in value.split(",") if n.strip()]
+    unknown = [n for n in only if n not in LOADERS]
+    if unknown:
+        ap.error(f"sumber tidak dikenal: {', '.join(unknown)}")
+    return only
+
+def convert_cli(argv):
+    import argparse
+    ap = argparse.ArgumentParser(prog="jadwal.py convert",
+                                 description="Ekspor katalog MK ternormalisasi (CSV/Parquet) dari file Excel sumber.")
+    ap.add_argument("-o", "--out", default=BASE_DIR / "catalog", help="folder katalog (default: ./catalog)")
+    ap.add_argument("--format", choices=["csv", "parquet"], default="csv", help="format katalog (default: csv)")
+    ap.add_argument("--sources", default=None, metavar="NAMA[,NAMA]",
+                    help=f"hanya sumber ini (registry: {', '.join(LOADERS)})")
+    ap.add_argument("--workers", type=int, default=None, metavar="K", help="jumlah proses parsing paralel")
+    args = ap.parse_args(argv)
+    try:
+        paths = convert_sources(args.out, args.format, _parse_only(ap, args.sources), args.workers)
+    except SourceLoadError as e:
+        ap.exit(1, f"{e}\n")
+    except ImportError as e:  # Parquet tanpa pyarrow/fastparquet
+        ap.exit(1, f"{e}\n")
+    for name, path in paths.items():
+        print(f"{name}: {path}")
+
+def _add_export_args(ap):
+    ap.add_argument("--snapshot", default=None, metavar="FILE",
+                    help="snapshot jadwal induk .json/.parquet (default: <output>.snapshot.json)")
+    ap.add_argument("--ics", default=None, metavar="FOLDER",
+                    help="tulis feed .ics per dosen/ruang/kelompok mahasiswa ke folder ini")
+    ap.add_argument("--semester-start", default=None, type=lambda v: datetime.date.fromisoformat(v),
+                    metavar="YYYY-MM-DD", help="tanggal mulai semester untuk feed .ics")
+    ap.add_argument("--weeks", type=int, default=None, metavar="N", help="jumlah minggu kuliah untuk feed .ics")
+
+def export_cli(argv):
+    import argparse
+    ap = argparse.ArgumentParser(prog="jadwal.py export",
+                                 description="Snapshot JSON/Parquet + feed .ics dari workbook jadwal yang sudah ada "
+                                             "(mis. hasil fine-tune).")
+    ap.add_argument("jadwal", help="workbook jadwal (sheet 'Jadwal Induk (Gabungan)')")
+    _add_export_args(ap)
+    args = ap.parse_args(argv)
+    snapshot = args.snapshot or (None if args.ics else snapshot_path(args.jadwal))
+    try:
+        feeds = export_schedule(read_master_sheet(args.jadwal), snapshot, args.ics, args.semester_start, args.weeks)
+    except ImportError as e:  # Parquet tanpa pyarrow/fastparquet
+        ap.exit(1, f"{e}\n")
+    if snapshot:
+        print(f"Snapshot: {snapshot}")
+    for kind, n in feeds.items():
+        print(f"{kind}: {n} file .ics")
+
+def cli(argv=None):
+    import argparse
+    import sys
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["convert"]:
+        return convert_cli(argv[1:])
+    if argv[:1] == ["export"]:
+        return export_cli(argv[1:])
+    ap = argparse.ArgumentParser(description="Susun jadwal gabungan semua prodi "
+                                             "(`jadwal.py convert -h`: ekspor katalog CSV/Parquet, "
+                                             "`jadwal.py export -h`: snapshot + .ics dari workbook).")
+    ap.add_argument("-o", "--output", default=BASE_DIR / "jadwal_gabungan_SATU_TABEL_FINAL_PWK_ARS.xlsx",
+                    help="file Excel output")
+    ap.add_argument("--placement", choices=sorted(PLACEMENT_MODES), default="first-fit",
+                    help="urutan penempatan awal (default: first-fit)")
+    ap.add_argument("--restarts", type=int, default=1, metavar="N",
+                    help="jumlah varian greedy acak (multi-start), ambil yang terbaik")
+    ap.add_argument("--workers", type=int, default=None, metavar="K",
+                    help="jumlah proses paralel untuk parsing sumber, --restarts / --decompose dan render sheet (default: jumlah CPU)")
+    ap.add_argument("--seed", type=int, default=0, help="seed dasar untuk --restarts")
+    ap.add_argument("--decompose", action="store_true",
+                    help="selesaikan komponen MK independen secara paralel (--workers)")
+    ap.add_argument("--anneal", type=int, default=0, metavar="ITERS",
+                    help="jumlah langkah simulated annealing setelah resolusi (default: 0 = mati)")
+    ap.add_argument("--anneal-time", type=float, default=None, metavar="DETIK",
+                    help="batas waktu annealing dalam detik")
+    ap.add_argument("--repair-time", type=float, default=2.0, metavar="DETIK",
+                    help="batas waktu tabu search untuk MK UNPLACED (default: 2; 0 = mati)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="selalu parse ulang file Excel sumber (abaikan cache input)")
+    ap.add_argument("--strict", action="store_true",
+                    help="berhenti sebelum penempatan kalau analisis kelayakan menemukan bottleneck")
+    ap.add_argument("--sources", default=None, metavar="NAMA[,NAMA]",
+                    help=f"hanya jadwalkan sumber ini (registry config/sources.yaml: {', '.join(LOADERS)})")
+    ap.add_argument("--catalog", default=None, metavar="FOLDER",
+                    help="baca katalog hasil `convert` (<nama>.parquet/.csv) dari folder ini, bukan Excel")
+    _add_export_args(ap)
+    args = ap.parse_args(argv)
+    global CATALOG_DIR
+    only = _parse_only(ap, args.sources)
+    if args.catalog:
+        CATALOG_DIR = os.environ["CHRONOSYNC_CATALOG"] = args.catalog  # ikut ke proses worker
+    if args.no_cache:
+        input_cache.enabled = False
+        os.environ["CHRONOSYNC_CACHE"] = "0"  # ikut ke proses worker (spawn/forkserver)
+    try:
+        main(args.output, placement=args.placement, restarts=args.restarts, workers=args.workers, seed=args.seed,
+             anneal_iters=args.anneal, anneal_time=args.anneal_time, repair_time=args.repair_time,
+             decompose=args.decompose, strict=args.strict, only=only, snapshot=args.snapshot,
+             ics_dir=args.ics, semester_start=args.semester_start, weeks=args.weeks)
+    except InfeasibleSchedule as e:
+        ap.exit(2, f"{e}\n")
+    except SourceLoadError as e:
+        ap.exit(1, f"{e}\n")
 
 if __name__ == "__main__":
-    main()
+    cli()
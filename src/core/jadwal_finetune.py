@@ -66,8 +66,8 @@ def find_available_slots(df, day=None, prodi=None, semester=None):
     Returns:
         List slot yang tersedia dengan detail lengkap
     """
-    # Build current occupancy maps
-    instr_busy, room_busy, student_busy = build_maps(df)
+    # Build current occupancy index
+    occ = build_maps(df)
 
     # Define days to check
     days_to_check = [day] if day else ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
@@ -81,13 +81,13 @@ def find_available_slots(df, day=None, prodi=None, semester=None):
             key = (check_day, sess)
 
             # Check room availability
-            available_rooms = [room for room in ALL_ROOMS if room not in room_busy[key]]
+            available_rooms = occ.free_rooms(key)
 
             # Get busy instructors for this slot
-            busy_instructors = list(instr_busy[key])
+            busy_instructors = occ.busy_instructors(key)
 
             # Get busy student groups
-            busy_students = list(student_busy[key])
+            busy_students = occ.busy_groups(key)
 
             slot_info = {
                 "Hari": check_day,
@@ -122,8 +122,8 @@ def add_course_to_schedule(df, course_info, target_day=None, target_session=None
     Returns:
         DataFrame yang sudah ditambah mata kuliahnya
     """
-    # Build current occupancy maps
-    instr_busy, room_busy, student_busy = build_maps(df)
+    # Build current occupancy index
+    occ = build_maps(df)
 
     # Create a row from course_info
     row = course_info.copy()
@@ -135,18 +135,14 @@ def add_course_to_schedule(df, course_info, target_day=None, target_session=None
         student_id = (norm(row["Prodi"]), str(row["Semester"]), norm(row["Kelas"]))
 
         # Check conflicts
-        instructor_conflict = any(n in instr_busy[key] for n in names if n)
-        student_conflict = student_id in student_busy[key]
-
-        if not instructor_conflict and not student_conflict:
+        if occ.is_free(key, names, student_id):
             # Find available room or use Zoom
-            if target_room and target_room not in room_busy[key]:
+            if target_room and occ.room_free(key, target_room):
                 room = target_room
             elif str(row["Semester"]) == "1":  # Semester 1 uses Zoom
                 room = ""
             else:
-                available_rooms = [r for r in ALL_ROOMS if r not in room_busy[key]]
-                room = available_rooms[0] if available_rooms else ""
+                room = occ.first_free_room(key)
 
             if room or str(row["Semester"]) == "1":
                 # Add to specific slot
@@ -170,7 +166,7 @@ def add_course_to_schedule(df, course_info, target_day=None, target_session=None
                 return df_new
 
     # If specific slot failed or not specified, find best available slot
-    slot = place_one(row, instr_busy, room_busy, student_busy)
+    slot = place_one(row, occ)
 
     if slot["Hari"]:
         new_row = {
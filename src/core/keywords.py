@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Klasifikasi nama MK berdasarkan beberapa himpunan kata kunci sekaligus.
+
+Semua kata kunci (semua kategori) dikompilasi jadi satu regex lookahead
+`(?=(kw1|kw2|...))`, jadi satu scan per string menemukan setiap kemunculan,
+termasuk yang tumpang tindih (gaya Aho-Corasick), berapa pun jumlah aturannya.
+Di satu posisi regex hanya melaporkan kata kunci terpanjang (alternatif diurut
+dari yang terpanjang); karena itu tiap kata kunci membawa kategori semua kata
+kunci lain yang merupakan prefiksnya (kalau "laboratorium" cocok, "lab" pasti
+juga cocok di posisi yang sama). Pencocokan case-insensitive (lower()).
+
+Kategori punya prioritas (urutan `categories`); `classify` mengembalikan kode
+kategori tertinggi, `categories_of` semua kategori yang cocok.
+"""
+
+import re
+
+import pandas as pd
+
+NORMAL = "normal"
+MKDU = "mkdu"
+PRACTICUM = "praktikum"
+EXCLUDED = "excluded"
+
+
+class KeywordClassifier:
+    """
+    `categories`: list (kode, kata kunci) urut prioritas, mis.
+    [(MKDU, [...]), (PRACTICUM, [...]), (EXCLUDED, [...])].
+    """
+
+    def __init__(self, categories):
+        self.order = [code for code, _ in categories]
+        owner = {}  # kata kunci -> set kategori
+        for code, words in categories:
+            for w in words:
+                w = w.lower()
+                if w:
+                    owner.setdefault(w, set()).add(code)
+        # Kata kunci yang cocok juga mengimplikasikan semua prefiksnya
+        self.implied = {
+            w: frozenset(c for p, cats in owner.items() if w.startswith(p) for c in cats)
+            for w in owner
+        }
+        words = sorted(owner, key=lambda w: (-len(w), w))
+        self.pattern = re.compile("(?=(" + "|".join(map(re.escape, words)) + "))") if words else None
+        self._codes = {}  # frozenset kategori -> kode prioritas tertinggi
+
+    def categories_of(self, text):
+        """Semua kategori yang kata kuncinya muncul di `text`."""
+        if self.pattern is None or not text:
+            return frozenset()
+        found = frozenset()
+        for w in set(self.pattern.findall(str(text).lower())):
+            found |= self.implied[w]
+        return found
+
+    def _code(self, cats):
+        code = self._codes.get(cats)
+        if code is None:
+            code = self._codes[cats] = next((c for c in self.order if c in cats), NORMAL)
+        return code
+
+    def classify(self, text):
+        """Kode kategori prioritas tertinggi untuk `text` (NORMAL kalau tidak ada)."""
+        return self._code(self.categories_of(text))
+
+    def matches(self, text, codes):
+        """True kalau `text` masuk salah satu kategori `codes`."""
+        return not self.categories_of(text).isdisjoint(codes)
+
+    def _series_categories(self, sr):
+        if self.pattern is None:
+            return pd.Series([frozenset()] * len(sr), index=sr.index, dtype=object)
+        found = sr.astype(str).str.lower().str.findall(self.pattern)
+        return found.map(lambda ws: frozenset().union(*(self.implied[w] for w in ws)))
+
+    def classify_series(self, sr):
+        """`classify` untuk seluruh Series (satu regex findall tervektorisasi)."""
+        return self._series_categories(sr).map(self._code)
+
+    def mask(self, sr, codes):
+        """Mask baris Series yang masuk salah satu kategori `codes`."""
+        codes = frozenset(codes)
+        return self._series_categories(sr).map(lambda cats: not cats.isdisjoint(codes)).astype(bool)
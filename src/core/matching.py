@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Penempatan batch MK tanpa slot dengan maximum matching (Hopcroft-Karp).
+
+Graf bipartit: kiri = MK luring tanpa slot, kanan = pasangan (slot, ruang)
+yang kosong dan feasible (slot di domain MK, dosen & kelompok bebas, ruang
+belum dipakai). Ruang dalam satu slot setara untuk semua MK, jadi simpul
+(slot, ruang) satu slot digabung jadi satu simpul slot berkapasitas = jumlah
+ruang kosong; matching-nya sama, sisinya jauh lebih sedikit.
+
+Relaksasi ini mengabaikan bentrok dosen/kelompok di antara MK dalam batch
+itu sendiri, sehingga:
+- MK tanpa satu pun kandidat terbukti tidak bisa ditempatkan tanpa menggeser
+  MK lain (alasannya dilaporkan); untuk himpunan Hall hanya defisitnya
+  (|S| - kapasitas N(S)) yang terbukti - anggota mana yang tidak ter-match
+  bergantung urutan matching, jadi anggotanya tetap dicoba;
+- hasil matching diterapkan berurutan, MK yang ternyata bentrok dengan MK
+  batch lain dicoba lagi di putaran berikutnya.
+MK Zoom tidak butuh ruang dan ditempatkan first-fit setelah MK luring.
+"""
+
+from collections import deque
+
+from courses import first_fit, iter_bits, popcount
+
+REASON_DOMAIN = "tidak ada hari yang diizinkan"
+REASON_BUSY = "dosen/kelompok mahasiswa sibuk di semua slot yang diizinkan"
+REASON_ROOMS = "ruang penuh di semua slot yang bebas untuk dosen/kelompok"
+
+
+def _edges(table, occ, rows, masks):
+    """Slot kandidat per MK + kapasitas ruang per slot; MK tanpa kandidat -> alasan."""
+    adj, reasons = {}, {}
+    cap = [popcount(~m & occ.assignable_rooms) for m in occ.room_mask]
+    for u in rows:
+        if not masks[u]:
+            reasons[u] = REASON_DOMAIN
+            continue
+        free = masks[u] & ~occ.busy_mask_ids(table.instr[u], table.group[u])
+        if not free:
+            reasons[u] = REASON_BUSY
+            continue
+        if table.zoom[u]:
+            continue
+        slots = [sid for sid in iter_bits(free) if cap[sid]]
+        if slots:
+            adj[u] = slots
+        else:
+            reasons[u] = REASON_ROOMS
+    return adj, cap, reasons
+
+
+def hopcroft_karp(adj, cap):
+    """
+    Maximum b-matching: `adj[u]` = slot kandidat u, `cap[s]` = kapasitas slot s.
+    Returns:
+        (match: {u: slot}, load: {slot: [u...]})
+    """
+    match = {u: -1 for u in adj}
+    load = {}
+    inf = float("inf")
+
+    def assign(u, s):
+        old = match[u]
+        if old >= 0:
+            load[old].remove(u)
+        match[u] = s
+        load.setdefault(s, []).append(u)
+
+    while True:
+        # BFS berlapis dari MK yang belum ter-match
+        dist = {u: 0 if match[u] < 0 else inf for u in adj}
+        queue = deque(u for u in adj if match[u] < 0)
+        found = False
+        while queue:
+            u = queue.popleft()
+            for s in adj[u]:
+                users = load.get(s, ())
+                if len(users) < cap[s]:
+                    found = True
+                    continue
+                for w in users:
+                    if dist[w] == inf:
+                        dist[w] = dist[u] + 1
+                        queue.append(w)
+        if not found:
+            return match, load
+
+        # DFS iteratif: cari lintasan augmentasi mengikuti lapisan
+        ptr = dict.fromkeys(adj, 0)
+        augmented = False
+        for root in adj:
+            if match[root] >= 0:
+                continue
+            stack, via = [root], []  # stack[k+1] sekarang memakai slot via[k]
+            while stack:
+                u = stack[-1]
+                if ptr[u] >= len(adj[u]):
+                    dist[u] = inf  # buntu, jangan dikunjungi lagi di fase ini
+                    stack.pop()
+                    if via:
+                        via.pop()
+                    continue
+                s = adj[u][ptr[u]]
+                users = load.get(s, ())
+                if len(users) < cap[s]:
+                    # Geser sepanjang lintasan: yang paling dalam dulu
+                    assign(u, s)
+                    for k in range(len(stack) - 2, -1, -1):
+                        assign(stack[k], via[k])
+                    augmented = True
+                    break
+                nxt = next((w for w in users if dist[w] == dist[u] + 1), None)
+                if nxt is None:
+                    ptr[u] += 1
+                else:
+                    via.append(s)
+                    stack.append(nxt)
+        if not augmented:
+            return match, load
+
+
+def hall_violations(adj, cap, match, load):
+    """
+    Himpunan Hall dari MK yang tidak ter-match: MK yang terjangkau lintasan
+    alternating (S) hanya bisa memakai slot N(S) yang sudah penuh, jadi
+    |S| > kapasitas N(S). Dipecah per komponen terhubung.
+    Returns:
+        list (baris S, slot N(S), kapasitas N(S))
+    """
+    seen_u, seen_s = set(), set()
+    queue = deque(u for u in adj if match[u] < 0)
+    seen_u.update(queue)
+    while queue:
+        u = queue.popleft()
+        for s in adj[u]:
+            if s in seen_s:
+                continue
+            seen_s.add(s)
+            for w in load.get(s, ()):
+                if w not in seen_u:
+                    seen_u.add(w)
+                    queue.append(w)
+
+    # Komponen terhubung S + N(S)
+    out, done = [], set()
+    by_slot = {}
+    for u in seen_u:
+        for s in adj[u]:
+            by_slot.setdefault(s, []).append(u)
+    for start in sorted(seen_u):
+        if start in done:
+            continue
+        rows, slots = [], set()
+        queue = deque([start])
+        done.add(start)
+        while queue:
+            u = queue.popleft()
+            rows.append(u)
+            for s in adj[u]:
+                if s not in slots:
+                    slots.add(s)
+                    for w in by_slot[s]:
+                        if w not in done:
+                            done.add(w)
+                            queue.append(w)
+        if any(match[u] < 0 for u in rows):
+            out.append((sorted(rows), sorted(slots), sum(cap[s] for s in slots)))
+    return out
+
+
+def match_courses(table, occ, rows=None, masks=None):
+    """
+    Tempatkan MK tanpa slot (`rows`, default semua baris non-pinned dengan
+    slot -1) sekaligus lewat maximum matching; MK lain tidak digeser. In-place.
+    `masks`: bitmask slot kandidat per baris (default `table.domain`).
+    Returns:
+        {"placed": [baris], "unplaceable": {baris: alasan}, "remaining": [baris],
+         "hall": [(baris, slot, defisit)], "rounds": n}
+        `unplaceable` terbukti (relatif ke penempatan MK lain: tidak ada slot /
+        ruang sama sekali); `hall`: himpunan MK yang minimal `defisit`
+        anggotanya pasti tidak muat; `remaining` (termasuk anggota Hall yang
+        tidak ter-match) kalah bentrok dengan MK lain dalam batch yang sama.
+    """
+    masks = table.domain if masks is None else masks
+    if rows is None:
+        rows = [i for i in range(len(table)) if not table.pinned[i] and table.slot[i] < 0]
+    pending = [u for u in rows if table.slot[u] < 0]
+    placed, unplaceable, hall = [], {}, []
+    rounds = 0
+    while pending:
+        rounds += 1
+        adj, cap, reasons = _edges(table, occ, pending, masks)
+        match, load = hopcroft_karp(adj, cap)
+        if rounds == 1:
+            unplaceable.update(reasons)
+            hall = [(rows_s, slots, len(rows_s) - capacity)
+                    for rows_s, slots, capacity in hall_violations(adj, cap, match, load)]
+
+        # Terapkan: MK paling sedikit pilihan dulu; ruang = ruang kosong terendah di slot
+        progress = False
+        for u in sorted((u for u in adj if match[u] >= 0), key=lambda u: (len(adj[u]), u)):
+            sid = match[u]
+            if (occ.busy_mask_ids(table.instr[u], table.group[u]) >> sid) & 1:
+                continue  # bentrok dengan MK batch yang baru ditempatkan
+            rid = occ.first_free_room_id(sid)
+            if rid is None:
+                continue
+            table.slot[u], table.room[u] = sid, rid
+            occ.restore(u, table.entry(u))
+            placed.append(u)
+            progress = True
+        for u in pending:
+            if table.zoom[u] and table.slot[u] < 0 and u not in unplaceable:
+                found = first_fit(table, occ, u, masks[u])
+                if found is not None:
+                    table.slot[u], table.room[u] = found
+                    occ.restore(u, table.entry(u))
+                    placed.append(u)
+                    progress = True
+        pending = [u for u in pending if table.slot[u] < 0 and u not in unplaceable]
+        if not progress:
+            break
+    return dict(placed=placed, unplaceable=unplaceable, remaining=pending, hall=hall, rounds=rounds)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-start penempatan greedy acak + resolusi, ambil yang terbaik.
+
+Tiap varian mulai dari salinan CourseTable + OccupancyIndex yang sama
+(PWK sudah tercatat), mengacak urutan MK dan memecah seri slot secara
+acak, lalu diselesaikan dengan `resolve_courses`. Varian dinilai dengan
+(MK tanpa slot, sisa bentrok, skor lunak); seri dipecah dengan nomor varian
+sehingga hasil hanya bergantung pada seed dasar, bukan jumlah worker.
+Varian 0 memakai urutan tabel tanpa acak (= first-fit biasa).
+"""
+
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from courses import place_courses, resolve_courses, soft_score
+
+_base = None  # (table, occ) ter-pickle, per proses worker
+
+
+def _init_worker(state):
+    global _base
+    _base = state
+
+
+def variant_seeds(restarts, seed=0):
+    """Seed tiap varian, diturunkan dari seed dasar (reproducible)."""
+    rng = random.Random(seed)
+    return [rng.getrandbits(32) for _ in range(restarts)]
+
+
+def run_variant(k, seed, max_iters=120, state=None):
+    """
+    Jalankan varian ke-k dari state ter-pickle (default: state worker).
+    Returns:
+        (score, k, seed, slot, room, stats)
+    """
+    table, occ = pickle.loads(_base if state is None else state)
+    order = [i for i in range(len(table)) if not table.pinned[i] and table.slot[i] < 0]
+    rng = None
+    if k > 0:
+        rng = random.Random(seed)
+        rng.shuffle(order)
+    place_courses(table, occ, order, rng=rng)
+    stats = resolve_courses(table, occ, max_iters)
+    unplaced = sum(1 for i in order if table.slot[i] < 0)
+    score = (unplaced, sum(stats["remaining"].values()), soft_score(table, occ))
+    return score, k, seed, table.slot, table.room, stats
+
+
+def multistart(table, occ, restarts, workers=None, seed=0, max_iters=120):
+    """
+    Jalankan `restarts` varian (paralel di `workers` proses) dan terapkan
+    varian terbaik ke `table` / `occ`.
+    Returns:
+        dict {"variant", "seed", "score", "stats", "scores"}
+    """
+    state = pickle.dumps((table, occ))
+    seeds = variant_seeds(restarts, seed)
+    if workers == 1 or restarts == 1:
+        results = [run_variant(k, s, max_iters, state) for k, s in enumerate(seeds)]
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(state,)) as ex:
+            results = list(ex.map(run_variant, range(restarts), seeds, [max_iters] * restarts))
+
+    score, k, variant_seed, slots, rooms, stats = min(results, key=lambda r: (r[0], r[1]))
+    for i in range(len(table)):
+        if table.pinned[i]:
+            continue
+        occ.remove(i)
+        table.slot[i], table.room[i] = slots[i], rooms[i]
+        occ.restore(i, table.entry(i))
+    return dict(variant=k, seed=variant_seed, score=score, stats=stats,
+                scores=[r[0] for r in sorted(results, key=lambda r: r[1])])
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Indeks okupansi slot (hari, sesi) berbasis bitmask.
+
+Hari, sesi, ruang, dosen dan kelompok mahasiswa dipetakan ke id integer
+satu kali; status sibuk disimpan sebagai bitmask int Python:
+- dosen / kelompok mahasiswa -> bitmask slot yang sudah terpakai
+- slot -> bitmask ruang yang sudah terpakai
+Cek bentrok jadi operasi bit, bukan hashing tuple + string per slot.
+Id berasal dari SymbolTable (`symbols.py`) yang bisa dibagi dengan loader
+dan indeks lain.
+
+Indeks bisa diubah secara inkremental: `add(idx, ...)` / `remove(idx)`
+mencatat penempatan per baris dengan hitungan referensi, sehingga baris
+yang masih bentrok tetap terhitung sibuk setelah baris lain dipindah.
+"""
+
+from symbols import SymbolTable
+
+
+class OccupancyIndex:
+    """Okupansi jadwal: siapa/ruang mana yang sibuk di slot mana."""
+
+    def __init__(self, slots, rooms, symbols=None):
+        # slots: list (hari, sesi) berurutan; rooms: urutan prioritas ruang
+        # symbols: SymbolTable bersama (sebaiknya sudah di-seed dengan `rooms`
+        # supaya id ruang mengikuti urutan prioritas)
+        self.slots = list(slots)
+        self.slot_id = {key: i for i, key in enumerate(self.slots)}
+        self.symbols = SymbolTable(rooms) if symbols is None else symbols
+        self.rooms = self.symbols.rooms
+        self.room_id = self.symbols.room_id
+        # Hanya ruang dari daftar awal yang boleh dipakai saat penempatan
+        self.assignable_rooms = 0
+        for room in rooms:
+            self.assignable_rooms |= 1 << self.intern_room(room)
+
+        self.instructors = self.symbols.instructors
+        self.instr_id = self.symbols.instr_id
+        self.instr_mask = []
+
+        self.groups = self.symbols.groups
+        self.group_id = self.symbols.group_id
+        self.group_mask = []
+        self.sync()
+
+        self.room_mask = [0] * len(self.slots)
+
+        # Hitungan referensi per (id, slot) / (slot, ruang) dan penempatan per baris
+        self._instr_refs = {}
+        self._group_refs = {}
+        self._room_refs = {}
+        self.placed = {}
+        self.slot_rows = [{} for _ in self.slots]  # slot -> {idx: None}, urut masuk
+
+    # ---------- interning ----------
+    def sync(self):
+        """Samakan ukuran mask dengan tabel simbol (kalau simbol di-intern di luar indeks ini)."""
+        self.instr_mask.extend([0] * (len(self.instructors) - len(self.instr_mask)))
+        self.group_mask.extend([0] * (len(self.groups) - len(self.group_mask)))
+
+    def intern_room(self, room):
+        return self.symbols.intern_room(room)
+
+    def intern_instr(self, name):
+        iid = self.symbols.intern_instr(name)
+        if iid >= len(self.instr_mask):
+            self.sync()
+        return iid
+
+    def intern_group(self, student_id):
+        gid = self.symbols.intern_group(student_id)
+        if gid >= len(self.group_mask):
+            self.sync()
+        return gid
+
+    # ---------- update ----------
+    def _entry(self, key, names, student_id, room):
+        sid = self.slot_id.get(key)
+        if sid is None:
+            return None
+        iids = tuple(self.intern_instr(n) for n in names if n)
+        gid = self.intern_group(student_id) if student_id is not None else None
+        rid = self.intern_room(room) if room else None
+        return sid, iids, gid, rid
+
+    def _apply(self, entry, delta):
+        sid, iids, gid, rid = entry
+        bit = 1 << sid
+        for iid in iids:
+            n = self._instr_refs.get((iid, sid), 0) + delta
+            self._instr_refs[(iid, sid)] = n
+            if n > 0:
+                self.instr_mask[iid] |= bit
+            else:
+                self.instr_mask[iid] &= ~bit
+        if gid is not None:
+            n = self._group_refs.get((gid, sid), 0) + delta
+            self._group_refs[(gid, sid)] = n
+            if n > 0:
+                self.group_mask[gid] |= bit
+            else:
+                self.group_mask[gid] &= ~bit
+        if rid is not None:
+            n = self._room_refs.get((sid, rid), 0) + delta
+            self._room_refs[(sid, rid)] = n
+            if n > 0:
+                self.room_mask[sid] |= 1 << rid
+            else:
+                self.room_mask[sid] &= ~(1 << rid)
+
+    def occupy(self, key, names=(), student_id=None, room=""):
+        """Tandai slot `key` sibuk untuk dosen, kelompok mahasiswa dan ruang."""
+        entry = self._entry(key, names, student_id, room)
+        if entry is not None:
+            self._apply(entry, 1)
+
+    def occupy_ids(self, sid, iids=(), gid=None, rid=None):
+        """Seperti `occupy`, untuk id slot/dosen/kelompok/ruang yang sudah di-intern."""
+        self._apply((sid, iids, gid, rid), 1)
+
+    def add(self, idx, key, names=(), student_id=None, room=""):
+        """Seperti `occupy`, tapi dicatat atas nama baris `idx` agar bisa di-`remove`."""
+        self.remove(idx)
+        self.restore(idx, self._entry(key, names, student_id, room))
+
+    def remove(self, idx):
+        """Lepas okupansi baris `idx`; kembalikan entri lamanya (atau None)."""
+        entry = self.placed.pop(idx, None)
+        if entry is not None:
+            self._apply(entry, -1)
+            del self.slot_rows[entry[0]][idx]
+        return entry
+
+    def restore(self, idx, entry):
+        """Pasang kembali entri hasil `remove` tanpa interning ulang."""
+        if entry is not None:
+            self._apply(entry, 1)
+            self.placed[idx] = entry
+            self.slot_rows[entry[0]][idx] = None
+
+    # ---------- query ----------
+    def busy_mask(self, names=(), student_id=None):
+        """Bitmask slot di mana salah satu dosen atau kelompok mahasiswa sudah sibuk."""
+        mask = 0
+        self.sync()
+        for n in names:
+            iid = self.instr_id.get(n)
+            if iid is not None:
+                mask |= self.instr_mask[iid]
+        if student_id is not None:
+            gid = self.group_id.get(student_id)
+            if gid is not None:
+                mask |= self.group_mask[gid]
+        return mask
+
+    def busy_mask_ids(self, iids=(), gid=None):
+        """Seperti `busy_mask`, untuk id yang sudah di-intern."""
+        mask = 0 if gid is None else self.group_mask[gid]
+        for iid in iids:
+            mask |= self.instr_mask[iid]
+        return mask
+
+    def is_free(self, key, names=(), student_id=None):
+        sid = self.slot_id.get(key)
+        if sid is None:
+            return True
+        return not (self.busy_mask(names, student_id) >> sid) & 1
+
+    def room_free(self, key, room):
+        sid = self.slot_id.get(key)
+        rid = self.room_id.get(room)
+        if sid is None or rid is None:
+            return True
+        return not (self.room_mask[sid] >> rid) & 1
+
+    def first_free_room_id(self, sid):
+        """Id ruang pertama (urutan daftar ruang) yang kosong di slot `sid`, atau None."""
+        free = ~self.room_mask[sid] & self.assignable_rooms
+        if not free:
+            return None
+        return (free & -free).bit_length() - 1
+
+    def first_free_room(self, key):
+        """Ruang pertama (urutan daftar ruang) yang kosong di slot `key`, atau ""."""
+        sid = self.slot_id.get(key)
+        if sid is None:
+            return self.rooms[0] if self.rooms else ""
+        rid = self.first_free_room_id(sid)
+        return "" if rid is None else self.rooms[rid]
+
+    def free_rooms(self, key):
+        sid = self.slot_id.get(key)
+        free = self.assignable_rooms if sid is None else ~self.room_mask[sid] & self.assignable_rooms
+        return [self.rooms[i] for i in range(len(self.rooms)) if (free >> i) & 1]
+
+    def busy_instructors(self, key):
+        sid = self.slot_id.get(key)
+        if sid is None:
+            return []
+        return [n for n, m in zip(self.instructors, self.instr_mask) if (m >> sid) & 1]
+
+    def busy_groups(self, key):
+        sid = self.slot_id.get(key)
+        if sid is None:
+            return []
+        return [g for g, m in zip(self.groups, self.group_mask) if (m >> sid) & 1]
+
+    def slot_of(self, idx):
+        entry = self.placed.get(idx)
+        return None if entry is None else entry[0]
+
+    def has_conflict(self, sid):
+        """True kalau ada ruang/dosen/kelompok mahasiswa terpakai >1 baris di slot `sid`."""
+        return bool(self.slot_conflicts(sid, "room") or self.slot_conflicts(sid, "instructor")
+                    or self.slot_conflicts(sid, "student"))
+
+    def slot_conflicts(self, sid, kind):
+        """Grup baris yang bentrok di slot `sid` untuk `kind` ("room", "instructor", "student")."""
+        groups = {}
+        for idx in self.slot_rows[sid]:
+            _, iids, gid, rid = self.placed[idx]
+            if kind == "room":
+                keys = () if rid is None else (rid,)
+            elif kind == "instructor":
+                keys = iids
+            else:
+                keys = () if gid is None else (gid,)
+            for k in keys:
+                groups.setdefault(k, []).append(idx)
+        return [idxs for idxs in groups.values() if len(idxs) > 1]
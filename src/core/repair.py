@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Perbaikan MK tanpa slot (UNPLACED) dengan tabu search eject-and-reinsert.
+
+Satu langkah: ambil MK tanpa slot u, pilih slot s di `domain`-nya, keluarkan
+MK yang menghalangi u di s (dosen / kelompok sama, atau satu penghuni ruang
+kalau ruang penuh), tempatkan u, lalu coba tempatkan ulang MK yang
+dikeluarkan di slot lain. MK yang dikeluarkan dari s tidak boleh kembali
+ke s selama `tenure` langkah (tabu), kecuali langkah itu menghasilkan
+jumlah UNPLACED di bawah yang terbaik sejauh ini (aspirasi). Baris pinned
+(PWK) tidak pernah dikeluarkan. Langkah yang membuat MK yang sudah punya
+slot sebelum perbaikan kehilangan slotnya dibatalkan, jadi jumlah UNPLACED
+total tidak pernah naik. Di akhir, keadaan terbaik yang dipakai.
+"""
+
+import random
+import time
+
+from courses import first_fit, iter_bits, popcount
+
+
+def _flexibility(table, occ, j):
+    """Jumlah slot lain di `domain` j yang bebas untuk dosen & kelompoknya."""
+    return popcount(table.domain[j] & ~occ.busy_mask_ids(table.instr[j], table.group[j]))
+
+
+def _blockers(table, occ, u, sid):
+    """
+    MK yang harus dikeluarkan supaya u bisa di slot `sid`, atau None kalau
+    terhalang baris pinned. Returns: (list baris, id ruang untuk u / None)
+    """
+    instr = set(table.instr[u])
+    gid = table.group[u]
+    out = []
+    for j in occ.slot_rows[sid]:
+        if (gid is not None and table.group[j] == gid) or instr.intersection(table.instr[j]):
+            if table.pinned[j]:
+                return None
+            out.append(j)
+    if table.zoom[u]:
+        return out, None
+    freed = [table.room[j] for j in out
+             if table.room[j] is not None and (occ.assignable_rooms >> table.room[j]) & 1]
+    rid = occ.first_free_room_id(sid)
+    if rid is not None:
+        return out, rid
+    if freed:
+        return out, freed[0]
+    # Ruang penuh: keluarkan penghuni luring paling fleksibel
+    victims = [j for j in occ.slot_rows[sid]
+               if not table.pinned[j] and table.room[j] is not None
+               and (occ.assignable_rooms >> table.room[j]) & 1]
+    if not victims:
+        return None
+    j = max(victims, key=lambda j: (_flexibility(table, occ, j), -j))
+    return out + [j], table.room[j]
+
+
+def _unplace(table, occ, j):
+    occ.remove(j)
+    table.slot[j], table.room[j] = -1, None
+
+
+def _place(table, occ, j, sid, rid):
+    table.slot[j], table.room[j] = sid, rid
+    occ.restore(j, table.entry(j))
+
+
+def _missing(table):
+    return [i for i in range(len(table)) if not table.pinned[i] and table.slot[i] < 0]
+
+
+def tabu_repair(table, occ, rows=None, time_limit=2.0, max_iters=2000, tenure=7, seed=0):
+    """
+    Coba tempatkan MK tanpa slot (`rows`, default semua baris non-pinned
+    dengan slot -1) dengan tabu search eject-and-reinsert. In-place.
+    MK yang sudah punya slot saat dipanggil boleh digeser tapi tidak pernah
+    dibiarkan tanpa slot.
+    Returns:
+        {"before", "after", "iterations", "seconds", "unplaced": [baris]} -
+        before/after/unplaced dihitung atas semua baris non-pinned
+    """
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    before = len(_missing(table))
+    if rows is None:
+        rows = _missing(table)
+    placed0 = {i for i in range(len(table)) if not table.pinned[i] and table.slot[i] >= 0}
+    unplaced = set(rows)
+
+    # Langsung tempatkan yang sudah muat
+    for u in sorted(unplaced):
+        found = first_fit(table, occ, u, table.domain[u])
+        if found is not None:
+            _place(table, occ, u, *found)
+            unplaced.discard(u)
+
+    best = len(unplaced)
+    best_state = (list(table.slot), list(table.room))
+    tabu = {}  # (baris, slot) -> langkah terakhir yang masih tabu
+    stuck = set()  # MK yang semua slotnya terhalang baris pinned
+    it = 0
+    while it < max_iters and time.perf_counter() - start < time_limit:
+        candidates = unplaced - stuck
+        if not candidates:
+            break
+        it += 1
+        # MK paling sulit (domain tersempit) dulu, seri acak
+        u = min(candidates, key=lambda i: (popcount(table.domain[i]), rng.random()))
+
+        moves = []
+        for sid in iter_bits(table.domain[u]):
+            blk = _blockers(table, occ, u, sid)
+            if blk is None:
+                continue
+            out, rid = blk
+            # Biaya: jumlah yang dikeluarkan, lalu fleksibilitas mereka (makin fleksibel makin murah)
+            cost = (len(out), -sum(_flexibility(table, occ, j) for j in out), rng.random())
+            moves.append((cost, sid, out, rid))
+        if not moves:
+            stuck.add(u)
+            continue
+        moves.sort(key=lambda m: m[0])
+
+        applied = waiting = False
+        for cost, sid, out, rid in moves:
+            # Aspirasi: langkah tabu tetap boleh kalau, walau semua yang dikeluarkan
+            # (yang boleh kehilangan slot) gagal ditempatkan ulang, hasilnya tetap
+            # di bawah rekor terbaik
+            if tabu.get((u, sid), 0) >= it and len(unplaced) - 1 + sum(j not in placed0 for j in out) >= best:
+                waiting = True
+                continue
+            prev = [(j, table.slot[j], table.room[j]) for j in out]
+            for j in out:
+                _unplace(table, occ, j)
+            _place(table, occ, u, sid, rid)
+            failed = []
+            for j in out:
+                banned = (1 << sid) | sum(1 << s for s in iter_bits(table.domain[j]) if tabu.get((j, s), 0) >= it)
+                found = first_fit(table, occ, j, table.domain[j] & ~banned)
+                if found is None:
+                    failed.append(j)
+                else:
+                    _place(table, occ, j, *found)
+            if any(j in placed0 for j in failed):
+                # MK yang sudah punya slot akan hilang: batalkan langkah
+                for j in [u] + [j for j in out if table.slot[j] >= 0]:
+                    _unplace(table, occ, j)
+                for j, sid_j, rid_j in prev:
+                    _place(table, occ, j, sid_j, rid_j)
+                continue
+            for j in out:
+                tabu[(j, sid)] = it + tenure
+            unplaced.discard(u)
+            unplaced.update(failed)
+            applied = True
+            break
+        if not applied:
+            if not waiting:
+                stuck.add(u)  # tiap langkah menggusur MK yang sudah punya slot
+            continue  # semua langkah tabu untuk saat ini; tunggu tenure habis
+
+        if len(unplaced) < best:
+            best = len(unplaced)
+            best_state = (list(table.slot), list(table.room))
+
+    # Kembalikan ke keadaan terbaik
+    slots, rooms = best_state
+    for i in range(len(table)):
+        if table.pinned[i] or (table.slot[i], table.room[i]) == (slots[i], rooms[i]):
+            continue
+        occ.remove(i)
+        table.slot[i], table.room[i] = slots[i], rooms[i]
+        occ.restore(i, table.entry(i))
+    left = _missing(table)
+    return dict(before=before, after=len(left), iterations=it,
+                seconds=time.perf_counter() - start, unplaced=left)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Baca/tulis sheet Excel baris per baris tanpa DataFrame perantara: baca lewat
+openpyxl read_only (file .csv dengan modul csv, satu file = satu sheet), tulis
+lewat openpyxl write_only (`write_workbook`).
+
+Nilai sel dinormalisasi seperti `pd.read_excel(..., header=None)` supaya parser
+berbasis state machine memberi hasil yang sama dengan versi DataFrame:
+- sel kosong, sel error, dan string penanda NA bawaan pandas ("", "nan",
+  "N/A", ...) -> None
+- angka bulat (3.0) -> int
+Memori konstan: hanya satu baris yang dipegang pada satu waktu.
+"""
+
+import csv
+import math
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell.cell import TYPE_ERROR
+
+# Sama dengan na_values bawaan pandas (pandas._libs.parsers.STR_NA_VALUES)
+NA_STRINGS = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+])
+
+
+def cell_value(cell):
+    """Nilai sel ternormalisasi (None = kosong)."""
+    v = cell.value
+    if v is None or getattr(cell, "data_type", None) == TYPE_ERROR:
+        return None
+    if isinstance(v, str):
+        return None if v in NA_STRINGS else v
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+
+def iter_rows(path, sheet):
+    """
+    Yield baris sheet `sheet` sebagai tuple nilai (lihat `cell_value`), trailing
+    sel kosong dibuang. Baris kosong tetap di-yield (tuple kosong).
+    CSV: `sheet` diabaikan, nilai tetap teks (penanda NA -> None).
+    """
+    if Path(path).suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.reader(f):
+                vals = [None if v in NA_STRINGS else v for v in row]
+                while vals and vals[-1] is None:
+                    vals.pop()
+                yield tuple(vals)
+        return
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        for row in wb[sheet].iter_rows():
+            vals = [cell_value(c) for c in row]
+            while vals and vals[-1] is None:
+                vals.pop()
+            yield tuple(vals)
+    finally:
+        wb.close()
+
+
+def at(row, k):
+    """Nilai kolom `k` dari baris (None kalau di luar lebar baris)."""
+    return row[k] if k < len(row) else None
+
+
+def export_value(v):
+    """Nilai sel untuk ditulis, seperti `DataFrame.to_excel`: NaN/None -> kosong, skalar numpy -> Python."""
+    if v is None:
+        return None
+    if not isinstance(v, (str, bytes)) and hasattr(v, "item"):
+        v = v.item()  # numpy scalar
+    if isinstance(v, float) and math.isnan(v):
+        return None
+    if type(v).__name__ in ("NAType", "NaTType"):
+        return None
+    return v
+
+
+def frame_rows(df):
+    """Baris sheet dari DataFrame (header = nama kolom, tanpa index), per kolom bukan iterrows."""
+    yield list(df.columns)
+    yield from zip(*(df[c].tolist() for c in df.columns))
+
+
+def write_workbook(path, sheets):
+    """
+    Tulis workbook secara streaming (openpyxl write_only). `sheets`: iterable
+    (nama sheet, rows), rows = iterable baris nilai - baris langsung dialirkan
+    ke file, jadi workbook tidak pernah utuh di memori.
+    """
+    wb = Workbook(write_only=True)
+    for name, rows in sheets:
+        ws = wb.create_sheet(title=name)
+        for row in rows:
+            ws.append([export_value(v) for v in row])
+    wb.save(path)
+    return path
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Registry sumber input dari config/sources.yaml.
+
+Tiap sumber mendeklarasikan file, format, sheet (+ flag NR), alias kolom,
+filter, dan nama parser; parser didaftarkan lewat decorator `parser(...)`
+(jadwal.py). Membaca registry tidak membuka workbook apa pun: file sumber
+baru dibuka saat loader sumber itu dipanggil, jadi menjadwalkan satu prodi
+tidak menyentuh workbook prodi lain, dan prodi baru berformat tabel cukup
+ditambah sebagai entri YAML.
+"""
+
+import functools
+from pathlib import Path
+
+import yaml
+
+REGISTRY_PATH = Path(__file__).resolve().parents[2] / "config" / "sources.yaml"
+
+PARSERS = {}  # nama parser -> fn(spec, path) -> DataFrame
+
+
+class SourceConfigError(ValueError):
+    """Entri registry tidak valid."""
+
+
+def parser(name, version=1):
+    """
+    Daftarkan fn(spec, path) -> DataFrame sebagai parser `name`.
+    `version`: naikkan kalau logika parser berubah (ikut kunci cache input).
+    """
+    def wrap(fn):
+        fn.version = version
+        PARSERS[name] = fn
+        return fn
+    return wrap
+
+
+def _normalize(name, spec):
+    if not isinstance(spec, dict) or "file" not in spec:
+        raise SourceConfigError(f"sumber {name!r}: butuh minimal `file`")
+    spec = dict(spec)
+    spec.setdefault("prodi", name.title())
+    spec.setdefault("dir", name)
+    spec.setdefault("format", Path(spec["file"]).suffix.lstrip(".").lower() or "xlsx")
+    spec.setdefault("parser", None)
+    spec.setdefault("pinned", False)
+    spec["sheets"] = [dict(s, nr=bool(s.get("nr", False))) if isinstance(s, dict) else {"name": s, "nr": False}
+                      for s in spec.get("sheets") or [{"name": 0}]]
+    spec["columns"] = {k: list(v) if isinstance(v, (list, tuple)) else [v]
+                       for k, v in (spec.get("columns") or {}).items()}
+    spec["exclude"] = dict(spec.get("exclude") or {})
+    return spec
+
+
+@functools.lru_cache(maxsize=None)
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    return {name: _normalize(name, spec) for name, spec in (data.get("sources") or {}).items()}
+
+
+def load_registry(path=None):
+    """{nama: spec} dari YAML registry (urutan entri dipertahankan, di-memo per path)."""
+    return _load(str(path or REGISTRY_PATH))
+
+
+def schedule_sources(registry=None):
+    """Nama sumber yang punya parser (ikut penjadwalan), urut registry."""
+    registry = load_registry() if registry is None else registry
+    return [name for name, spec in registry.items() if spec["parser"]]
+
+
+def get_parser(spec):
+    fn = PARSERS.get(spec["parser"])
+    if fn is None:
+        raise SourceConfigError(f"parser {spec['parser']!r} tidak dikenal (ada: {', '.join(sorted(PARSERS))})")
+    return fn
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Tabel simbol bersama: dosen, ruang, prodi dan kelompok mahasiswa -> id int.
+
+Nama dinormalisasi (strip) dan di-intern sekali saat load; nilai mentah yang
+sama (mis. nama dosen yang muncul di puluhan baris) di-cache sehingga
+normalisasi + hashing string tidak diulang di jalur panas. OccupancyIndex,
+CourseTable dan skrip analisis memakai id yang sama.
+
+Id disimpan di samping jadwal (`<output>.symbols.json`, lihat `save`) supaya
+tool hilir bisa memakainya lagi tanpa membangun ulang dari string.
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+
+def norm(x): return "" if pd.isna(x) else str(x).strip()
+
+
+class SymbolTable:
+    """Intern nama ternormalisasi ke id int per jenis (instructors, rooms, prodi, groups)."""
+
+    def __init__(self, rooms=()):
+        # rooms: ruang yang di-intern duluan (urutan = prioritas penempatan)
+        self.instructors = []
+        self.instr_id = {}
+        self.rooms = []
+        self.room_id = {}
+        self.prodi = []
+        self.prodi_id = {}
+        self.groups = []
+        self.group_id = {}
+        self._raw = {}  # (jenis, nilai mentah) -> id / None
+        self.rows = None  # id per baris jadwal (hasil `load`)
+        for room in rooms:
+            self.intern_room(room)
+
+    # ---------- interning (nilai sudah ternormalisasi) ----------
+    @staticmethod
+    def _intern(names, ids, key):
+        i = ids.get(key)
+        if i is None:
+            i = ids[key] = len(names)
+            names.append(key)
+        return i
+
+    def intern_instr(self, name):
+        return self._intern(self.instructors, self.instr_id, name)
+
+    def intern_room(self, room):
+        return self._intern(self.rooms, self.room_id, room)
+
+    def intern_prodi(self, prodi):
+        return self._intern(self.prodi, self.prodi_id, prodi)
+
+    def intern_group(self, student_id):
+        return self._intern(self.groups, self.group_id, student_id)
+
+    # ---------- interning dari nilai mentah (dengan cache) ----------
+    def _cached(self, kind, raw, make):
+        # Cache hanya untuk string: 1 == 1.0 == True tapi str()-nya berbeda
+        if not all(type(v) is str for v in raw):
+            return make()
+        try:
+            return self._raw[kind, raw]
+        except KeyError:
+            i = self._raw[kind, raw] = make()
+            return i
+
+    def instr_of(self, d1, dosen=""):
+        """Id dosen untuk cek bentrok (D1, fallback Dosen) atau None."""
+        def make():
+            # Only check D1 for conflicts - D2 is just backup/replacement for D1
+            name = norm(d1) or norm(dosen)
+            return self.intern_instr(name) if name else None
+        return self._cached("instr", (d1, dosen), make)
+
+    def room_of(self, room):
+        """Id ruang atau None kalau kosong."""
+        def make():
+            r = norm(room)
+            return self.intern_room(r) if r else None
+        return self._cached("room", (room,), make)
+
+    def prodi_of(self, prodi):
+        return self._cached("prodi", (prodi,), lambda: self.intern_prodi(norm(prodi)))
+
+    def group_of(self, prodi, semester, kelas):
+        """Id kelompok mahasiswa (prodi, semester, kelas); None kalau ada komponen kosong."""
+        semester = str(semester)
+        def make():
+            student_id = (norm(prodi), semester, norm(kelas))
+            return self.intern_group(student_id) if all(student_id) else None
+        return self._cached("group", (prodi, semester, kelas), make)
+
+    # ---------- per-frame ----------
+    def frame_ids(self, df):
+        """
+        Id per baris untuk jadwal `df` (kolom internal atau nama kolom Excel).
+        Returns:
+            DataFrame (index sama) dengan kolom prodi_id, instr_id, room_id, group_id; -1 = kosong
+        """
+        def col(*names):
+            c = next((n for n in names if n in df.columns), None)
+            return df[c] if c is not None else pd.Series("", index=df.index, dtype=object)
+
+        prodi, sem, kelas = col("Prodi"), col("Semester"), col("Kelas")
+        d1, dosen = col("D1", "Dosen 1"), col("Dosen")
+        mode, room = col("Mode", "Mode (Zoom/Luring)"), col("Ruang")
+        zoom = mode.astype(str).str.lower().str.contains("zoom", na=False)
+        ids = {
+            "prodi_id": [self.prodi_of(p) for p in prodi],
+            "instr_id": [self.instr_of(a, b) for a, b in zip(d1, dosen)],
+            "room_id": [None if z else self.room_of(r) for z, r in zip(zoom, room)],
+            "group_id": [self.group_of(p, s, k) for p, s, k in zip(prodi, sem, kelas)],
+        }
+        return pd.DataFrame({k: [-1 if v is None else v for v in vals] for k, vals in ids.items()},
+                            index=df.index)
+
+    # ---------- persistensi ----------
+    def to_dict(self):
+        return {"instructors": list(self.instructors), "rooms": list(self.rooms),
+                "prodi": list(self.prodi), "groups": [list(g) for g in self.groups]}
+
+    @classmethod
+    def from_dict(cls, data):
+        symbols = cls()
+        for name in data.get("instructors", []): symbols.intern_instr(name)
+        for room in data.get("rooms", []): symbols.intern_room(room)
+        for prodi in data.get("prodi", []): symbols.intern_prodi(prodi)
+        for group in data.get("groups", []): symbols.intern_group(tuple(group))
+        return symbols
+
+    def save(self, path, rows=None, sheet=None):
+        """
+        Simpan tabel simbol (JSON). `rows` (hasil `frame_ids`, urutan sama dengan
+        sheet `sheet`) ikut disimpan supaya tiap baris jadwal bisa dipetakan ke id.
+        """
+        data = self.to_dict()
+        if rows is not None:
+            data["rows"] = {"sheet": sheet, "columns": list(rows.columns),
+                            "data": rows.to_numpy().tolist()}
+        Path(path).write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path):
+        """Muat tabel simbol; baris tersimpan (kalau ada) ada di atribut `rows` (DataFrame)."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        symbols = cls.from_dict(data)
+        rows = data.get("rows")
+        if rows is not None:
+            symbols.rows = pd.DataFrame(rows["data"], columns=rows["columns"])
+        return symbols
+
+
+def symbols_path(output_path):
+    """Lokasi tabel simbol untuk file jadwal `output_path`."""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.stem + ".symbols.json")
@@ -8,12 +8,10 @@ Khususnya untuk "Arsitektur Tropis (Pilihan)" kelas 5B yang tidak terjadwal
 import pandas as pd
 from pathlib import Path
 from jadwal_finetune import (
-    find_available_slots,
-    add_course_to_schedule,
     print_schedule_summary,
     get_col_name
 )
-from jadwal import resolve_all
+from jadwal import resolve_all, match_unplaced, norm
 
 def fix_missing_schedules(input_file="jadwal_arsitektur_disesuaikan.xlsx", output_file=None):
     """
@@ -45,67 +43,28 @@ def fix_missing_schedules(input_file="jadwal_arsitektur_disesuaikan.xlsx", outpu
         print("   Tidak ada mata kuliah yang hilang jadwalnya!")
         return df
 
-    # Hapus mata kuliah yang bermasalah dari dataframe
-    df_clean = df[
-        ~(df["Hari"].isna() | (df["Hari"] == "") |
-          df["Sesi"].isna() | (df["Sesi"] == ""))
-    ].copy()
-
     print(f"\n2. Mencari slot kosong untuk menyelamatkan mata kuliah...")
 
-    rescued_count = 0
-    failed_courses = []
+    # Semua MK hilang ditempatkan sekaligus (maximum matching ke pasangan slot-ruang
+    # kosong); hari resolusi dipakai, jadi Arsitektur & reguler lain tetap Senin-Jumat
+    df_clean, stats = match_unplaced(df.copy(), use_allowed=True, return_stats=True)
+    rescued_count = len(stats["placed"])
+    for i in stats["placed"]:
+        row = df_clean.iloc[i]
+        ruang_info = f"ruang {row['Ruang']}" if norm(row["Ruang"]) else "menggunakan Zoom"
+        print(f"   ✓ {row['Prodi']} {row['Semester']}{row['Kelas']}: {row[mk_col]} "
+              f"-> {row['Hari']} Sesi {row['Sesi']} ({ruang_info})")
 
-    for _, course in missing_schedule.iterrows():
-        course_dict = course.to_dict()
-        course_name = course[mk_col]
-        prodi = course["Prodi"]
-
-        print(f"\n   Menyelamatkan: {prodi} {course['Semester']}{course['Kelas']}: {course_name}")
-
-        # Untuk Arsitektur, cari slot di Senin-Jumat
-        if prodi.upper() == "ARSITEKTUR":
-            target_days = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat"]
-        else:
-            target_days = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
-
-        best_slot = None
-        min_conflicts = float('inf')
-
-        # Cari slot terbaik
-        for day in target_days:
-            available_slots = find_available_slots(df_clean, day=day)
-            for slot in available_slots:
-                # Prioritaskan slot dengan ruang tersedia atau yang bisa zoom
-                if slot['Room_Count'] > 0 or str(course['Semester']) == "1":
-                    if slot['Total_Conflicts'] < min_conflicts:
-                        min_conflicts = slot['Total_Conflicts']
-                        best_slot = slot
-
-        if best_slot:
-            try:
-                df_clean = add_course_to_schedule(
-                    df_clean,
-                    course_dict,
-                    target_day=best_slot["Hari"],
-                    target_session=best_slot["Sesi"]
-                )
-                rescued_count += 1
-                print(f"     ✓ Berhasil dijadwalkan: {best_slot['Hari']} Sesi {best_slot['Sesi']}")
-
-                # Update info ruang
-                if best_slot["Room_Count"] > 0:
-                    ruang_info = f"ruang tersedia: {best_slot['Room_Count']}"
-                else:
-                    ruang_info = "menggunakan Zoom"
-                print(f"       {ruang_info}")
-
-            except Exception as e:
-                failed_courses.append(course_name)
-                print(f"     ✗ Gagal dijadwalkan: {e}")
-        else:
-            failed_courses.append(course_name)
-            print(f"     ✗ Tidak ada slot yang tersedia")
+    failed_courses = []
+    reasons = dict(stats["unplaceable"])
+    reasons.update((i, "bentrok dengan MK lain yang baru ditempatkan") for i in stats["remaining"])
+    for rows_h, slots_h, deficit in stats["hall"]:
+        reasons.update((i, f"rebutan ruang: {len(rows_h)} MK untuk ruang kosong di {len(slots_h)} slot, "
+                           f"minimal {deficit} tidak muat") for i in rows_h if i in reasons)
+    for i, reason in sorted(reasons.items()):
+        course_name = df_clean.iloc[i][mk_col]
+        failed_courses.append(course_name)
+        print(f"   ✗ {df_clean.iloc[i]['Prodi']}: {course_name} - {reason}")
 
     print(f"\n3. Hasil penyelamatan:")
     print(f"   - Berhasil diselamatkan: {rescued_count} mata kuliah")
@@ -27,12 +27,14 @@ import sys
 sys.path.append('.')
 from jadwal import (
     norm, extract_semester, combine_dosen, sessions_for_day,
-    allowed_days, build_maps, place_one, resolve_all, detect_conflicts,
+    allowed_days, build_maps, place_one, resolve_all, detect_conflicts, count_conflicts,
     load_pengairan, load_elektro, load_arsitektur_source,
-    parse_pwk_asli, BASE_DIR,
+    parse_pwk_asli, BASE_DIR, source_file, catalog_file,
     SESS_MON_THU, SESS_FRI, SESS_WE, DAYS_MON_THU, DAY_FRI, DAYS_WE, ALL_ROOMS
 )
 from rescue_mkdu_schedule import load_mkdu_corrected
+from input_cache import cached
+from catalog import catalog_format, read_catalog, write_catalog
 
 def extract_semester_num(smt_str):
     """Extract semester number from SMT column"""
@@ -47,9 +49,16 @@ def extract_semester_num(smt_str):
         return int(m.group(1))
     return None
 
-def parse_informatika_sheet(sheet_name):
-    """Parse informatika course data from Excel sheet"""
-    df = pd.read_excel(BASE_DIR / "informatika.xlsx", sheet_name=sheet_name, header=None)
+def parse_informatika_sheet(sheet_name, path=None):
+    """Parse informatika course data from Excel sheet (atau satu file CSV/Parquet mentah, `path`)"""
+    path = path or source_file("informatika_updated")
+    if catalog_format(path) == "csv":
+        df = pd.read_csv(path, header=None, dtype=str)
+    elif catalog_format(path) == "parquet":
+        df = pd.read_parquet(path)
+        df.columns = range(df.shape[1])
+    else:
+        df = pd.read_excel(path, sheet_name=sheet_name, header=None)
     courses = []
 
     # Find header row (contains 'KODE MK', 'MATA KULIAH', etc.)
@@ -94,12 +103,15 @@ def parse_informatika_sheet(sheet_name):
 
     return courses
 
-def load_informatika_updated():
+@cached(lambda: [catalog_file("informatika_updated") or source_file("informatika_updated")])
+def informatika_updated_courses():
     """
-    Load updated Informatika course structure from informatika.xlsx
+    Daftar MK Informatika (format penjadwalan) dari kedua sheet informatika.xlsx,
+    atau dari katalog kanonik informatika_updated.{parquet,csv} di CATALOG_DIR.
     """
-    print("Loading updated Informatika data from informatika.xlsx...")
-
+    cat = catalog_file("informatika_updated")
+    if cat is not None:
+        return read_catalog(cat)
     # Parse both sheets
     sheet1_courses = parse_informatika_sheet('Jadwal INFORMATIKA (simak)')
     sheet2_courses = parse_informatika_sheet('jadwal informatika1')
@@ -142,7 +154,14 @@ def load_informatika_updated():
             NR=False
         ))
 
-    df = pd.DataFrame(out)
+    return pd.DataFrame(out)
+
+def load_informatika_updated():
+    """
+    Load updated Informatika course structure from informatika.xlsx
+    """
+    print("Loading updated Informatika data from informatika.xlsx...")
+    df = informatika_updated_courses()
     print(f"Loaded {len(df)} Informatika courses")
 
     # Show semester distribution
@@ -296,30 +315,7 @@ def create_updated_schedule():
     master = resolve_all(master)
 
     # 6) Analysis
-    def count_conflicts(df):
-        # Room conflicts
-        luring = df[~df["Mode"].str.lower().str.contains("zoom", na=False)]
-        room_conf = luring[luring["Ruang"] != ""].groupby(["Hari", "Sesi", "Ruang"]).size()
-        room_conflicts = int((room_conf > 1).sum())
-
-        # Instructor conflicts
-        slot_map = defaultdict(list)
-        for i, r in df.iterrows():
-            day = norm(r["Hari"])
-            sesi = r["Sesi"]
-            if not day or not sesi:
-                continue
-            d1 = norm(r.get("D1", ""))
-            if d1:
-                slot_map[(day, int(sesi), d1)].append(i)
-            elif norm(r.get("Dosen", "")):
-                slot_map[(day, int(sesi), norm(r["Dosen"]))].append(i)
-
-        instr_conflicts = sum(1 for _, idxs in slot_map.items() if len(idxs) > 1)
-        empties = int(((df["Hari"] == "") | (df["Sesi"] == "")).sum())
-        return room_conflicts, instr_conflicts, empties
-
-    rc, ic, em = count_conflicts(master)
+    rc, ic, _, em = count_conflicts(master)
 
     # Show Informatika analysis
     print("\n=== Informatika Updated Analysis ===")
@@ -505,5 +501,15 @@ def main():
         traceback.print_exc()
         return False
 
+def convert_catalog(out_dir=BASE_DIR / "catalog", fmt="csv"):
+    """Ekspor katalog informatika.xlsx sekali ke <out_dir>/informatika_updated.<fmt>"""
+    path = write_catalog(informatika_updated_courses(), Path(out_dir) / f"informatika_updated.{fmt}")
+    print(f"informatika_updated: {path}")
+    return path
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # python rescue_informatika_update.py convert [folder] [csv|parquet]
+    if sys.argv[1:2] == ["convert"]:
+        convert_catalog(*sys.argv[2:4])
+    else:
+        main()
\ No newline at end of file
@@ -22,12 +22,14 @@ import sys
 sys.path.append('.')
 from jadwal import (
     norm, extract_semester, combine_dosen, sessions_for_day,
-    allowed_days, build_maps, place_one, resolve_all, detect_conflicts,
+    allowed_days, build_maps, place_one, resolve_all, detect_conflicts, count_conflicts,
     load_informatika, load_pengairan, load_elektro, load_arsitektur_source,
     parse_pwk_asli, BASE_DIR, FILE_MKDU, SHEET_MKDU,
     SESS_MON_THU, SESS_FRI, SESS_WE, DAYS_MON_THU, DAY_FRI, DAYS_WE, ALL_ROOMS
 )
+from input_cache import cached
 
+@cached(lambda: [FILE_MKDU])
 def load_mkdu_corrected():
     """
     Load MKDU dengan perbaikan semester berdasarkan nama mata kuliah
@@ -241,30 +243,7 @@ def create_corrected_schedule():
     master = resolve_all(master)
 
     # 6) Analysis and summary
-    def count_conflicts(df):
-        # ruang
-        luring = df[~df["Mode"].str.lower().str.contains("zoom", na=False)]
-        room_conf = luring[luring["Ruang"] != ""].groupby(["Hari", "Sesi", "Ruang"]).size()
-        room_conflicts = int((room_conf > 1).sum())
-
-        # dosen - hanya check D1 untuk konflik
-        slot_map = defaultdict(list)
-        for i, r in df.iterrows():
-            day = norm(r["Hari"])
-            sesi = r["Sesi"]
-            if not day or not sesi:
-                continue
-            d1 = norm(r.get("D1", ""))
-            if d1:
-                slot_map[(day, int(sesi), d1)].append(i)
-            elif norm(r.get("Dosen", "")):
-                slot_map[(day, int(sesi), norm(r["Dosen"]))].append(i)
-
-        instr_conflicts = sum(1 for _, idxs in slot_map.items() if len(idxs) > 1)
-        empties = int(((df["Hari"] == "") | (df["Sesi"] == "")).sum())
-        return room_conflicts, instr_conflicts, empties
-
-    rc, ic, em = count_conflicts(master)
+    rc, ic, _, em = count_conflicts(master)
 
     # Check MKDU final result
     print("\n=== MKDU Final Schedule Analysis ===")
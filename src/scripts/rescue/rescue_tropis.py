@@ -7,7 +7,7 @@ Script khusus untuk menyelamatkan Arsitektur Tropis (Pilihan) kelas 5B
 import pandas as pd
 import numpy as np
 from jadwal_finetune import get_col_name
-from jadwal_wrapper import build_maps_excel, place_one_excel, sessions_for_day, ALL_ROOMS
+from jadwal_wrapper import build_maps_excel, sessions_for_day
 
 def rescue_tropis_5b():
     """Selamatkan Arsitektur Tropis 5B dengan cara manual"""
@@ -48,8 +48,8 @@ def rescue_tropis_5b():
 
     print(f"Mata kuliah dihapus sementara dari jadwal")
 
-    # Build occupancy maps
-    instr_busy, room_busy, student_busy = build_maps_excel(df_clean)
+    # Build occupancy index
+    occ = build_maps_excel(df_clean)
 
     # Manual assignment - cari slot terbaik
     target_days = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat']
@@ -77,21 +77,21 @@ def rescue_tropis_5b():
 
             if len(tropis_5a) > 0:
                 dosen_5a = tropis_5a.iloc[0].get('Dosen 1', tropis_5a.iloc[0].get('D1', ''))
-                if dosen_5a and dosen_5a in instr_busy[key]:
+                if dosen_5a and not occ.is_free(key, [dosen_5a]):
                     conflicts += 10  # penalty berat untuk konflik dosen
 
             # Cek konflik mahasiswa
             student_id = ('ARSITEKTUR', '5', 'B')
-            if student_id in student_busy[key]:
+            if not occ.is_free(key, student_id=student_id):
                 conflicts += 20  # penalty sangat berat untuk konflik mahasiswa
 
             # Cek ketersediaan ruang
-            available_rooms = [room for room in ALL_ROOMS if room not in room_busy[key]]
+            available_rooms = occ.free_rooms(key)
             if len(available_rooms) == 0:
                 conflicts += 5  # penalty untuk tidak ada ruang
 
             # Total konflik umum
-            conflicts += len(instr_busy[key]) + len(student_busy[key])
+            conflicts += len(occ.busy_instructors(key)) + len(occ.busy_groups(key))
 
             if conflicts < min_total_conflicts:
                 min_total_conflicts = conflicts
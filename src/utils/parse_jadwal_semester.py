@@ -1,11 +1,18 @@
 import pandas as pd
 import numpy as np
-
-def parse_jadwal_semester():
-    """Parse JADWAL SEMESTER.xlsx to extract lecturer information using correct columns"""
-
+import sys
+sys.path.append('.')
+from jadwal import source_file
+from input_cache import cached
+
+@cached(lambda: [source_file("informatika")])
+def jadwal_semester_courses():
+    """
+    Baris MK + dosen (SMT, Mata_Kuliah, Dosen1, Dosen2, row_index) dari
+    JADWAL SEMESTER.xlsx (sumber registry "informatika"), di-cache per hash file.
+    """
     # Read JADWAL SEMESTER.xlsx without any skipping to get proper structure
-    df_raw = pd.read_excel('/workspaces/jadwal/JADWAL SEMESTER.xlsx', sheet_name=0, header=None)
+    df_raw = pd.read_excel(source_file("informatika"), sheet_name=0, header=None)
 
     print('Parsing JADWAL SEMESTER.xlsx with correct column structure...')
     print(f'Raw DataFrame shape: {df_raw.shape}')
@@ -40,7 +47,11 @@ def parse_jadwal_semester():
             })
 
     # Convert to DataFrame
-    df_clean = pd.DataFrame(course_data)
+    return pd.DataFrame(course_data, columns=['SMT', 'Mata_Kuliah', 'Dosen1', 'Dosen2', 'row_index'])
+
+def parse_jadwal_semester():
+    """Parse JADWAL SEMESTER.xlsx to extract lecturer information using correct columns"""
+    df_clean = jadwal_semester_courses()
 
     print(f'Found {len(df_clean)} valid course entries with lecturer information')
 